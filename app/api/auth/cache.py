@@ -0,0 +1,8 @@
+from app.cache import TTLCache
+from app.config import settings
+
+# sha256 of access token -> email from verified token, see get_email_from_access_token
+# ttl is set per token from its exp claim
+access_tokens_cache: TTLCache[bytes, str] = TTLCache(
+    maxsize=settings.access_tokens_cache_max_size, ttl=0
+)
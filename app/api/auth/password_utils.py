@@ -1,8 +1,19 @@
+import asyncio
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
 from argon2 import PasswordHasher
 from argon2.exceptions import VerifyMismatchError
 
+from app.api.errors import PasswordHashingOverloaded
+from app.config import settings
+
 _ph = PasswordHasher()
 
+T = TypeVar("T")
+
 
 def get_password_hash(password: str) -> str:
     """
@@ -25,3 +36,104 @@ def passwords_are_equal(password: str, hashed_password: str) -> bool:
 def password_needs_rehash(hashed_password: str) -> bool:
     res: bool = _ph.check_needs_rehash(hashed_password)
     return res
+
+
+class PasswordHashingPool:
+    """
+    Runs argon2 in dedicated threads, so it doesn't block event loop
+    (argon2-cffi releases GIL while hashing).
+
+    At most max_workers hashes run at once, at most max_queue calls wait for a worker.
+    Calls above that are rejected with 503 at once, so bursts of logins and signups
+    get slower responses or 503 instead of growing unbounded queue.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="argon2"
+        )
+        # created in running loop, pool itself is created at import
+        self._semaphore: asyncio.Semaphore | None = None
+        self._waiting = 0
+        self._in_progress = 0
+
+        self.calls = 0
+        self.rejected = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.run_time_total = 0.0
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+        return self._semaphore
+
+    async def _run(self, func: Callable[..., T], *args: Any) -> T:
+        if self._waiting >= self.max_queue:
+            self.rejected += 1
+            raise PasswordHashingOverloaded
+
+        semaphore = self._get_semaphore()
+        queued_at = time.perf_counter()
+        self._waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self._waiting -= 1
+
+        started_at = time.perf_counter()
+        queue_time = started_at - queued_at
+        self.calls += 1
+        self.queue_time_total += queue_time
+        self.queue_time_max = max(self.queue_time_max, queue_time)
+        self._in_progress += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self._in_progress -= 1
+            self.run_time_total += time.perf_counter() - started_at
+            semaphore.release()
+
+    async def hash_password(self, password: str) -> str:
+        return await self._run(get_password_hash, password)
+
+    async def verify_password(self, password: str, hashed_password: str) -> bool:
+        return await self._run(passwords_are_equal, password, hashed_password)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_progress": self._in_progress,
+            "waiting": self._waiting,
+            "calls": self.calls,
+            "rejected": self.rejected,
+            "avg_queue_time_ms": round(self.queue_time_total / self.calls * 1000, 3)
+            if self.calls
+            else 0.0,
+            "max_queue_time_ms": round(self.queue_time_max * 1000, 3),
+            "avg_run_time_ms": round(self.run_time_total / self.calls * 1000, 3)
+            if self.calls
+            else 0.0,
+        }
+
+
+password_hashing_pool = PasswordHashingPool(
+    max_workers=settings.password_hashing_max_workers,
+    max_queue=settings.password_hashing_max_queue,
+)
+
+
+async def hash_password(password: str) -> str:
+    return await password_hashing_pool.hash_password(password)
+
+
+async def verify_password(password: str, hashed_password: str) -> bool:
+    return await password_hashing_pool.verify_password(password, hashed_password)
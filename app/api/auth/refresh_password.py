@@ -1,4 +1,3 @@
-import asyncio
 from datetime import datetime, timezone, timedelta
 from http import HTTPStatus
 
@@ -14,6 +13,7 @@ from app.api.errors import (
 from app.config import settings
 from app.db.models.users.handlers import get_user_by_email
 from app.email.mailgun import mailgun
+from app.jobs.queue import JobError, jobs_queue
 from app.schemas import GetUser
 
 
@@ -31,17 +31,34 @@ def create_refresh_password_token(
     return token
 
 
-def create_refresh_password_token_and_send(
+async def _send_refresh_password_email(
     email: str, avatar_url: str | None, username: str | None
 ) -> None:
+    # token is created when email is sent, so retries don't shorten its lifetime
     refresh_password_token = create_refresh_password_token(email=email)
-    asyncio.create_task(
-        mailgun.send_refresh_password(
-            refresh_password_token=refresh_password_token,
-            to_address=email,
-            avatar_url=avatar_url,
-            username=username,
-        )
+    err = await mailgun.send_refresh_password(
+        refresh_password_token=refresh_password_token,
+        to_address=email,
+        avatar_url=avatar_url,
+        username=username,
+    )
+    if err is not None:
+        raise JobError(err)
+
+
+SEND_REFRESH_PASSWORD_EMAIL = jobs_queue.register(
+    "send_refresh_password_email", _send_refresh_password_email
+)
+
+
+async def create_refresh_password_token_and_send(
+    email: str, avatar_url: str | None, username: str | None
+) -> None:
+    await jobs_queue.enqueue(
+        SEND_REFRESH_PASSWORD_EMAIL,
+        email=email,
+        avatar_url=avatar_url,
+        username=username,
     )
 
 
@@ -5,6 +5,7 @@ from fastapi import APIRouter, Depends, Query
 from fastapi.security import OAuth2PasswordRequestForm
 from starlette.responses import RedirectResponse
 
+from app.api.auth.password_utils import hash_password, password_needs_rehash
 from app.api.auth.refresh_password import (
     create_refresh_password_token_and_send,
     get_user_from_refresh_password_token,
@@ -14,6 +15,7 @@ from app.api.auth.utils import (
     authenticate_user,
     ACCESS_TOKEN_EXPIRE_MINUTES,
     create_access_token,
+    rehash_password_in_background,
 )
 from app.api.auth.verify_email import (
     get_user_from_verify_email_token,
@@ -28,13 +30,22 @@ from app.api.auth.schemas import (
     UserExistsResponse,
 )
 from app.config import settings
-from app.db.models.users.handlers import update_user, get_user_by_email
+from app.db.models.users.handlers import (
+    update_user,
+    get_user_by_email,
+    user_with_email_exists,
+)
+from app.ratelimit.limiter import rate_limit
 from app.types import EMAIL_REGEX
 
 auth_router = APIRouter(tags=["Authentication"], prefix="/auth")
 
 
-@auth_router.post("/token", response_model=GetBearerAccessTokenResponse)
+@auth_router.post(
+    "/token",
+    response_model=GetBearerAccessTokenResponse,
+    dependencies=[Depends(rate_limit("auth_token"))],
+)
 async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
 ) -> GetBearerAccessTokenResponse:
@@ -49,6 +60,10 @@ async def login_for_access_token(
         raise err
 
     assert user is not None
+    if user.password is not None and password_needs_rehash(user.password):
+        # don't delay response, hashing is slow on purpose
+        rehash_password_in_background(user, form_data.password)
+
     access_token = create_access_token(
         email=user.email, expires_minutes=ACCESS_TOKEN_EXPIRE_MINUTES
     )
@@ -77,7 +92,9 @@ async def verify_email_via_jwt_token(token: str) -> RedirectResponse:
     return RedirectResponse(url=redirect_url, status_code=HTTPStatus.PERMANENT_REDIRECT)
 
 
-@auth_router.post("/verifyemail/resend")
+@auth_router.post(
+    "/verifyemail/resend", dependencies=[Depends(rate_limit("resend_verify_email"))]
+)
 async def resend_verification_email(params: ResendVerifyEmail) -> None:
     if not (user := await get_user_by_email(email=params.email)):
         raise UserNotFound(params.email)
@@ -85,19 +102,21 @@ async def resend_verification_email(params: ResendVerifyEmail) -> None:
     if user.email_is_verified:
         raise EmailIsAlreadyVerified(user.email)
 
-    create_verify_token_and_send_to_email(
+    await create_verify_token_and_send_to_email(
         email=user.email,
         avatar_url=user.avatar_url,
         username=user.username,
     )
 
 
-@auth_router.post("/refresh-password/")
+@auth_router.post(
+    "/refresh-password/", dependencies=[Depends(rate_limit("refresh_password"))]
+)
 async def send_refresh_password_email(params: RefreshPasswordForEmail) -> None:
     if not (user := await get_user_by_email(email=params.email)):
         raise UserNotFound(params.email)
 
-    create_refresh_password_token_and_send(
+    await create_refresh_password_token_and_send(
         email=user.email, avatar_url=user.avatar_url, username=user.username
     )
 
@@ -108,7 +127,8 @@ async def change_password_via_token(
     params: RefreshPassword,
 ) -> None:
     user = await get_user_from_refresh_password_token(token)
-    await update_user(user_id=user.id, values={"password": params.password})
+    password = await hash_password(params.password)
+    await update_user(user_id=user.id, values={"password": password})
 
 
 @auth_router.get(
@@ -120,5 +140,5 @@ async def check_if_user_exists(
         ..., min_length=3, max_length=35, regex=EMAIL_REGEX, example="email@gmail.com"
     ),
 ) -> UserExistsResponse:
-    user_exists = bool(await get_user_by_email(email))
+    user_exists = await user_with_email_exists(email)
     return UserExistsResponse(user_exists=user_exists)
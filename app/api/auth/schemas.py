@@ -1,6 +1,4 @@
-from pydantic import BaseModel, Field, validator
-
-from app.api.auth.password_utils import get_password_hash
+from pydantic import BaseModel, Field
 from app.api.auth.types import AccessTokenType
 from app.types import EMAIL_REGEX
 
@@ -25,10 +23,6 @@ class RefreshPasswordForEmail(BaseModel):
 class RefreshPassword(BaseModel):
     password: str = Field(min_length=8, max_length=64)
 
-    @validator("password")
-    def hash_password(cls, password: str) -> str:  # pylint: disable=no-self-argument
-        return get_password_hash(password)
-
 
 class UserExistsResponse(BaseModel):
     user_exists: bool
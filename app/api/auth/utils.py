@@ -1,11 +1,17 @@
+import asyncio
+import hashlib
+import logging
+import time
 from datetime import datetime, timedelta
 from http import HTTPStatus
+from typing import Any
 
 from fastapi import Depends
 from fastapi.param_functions import Form
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt, ExpiredSignatureError
 
+from app.api.auth.cache import access_tokens_cache
 from app.api.auth.types import DataToEncodeInJWTToken
 from app.api.errors import (
     UserNotFound,
@@ -13,18 +19,24 @@ from app.api.errors import (
     InvalidAccessTokenPayload,
     AccessTokenExpired,
     InvalidAuthorization,
+    PasswordHashingOverloaded,
 )
 from app.api.auth.password_utils import (
-    passwords_are_equal,
-    password_needs_rehash,
-    get_password_hash,
+    verify_password,
+    hash_password,
 )
 
 from app.config import settings
-from app.db.models.users.handlers import update_user, get_user_by_email
+from app.db.models.users.handlers import (
+    replace_password,
+    get_user_by_email,
+    get_user_by_email_cached,
+)
 from app.schemas import GetUser
 from app.types import EMAIL_REGEX
 
+logger = logging.getLogger(__name__)
+
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24 * 180
 
@@ -90,11 +102,50 @@ async def authenticate_user(
     if not user.email_is_verified:
         return None, InvalidAuthorization(f"Email {email} is not verified.")
 
-    if user.password and not passwords_are_equal(password, user.password):
+    if user.password and not await verify_password(password, user.password):
         return None, InvalidAuthorization("Invlaid password")
     return user, None
 
 
+async def rehash_password(user_id: str, password: str, old_password: str) -> None:
+    """
+    Store hash of password with current argon2 parameters.
+    Call it after successful login, it's the only time plaintext password is known.
+    old_password is the hash password was verified with, new hash replaces only it,
+    so password changed in the meantime isn't overwritten.
+    """
+    try:
+        new_password = await hash_password(password)
+    except PasswordHashingOverloaded:
+        logger.info(f"Rehashing password of {user_id=} is postponed till next login")
+        return
+
+    try:
+        if not await replace_password(user_id, old_password, new_password):
+            logger.info(f"Password of {user_id=} was changed, it's not rehashed")
+    except Exception as exc:  # pylint: disable=broad-except
+        logger.error(f"Can't rehash password of {user_id=}: {exc}")
+
+
+# running rehashes, event loop keeps only weak references to tasks
+_rehash_tasks: set[asyncio.Task[None]] = set()
+
+
+def rehash_password_in_background(user: GetUser, password: str) -> None:
+    assert user.password is not None
+    task = asyncio.create_task(rehash_password(user.id, password, user.password))
+    _rehash_tasks.add(task)
+    task.add_done_callback(_rehash_tasks.discard)
+
+
+async def wait_for_password_rehashes() -> None:
+    """
+    Let running rehashes finish on shutdown, before DB is disconnected.
+    """
+    if _rehash_tasks:
+        await asyncio.gather(*_rehash_tasks, return_exceptions=True)
+
+
 def create_access_token(
     email: str, expires_minutes: int = ACCESS_TOKEN_EXPIRE_MINUTES
 ) -> str:
@@ -107,9 +158,15 @@ def create_access_token(
     return token
 
 
-async def _get_curr_user(token: str | None) -> GetUser | None:
-    if not token:
-        return None
+def get_email_from_access_token(token: str) -> str:
+    """
+    Verify access token and get email from it.
+    Verified tokens are cached until expiration, so the same token isn't verified
+    on every request. Cache is keyed by digest, tokens themselves aren't stored.
+    """
+    token_digest = hashlib.sha256(token.encode()).digest()
+    if (email := access_tokens_cache.get(token_digest)) is not None:
+        return email
 
     try:
         payload: DataToEncodeInJWTToken = jwt.decode(
@@ -122,12 +179,20 @@ async def _get_curr_user(token: str | None) -> GetUser | None:
     except JWTError as exc:
         raise InvalidAccessToken from exc
 
-    if (user := await get_user_by_email(email=email)) is None:
-        raise UserNotFound(user_param=email, status_code=HTTPStatus.UNAUTHORIZED)
+    # exp is validated by jwt.decode, it's a timestamp after decoding
+    exp: Any = payload.get("exp")
+    if isinstance(exp, (int, float)) and (ttl := exp - time.time()) > 0:
+        access_tokens_cache.put(token_digest, email, ttl=ttl)
+    return email
+
 
-    if user.password is not None and password_needs_rehash(user.password):
-        new_password = get_password_hash(user.password)
-        await update_user(user_id=user.id, values={"password": new_password})
+async def _get_curr_user(token: str | None) -> GetUser | None:
+    if not token:
+        return None
+
+    email = get_email_from_access_token(token)
+    if (user := await get_user_by_email_cached(email=email)) is None:
+        raise UserNotFound(user_param=email, status_code=HTTPStatus.UNAUTHORIZED)
     return user
 
 
@@ -1,5 +1,3 @@
-import asyncio
-
 from jose import jwt, JWTError
 
 from app.api.auth.types import VerificationEmailData
@@ -8,6 +6,7 @@ from app.api.errors import InvalidVerifyEmailToken, UserNotFound
 from app.config import settings
 from app.db.models.users.handlers import get_user_by_email
 from app.email.mailgun import mailgun
+from app.jobs.queue import JobError, jobs_queue
 from app.schemas import GetUser
 
 
@@ -33,15 +32,26 @@ def create_verify_email_token(email: str) -> str:
     return token
 
 
-def create_verify_token_and_send_to_email(
+async def _send_verify_email(
     email: str, avatar_url: str | None, username: str | None
 ) -> None:
     verify_token = create_verify_email_token(email=email)
-    asyncio.create_task(
-        mailgun.send_email_confirmation(
-            verfiy_email_token=verify_token,
-            to_address=email,
-            avatar_url=avatar_url,
-            username=username,
-        )
+    err = await mailgun.send_email_confirmation(
+        verfiy_email_token=verify_token,
+        to_address=email,
+        avatar_url=avatar_url,
+        username=username,
+    )
+    if err is not None:
+        raise JobError(err)
+
+
+SEND_VERIFY_EMAIL = jobs_queue.register("send_verify_email", _send_verify_email)
+
+
+async def create_verify_token_and_send_to_email(
+    email: str, avatar_url: str | None, username: str | None
+) -> None:
+    await jobs_queue.enqueue(
+        SEND_VERIFY_EMAIL, email=email, avatar_url=avatar_url, username=username
     )
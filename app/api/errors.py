@@ -95,6 +95,18 @@ class BadRequestDeletingTask(HTTPException):
         super().__init__(status_code=HTTPStatus.BAD_REQUEST, detail=msg)
 
 
+class InvalidCursor(HTTPException):
+    def __init__(self) -> None:
+        msg = "Cursor is invalid."
+        super().__init__(status_code=HTTPStatus.BAD_REQUEST, detail=msg)
+
+
+class InvalidHashtagFilter(HTTPException):
+    def __init__(self, hashtag: str) -> None:
+        msg = f"Invalid hashtag: {hashtag}"
+        super().__init__(status_code=HTTPStatus.BAD_REQUEST, detail=msg)
+
+
 class TaskNotFound(HTTPException):
     def __init__(self, task_id: str) -> None:
         msg = f"No task with {task_id=}"
@@ -159,3 +171,39 @@ class BadRequestUpdatingComment(HTTPException):
     def __init__(self, exc: str) -> None:
         msg = f"Can't update comment: {exc}"
         super().__init__(status_code=HTTPStatus.BAD_REQUEST, detail=msg)
+
+
+class InternalAccessForbidden(HTTPException):
+    def __init__(self) -> None:
+        msg = "Access to internal endpoint is forbidden."
+        super().__init__(status_code=HTTPStatus.FORBIDDEN, detail=msg)
+
+
+class PasswordHashingOverloaded(HTTPException):
+    def __init__(self, retry_after_seconds: int = 1) -> None:
+        msg = "Too many concurrent password checks, try again later."
+        super().__init__(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail=msg,
+            headers={"Retry-After": str(retry_after_seconds)},
+        )
+
+
+class TooManyRequests(HTTPException):
+    def __init__(self, retry_after_seconds: int) -> None:
+        msg = "Too many requests, try again later."
+        super().__init__(
+            status_code=HTTPStatus.TOO_MANY_REQUESTS,
+            detail=msg,
+            headers={"Retry-After": str(max(retry_after_seconds, 1))},
+        )
+
+
+class DatabaseOverloaded(HTTPException):
+    def __init__(self, retry_after_seconds: int = 1) -> None:
+        msg = "No free database connections, try again later."
+        super().__init__(
+            status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+            detail=msg,
+            headers={"Retry-After": str(retry_after_seconds)},
+        )
@@ -0,0 +1,30 @@
+from http import HTTPStatus
+
+from starlette.responses import Response
+
+
+def make_etag(*parts: str | int) -> str:
+    """
+    Weak ETag: response is the same semantically, not byte by byte.
+    """
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """
+    Weak comparison of If-None-Match header value with ETag, RFC 7232 3.2.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+
+    opaque_tag = etag.removeprefix("W/")
+    return any(
+        candidate.strip().removeprefix("W/") == opaque_tag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=HTTPStatus.NOT_MODIFIED, headers={"ETag": etag})
@@ -1,13 +1,34 @@
-from fastapi import APIRouter, Depends, Query
+import re
+
+from fastapi import APIRouter, Depends, Header, Query
 from fastapi_pagination import Page
+from starlette.responses import Response
 
-from app.api.auth.utils import get_curr_user_or_none
-from app.db.models.tasks.task_handlers import get_feed_tasks
-from app.schemas import GetUser, TaskFeed
+from app.api.auth.utils import get_curr_user_or_none, get_current_user
+from app.api.errors import InvalidCursor, InvalidHashtagFilter
+from app.api.etag import etag_matches, make_etag, not_modified
+from app.db.models.tasks.cache import feed_pages_cache
+from app.db.models.tasks.cursor import FeedCursor
+from app.db.models.tasks.task_handlers import (
+    get_feed_tasks_json,
+    get_feed_tasks_by_cursor,
+)
+from app.db.models.tasks.version import get_tasks_version
+from app.db.models.timelines.handlers import get_timeline_tasks
+from app.db.models.hashtags.utils import HASHTAG_REGEX
+from app.schemas import GetUser, TaskFeed, TasksCursorPage
+from app.types import HashtagsMatch
 
 feed_router = APIRouter(tags=["Task's feed"], prefix="/feed")
 
 
+async def _load_feed_page(page: int, size: int) -> tuple[int, bytes]:
+    # version is taken before page, so it's never newer than the page.
+    # Page is read from primary: sequence behind version isn't replicated exactly
+    version = await get_tasks_version()
+    return version, await get_feed_tasks_json(page, size)
+
+
 @feed_router.get(
     "",
     description="""
@@ -15,13 +36,86 @@ feed_router = APIRouter(tags=["Task's feed"], prefix="/feed")
     If 'Authorization' header is provided, then backend tries to authenticate a user,
     hence, there are might be some auth errors.
     If 'Authorization' header is not provided, then authentication is not occured.
+    Response has ETag header, pass it in 'If-None-Match' to get 304 if nothing changed.
     """,
     response_model=Page[TaskFeed],
 )
 async def get_task_feed_for_user(
-    _: GetUser | None = Depends(get_curr_user_or_none),
+    user: GetUser | None = Depends(get_curr_user_or_none),
     page: int = Query(default=1, ge=1),
     size: int = Query(default=20, ge=20, le=30),
+    if_none_match: str | None = Header(default=None),
 ) -> Page[TaskFeed]:
-    # todo: add personalization for user
-    return await get_feed_tasks(page, size)
+    if if_none_match is not None:
+        etag = make_etag(await get_tasks_version())
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+    # personalized feed is /feed/timeline
+    if user is not None:
+        version, content = await _load_feed_page(page, size)
+    else:
+        version, content = await feed_pages_cache.get_or_load(
+            (page, size), lambda: _load_feed_page(page, size)
+        )
+        # stale page is served while cache is revalidated
+        if etag_matches(if_none_match, make_etag(version)):
+            return not_modified(make_etag(version))
+    return Response(
+        content=content,
+        media_type="application/json",
+        headers={"ETag": make_etag(version)},
+    )
+
+
+@feed_router.get(
+    "/cursor",
+    description="""
+    Same feed as above, but paginated with opaque cursor instead of page number.
+    Don't pass cursor to get the first page, then pass 'next_cursor' from response.
+    'next_cursor' is null when there are no more tasks.
+    Feed might be filtered by hashtags (without '#'): ?hashtag=foo&hashtag=bar,
+    'match' defines if task must have any or all of them.
+    Authorization for this endpoint is optional.
+    """,
+    response_model=TasksCursorPage,
+)
+async def get_task_feed_by_cursor(
+    _: GetUser | None = Depends(get_curr_user_or_none),
+    cursor: str | None = Query(default=None, max_length=256),
+    size: int = Query(default=20, ge=20, le=30),
+    hashtag: list[str] = Query(default=[], max_items=5),
+    match: HashtagsMatch = Query(default=HashtagsMatch.ANY),
+) -> TasksCursorPage:
+    try:
+        feed_cursor = FeedCursor.decode(cursor) if cursor else None
+    except ValueError as exc:
+        raise InvalidCursor from exc
+
+    for tag in hashtag:
+        if not re.fullmatch(HASHTAG_REGEX, tag):
+            raise InvalidHashtagFilter(tag)
+    hashtags = [tag.lower() for tag in hashtag]
+
+    return await get_feed_tasks_by_cursor(feed_cursor, size, hashtags, match)
+
+
+@feed_router.get(
+    "/timeline",
+    description="""
+    Personal feed of current user: tasks of creators user is subscribed to.
+    Paginated with opaque cursor, same as /feed/cursor.
+    """,
+    response_model=TasksCursorPage,
+)
+async def get_timeline_for_user(
+    current_user: GetUser = Depends(get_current_user),
+    cursor: str | None = Query(default=None, max_length=256),
+    size: int = Query(default=20, ge=20, le=30),
+) -> TasksCursorPage:
+    try:
+        feed_cursor = FeedCursor.decode(cursor) if cursor else None
+    except ValueError as exc:
+        raise InvalidCursor from exc
+
+    return await get_timeline_tasks(current_user.id, feed_cursor, size)
@@ -0,0 +1,56 @@
+import secrets
+from typing import Any
+
+from fastapi import APIRouter, Depends, Header
+
+from app.api.auth.cache import access_tokens_cache
+from app.api.auth.password_utils import password_hashing_pool
+from app.api.errors import InternalAccessForbidden
+from app.config import settings
+from app.db.metrics import db_stats
+from app.db.models.jobs.handlers import get_jobs_counts
+from app.db.models.tasks.cache import feed_pages_cache, tasks_count_cache
+from app.db.models.users.cache import users_by_email_cache
+from app.db.models.users.exists_filter import users_exists_filter
+from app.db.prepared import prepared_queries
+from app.jobs.queue import jobs_queue
+from app.ratelimit.limiter import rate_limiter
+
+
+async def check_internal_key(x_internal_key: str | None = Header(default=None)) -> None:
+    """
+    Internal endpoints are available only with X-Internal-Key header.
+    They are disabled completely if INTERNAL_API_KEY is not set.
+    """
+    if (
+        settings.internal_api_key is None
+        or x_internal_key is None
+        or not secrets.compare_digest(x_internal_key, settings.internal_api_key)
+    ):
+        raise InternalAccessForbidden
+
+
+internal_router = APIRouter(
+    tags=["Internal"],
+    prefix="/internal",
+    include_in_schema=False,
+    dependencies=[Depends(check_internal_key)],
+)
+
+
+@internal_router.get("/metrics")
+async def get_metrics() -> dict[str, Any]:
+    return {
+        "caches": {
+            "feed_pages": feed_pages_cache.stats(),
+            "tasks_count": tasks_count_cache.stats(),
+            "users_by_email": users_by_email_cache.stats(),
+            "access_tokens": access_tokens_cache.stats(),
+        },
+        "db": db_stats(),
+        "jobs": {**jobs_queue.stats(), "queue": await get_jobs_counts()},
+        "password_hashing": password_hashing_pool.stats(),
+        "prepared_queries": prepared_queries.stats(),
+        "rate_limits": rate_limiter.stats(),
+        "users_exists_filter": users_exists_filter.stats(),
+    }
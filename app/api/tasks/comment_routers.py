@@ -3,7 +3,7 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, Query
 from fastapi_pagination import Page
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
 from app.api.auth.utils import get_current_user
 from app.api.errors import (
@@ -17,7 +17,7 @@ from app.db.models.tasks.comment_handlers import (
     delete_task_comment,
     get_task_comment,
     update_task_comment,
-    get_comments_for_task,
+    get_comments_for_task_json,
     add_comment_to_task,
 )
 from app.schemas import (
@@ -43,7 +43,8 @@ async def get_paginated_comments_for_task(
     page: int = Query(default=1, ge=1),
     size: int = Query(default=10, ge=10, le=20),
 ) -> Page[GetPaginatedTaskComment]:
-    return await get_comments_for_task(task_id, page, size)
+    content = await get_comments_for_task_json(task_id, page, size)
+    return Response(content=content, media_type="application/json")
 
 
 @comment_router.post(
@@ -1,12 +1,11 @@
-import asyncio
 from http import HTTPStatus
 from typing import Any
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query
 from pydantic import UUID4
-from starlette.responses import JSONResponse
+from starlette.responses import JSONResponse, Response
 
-from app.api.auth.utils import get_current_user
+from app.api.auth.utils import get_current_user, get_curr_user_or_none
 from app.api.errors import (
     BadRequestCreatingTask,
     InvalidCreatorSuggesterIds,
@@ -14,52 +13,119 @@ from app.api.errors import (
     TaskNotFound,
     NotCreatorPermissionError,
     BadRequestDeletingTask,
+    InvalidCursor,
 )
+from app.api.etag import etag_matches, make_etag, not_modified
+from app.config import settings
+from app.db.base import database
 from app.db.models.hashtags.utils import extract_and_insert_hashtags
+from app.db.models.tasks.comment_handlers import get_total_count_of_comment_for_task
+from app.db.models.tasks.cursor import SearchCursor
+from app.db.models.tasks.purge import purge_deleted_task
+from app.db.models.tasks.version import get_task_version
 from app.db.models.tasks.task_handlers import (
     create_task,
     update_task,
     get_task_by_id,
-    get_joined_task,
+    get_task_detail_json,
     delete_task,
+    soft_delete_task,
+    search_tasks,
 )
+from app.db.models.timelines.handlers import fan_out_task
+from app.jobs.queue import jobs_queue
 from app.schemas import (
     CreateTask,
     GetTaskNoForeigns,
     GetUser,
     UpdateTask,
     GetTask,
+    TasksCursorPage,
 )
 
 task_router = APIRouter(tags=["Tasks"], prefix="/tasks")
 
 
-@task_router.get("/{task_id}", response_model=GetTask)
+async def extract_hashtags_of_task(task_id: str) -> None:
+    """
+    Description is read when job runs, so job of an older update, e.g. retried one,
+    doesn't overwrite hashtags of a newer description.
+    """
+    if (task := await get_task_by_id(task_id=task_id)) is None:
+        return
+    await extract_and_insert_hashtags(task.description or "", task_id=task_id)
+
+
+EXTRACT_HASHTAGS = jobs_queue.register("extract_hashtags", extract_hashtags_of_task)
+FAN_OUT_TASK = jobs_queue.register("fan_out_task", fan_out_task)
+PURGE_DELETED_TASK = jobs_queue.register("purge_deleted_task", purge_deleted_task)
+
+
+@task_router.get(
+    "/search",
+    description="""
+    Full-text search over title and description of tasks, most relevant first.
+    Supports web search syntax: "quoted phrase", or, -excluded.
+    Paginated with opaque cursor, pass 'next_cursor' from response to get next page.
+    Authorization for this endpoint is optional.
+    """,
+    response_model=TasksCursorPage,
+)
+async def search_for_tasks(
+    _: GetUser | None = Depends(get_curr_user_or_none),
+    q: str = Query(min_length=1, max_length=256),
+    cursor: str | None = Query(default=None, max_length=256),
+    size: int = Query(default=20, ge=20, le=30),
+) -> TasksCursorPage:
+    try:
+        search_cursor = SearchCursor.decode(cursor) if cursor else None
+    except ValueError as exc:
+        raise InvalidCursor from exc
+
+    return await search_tasks(q, search_cursor, size)
+
+
+def _task_etag(version: int, creator_id: str, viewer_id: str) -> str:
+    # creator and other users see different fields
+    return make_etag(version, "creator" if creator_id == viewer_id else "user")
+
+
+@task_router.get(
+    "/{task_id}",
+    description="""
+    Response has ETag header, pass it in 'If-None-Match' to get 304 if nothing changed.
+    Only creator of task sees its assignee, suggester and due date.
+    """,
+    response_model=GetTask,
+)
 async def get_task(
     task_id: UUID4,
     current_user: GetUser = Depends(get_current_user),
+    if_none_match: str | None = Header(default=None),
 ) -> GetTask:
-    if (task := await get_joined_task(task_id=str(task_id))) is None:
+    # cheap check of version on primary, task is built only if it's changed
+    if if_none_match is not None:
+        if (task_version := await get_task_version(task_id=str(task_id))) is None:
+            raise TaskNotFound(str(task_id))
+        etag = _task_etag(*task_version, viewer_id=current_user.id)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)  # type: ignore
+
+    # replica might not have just created task yet
+    task = await get_task_detail_json(str(task_id), viewer_id=current_user.id)
+    if task is None:
+        task = await get_task_detail_json(
+            str(task_id), viewer_id=current_user.id, db=database
+        )
+    if task is None:
         raise TaskNotFound(str(task_id))
 
-    if current_user.id != task.creator_id:
-        # not creator, regular user
-        # don't show some fields
-        task.assignee = None
-        task.assignee_id = None
-        task.assigned_at = None
-        task.due_to_date = None
-        task.suggested_by_id = None
-        task.suggested_by = None
-
-    data = task.dict(exclude_unset=True)
-    if data.get("due_to_date"):
-        data["due_to_date"] = data["due_to_date"].isoformat()
-    if data.get("assigned_at"):
-        data["assigned_at"] = data["assigned_at"].isoformat()
-    data["created_at"] = data["created_at"].isoformat()
-
-    return JSONResponse(content=data)  # type: ignore
+    # etag is made of version of the task which is returned, replica might lag
+    return Response(  # type: ignore
+        content=task.content,
+        media_type="application/json",
+        headers={"ETag": _task_etag(task.version, task.creator_id, current_user.id)},
+    )
 
 
 @task_router.post("", response_model=GetTaskNoForeigns, status_code=HTTPStatus.CREATED)
@@ -82,9 +148,13 @@ async def create_new_task(
     assert task is not None
 
     if task.description:
-        asyncio.create_task(
-            extract_and_insert_hashtags(task.description, task_id=task.id)
-        )
+        await jobs_queue.enqueue(EXTRACT_HASHTAGS, task_id=task.id)
+    await jobs_queue.enqueue(
+        FAN_OUT_TASK,
+        task_id=task.id,
+        creator_id=task.creator_id,
+        created_at=task.created_at,
+    )
 
     return task
 
@@ -112,8 +182,8 @@ async def update_task_info(
     if (err := await update_task(task_id=task_id, values=update_data)) is not None:
         raise BadRequestUpdatingTask(exc=err)
 
-    if (description := update_data.get("description")) is not None:
-        asyncio.create_task(extract_and_insert_hashtags(description, task_id=task_id))
+    if update_data.get("description") is not None:
+        await jobs_queue.enqueue(EXTRACT_HASHTAGS, task_id=task_id)
 
     # due date to string, json error otherwise
     if "due_to_date" in update_data and update_data["due_to_date"] is not None:
@@ -134,7 +204,13 @@ async def delete_task_(
     if task.creator_id != current_user.id:
         raise NotCreatorPermissionError
 
-    if (err := await delete_task(task_id=task_id)) is not None:
+    # large task is hidden at once and its comments are purged in background
+    n_comments = await get_total_count_of_comment_for_task(task_id=task_id, db=database)
+    if n_comments >= settings.tasks_soft_delete_min_comments:
+        if (err := await soft_delete_task(task_id=task_id)) is not None:
+            raise BadRequestDeletingTask(exc=err)
+        await jobs_queue.enqueue(PURGE_DELETED_TASK, task_id=task_id)
+    elif (err := await delete_task(task_id=task_id)) is not None:
         raise BadRequestDeletingTask(exc=err)
 
     return None
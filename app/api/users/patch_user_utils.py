@@ -1,6 +1,6 @@
 from typing import Any
 
-from app.api.auth.password_utils import passwords_are_equal
+from app.api.auth.password_utils import verify_password
 from app.api.errors import InvalidOldPassword, UserAlreadyExist
 from app.db.models.users.handlers import user_exists_in_db
 from app.schemas import GetUser
@@ -11,7 +11,7 @@ async def _new_username_already_exists(username: str | None) -> None:
         raise UserAlreadyExist(username)
 
 
-def _old_passwords_are_equal(
+async def _old_passwords_are_equal(
     update_params: dict[str, Any], user_password: str | None
 ) -> None:
     """
@@ -23,9 +23,9 @@ def _old_passwords_are_equal(
         old_password := update_params.get("old_password")
     ) is not None and update_params.get("password") is not None:
         del update_params["old_password"]
-        if (old_password_in_db := user_password) is not None and not passwords_are_equal(
-            old_password, old_password_in_db
-        ):
+        if (
+            old_password_in_db := user_password
+        ) is not None and not await verify_password(old_password, old_password_in_db):
             raise InvalidOldPassword
 
 
@@ -49,5 +49,5 @@ async def check_patch_params(update_params: dict[str, Any], user: GetUser) -> No
     Initial update_params dictionary might be changed.
     """
     await _new_username_already_exists(update_params.get("username"))
-    _old_passwords_are_equal(update_params, user_password=user.password)
+    await _old_passwords_are_equal(update_params, user_password=user.password)
     _check_same_value_for_update(update_params, user=user)
@@ -4,6 +4,7 @@ from typing import Any
 from fastapi import APIRouter, Depends
 from starlette.responses import JSONResponse
 
+from app.api.auth.password_utils import hash_password
 from app.api.auth.utils import get_current_user
 from app.api.auth.verify_email import (
     create_verify_token_and_send_to_email,
@@ -17,17 +18,24 @@ from app.db.models.users.handlers import (
     create_user,
     update_user,
 )
+from app.ratelimit.limiter import rate_limit
 from app.schemas import GetUser, CreateUser, UpdateUser
 
 users_router = APIRouter(tags=["Users"], prefix="/users")
 
 
-@users_router.post("", response_model=GetUser, status_code=HTTPStatus.CREATED)
+@users_router.post(
+    "",
+    response_model=GetUser,
+    status_code=HTTPStatus.CREATED,
+    dependencies=[Depends(rate_limit("create_user"))],
+)
 async def create_new_user(user_params: CreateUser) -> GetUser:
     """
     Creating new user
     Checking if user is already exists with such username and email
     """
+    user_params.password = await hash_password(user_params.password)
 
     user, err = await create_user(create_user_params=user_params)
     if err:
@@ -35,7 +43,7 @@ async def create_new_user(user_params: CreateUser) -> GetUser:
     assert user is not None
 
     if not user.email_is_verified:
-        create_verify_token_and_send_to_email(
+        await create_verify_token_and_send_to_email(
             email=user.email,
             avatar_url=user.avatar_url,
             username=user.username,
@@ -66,6 +74,8 @@ async def update_user_info(
     update_data: dict[str, Any] = update_user_params.dict(exclude_unset=True)
 
     await check_patch_params(update_params=update_data, user=curr_user)
+    if (password := update_data.get("password")) is not None:
+        update_data["password"] = await hash_password(password)
 
     if (err := await update_user(user_id=curr_user.id, values=update_data)) is not None:
         raise BadRequestUpdatingUser(exc=err)
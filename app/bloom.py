@@ -0,0 +1,53 @@
+import hashlib
+import math
+from typing import Any
+
+
+class BloomFilter:
+    """
+    Set membership with no false negatives and about error_rate false positives
+    while number of added values is below capacity. Values can't be removed.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 0.01) -> None:
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+
+        self.n_bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self._bits = bytearray(math.ceil(self.n_bits / 8))
+        self.n_added = 0
+
+    def _positions(self, value: str) -> list[int]:
+        # double hashing: k positions from two independent 64-bit hashes
+        digest = hashlib.blake2b(value.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.n_bits for i in range(self.n_hashes)]
+
+    def add(self, value: str) -> None:
+        for position in self._positions(value):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.n_added += 1
+
+    def __contains__(self, value: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(value)
+        )
+
+    @property
+    def expected_error_rate(self) -> float:
+        return (
+            1 - math.exp(-self.n_hashes * self.n_added / self.n_bits)
+        ) ** self.n_hashes
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "n_added": self.n_added,
+            "n_bits": self.n_bits,
+            "n_hashes": self.n_hashes,
+            "expected_error_rate": round(self.expected_error_rate, 6),
+        }
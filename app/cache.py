@@ -0,0 +1,223 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class _Entry(Generic[V]):
+    value: V
+    expires_at: float
+
+
+class TTLCache(Generic[K, V]):
+    """
+    In-process LRU cache, entries expire after ttl seconds.
+    Cache is per worker, so ttl bounds staleness caused by writes in other workers.
+
+    Every invalidation bumps generation. Pass generation taken before loading a value
+    to put(), then value loaded before invalidation is not stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.generation = 0
+
+        self._data: OrderedDict[K, _Entry[V]] = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: K) -> V | None:
+        entry = self._data.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return entry.value
+
+    def put(
+        self, key: K, value: V, ttl: float | None = None, generation: int | None = None
+    ) -> None:
+        if generation is not None and generation != self.generation:
+            # value was loaded before invalidation
+            return
+
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = _Entry(value=value, expires_at=time.monotonic() + ttl)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key: K) -> None:
+        self.generation += 1
+        self.invalidations += 1
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self.invalidations += 1
+        self._data.clear()
+
+    @property
+    def hit_ratio(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hit_ratio, 4),
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
+
+
+@dataclass
+class _SWREntry(Generic[V]):
+    value: V
+    fresh_until: float
+    stale_until: float
+    generation: int
+
+
+class AsyncSWRCache(Generic[K, V]):
+    """
+    In-process LRU cache with stale-while-revalidate semantics.
+
+    Entry is fresh for ttl seconds and after that it's still served for stale_ttl
+    seconds, while exactly one background task reloads it.
+    invalidate() doesn't drop entries, it makes all of them stale, so a burst of
+    readers after a write triggers one reload per key instead of one per reader.
+    Concurrent misses of the same key share one load as well.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, stale_ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.generation = 0
+
+        self._data: OrderedDict[K, _SWREntry[V]] = OrderedDict()
+        self._inflight: dict[K, asyncio.Task[V]] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.invalidations = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    async def get_or_load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        now = time.monotonic()
+        if (entry := self._data.get(key)) is not None:
+            if entry.generation == self.generation and now < entry.fresh_until:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return entry.value
+
+            if now < entry.stale_until:
+                self._data.move_to_end(key)
+                self.stale_hits += 1
+                self._refresh_in_background(key, loader)
+                return entry.value
+
+        if (inflight := self._inflight.get(key)) is not None:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            inflight = self._start_load(key, loader)
+        # one cancelled reader must not cancel load for the others
+        return await asyncio.shield(inflight)
+
+    def invalidate(self) -> None:
+        self.generation += 1
+        self.invalidations += 1
+
+    def clear(self) -> None:
+        self.invalidate()
+        self._data.clear()
+
+    def _start_load(
+        self, key: K, loader: Callable[[], Awaitable[V]]
+    ) -> "asyncio.Task[V]":
+        task = asyncio.create_task(self._load(key, loader))
+        self._inflight[key] = task
+        return task
+
+    async def _load(self, key: K, loader: Callable[[], Awaitable[V]]) -> V:
+        generation = self.generation
+        try:
+            value = await loader()
+        finally:
+            self._inflight.pop(key, None)
+
+        if generation == self.generation:
+            now = time.monotonic()
+            self._data[key] = _SWREntry(
+                value=value,
+                fresh_until=now + self.ttl,
+                stale_until=now + self.ttl + self.stale_ttl,
+                generation=generation,
+            )
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def _refresh_in_background(self, key: K, loader: Callable[[], Awaitable[V]]) -> None:
+        if key in self._inflight:
+            return
+
+        self.refreshes += 1
+        task = self._start_load(key, loader)
+        task.add_done_callback(self._log_refresh_error)
+
+    def _log_refresh_error(self, task: "asyncio.Task[V]") -> None:
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            self.refresh_errors += 1
+            logger.error(f"Can't refresh cache entry: {exc}")
+
+    def stats(self) -> dict[str, Any]:
+        total = self.hits + self.stale_hits + self.misses + self.coalesced
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_ratio": round((self.hits + self.stale_hits) / total, 4)
+            if total
+            else 0.0,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+        }
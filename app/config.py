@@ -24,8 +24,80 @@ class Settings(BaseSettings):
     max_connection_count: int = 10
     min_connection_count: int = 10
 
+    # optional read-only replica for heavy reads which tolerate lag, see app.db.base
+    database_read_url: str | PostgresDsn | None = None
+    max_read_connection_count: int = 10
+    min_read_connection_count: int = 10
+    # requests waiting longer for a free connection get 503, see app.db.metrics
+    db_acquire_timeout_seconds: float | None = 10
+
     mailgun_api_key: str | None = None
 
+    # total count of tasks in feed pagination
+    tasks_count_cache_ttl_seconds: float = 60
+    # read planner estimate instead of count(*) when table is larger than this
+    tasks_count_estimate_threshold: int | None = None
+
+    # serialized pages of anonymous feed
+    feed_cache_max_pages: int = 256
+    feed_cache_ttl_seconds: float = 5
+    feed_cache_stale_seconds: float = 30
+
+    # personal feed: tasks of creators with more subscribers are merged on read
+    timeline_fanout_max_subscribers: int = 10_000
+    timeline_fanout_batch_size: int = 1000
+
+    # tasks with more comments are soft deleted and purged by batches in background;
+    # interval of sweeping tasks whose purge didn't finish, see app.db.models.tasks.purge
+    tasks_soft_delete_min_comments: int = 1000
+    tasks_purge_batch_size: int = 1000
+    tasks_purge_interval_seconds: float = 300
+
+    # users read by auth dependency on every request, invalidated on update;
+    # ttl bounds staleness caused by updates in other workers
+    users_cache_max_size: int = 10_000
+    users_cache_ttl_seconds: float = 30
+
+    # bloom filter of registered emails and usernames, see UsersExistenceFilter
+    users_filter_error_rate: float = 0.01
+    users_filter_sync_seconds: float = 5
+    users_filter_rebuild_seconds: float = 3600
+
+    # verified access tokens, each is cached until its expiration
+    access_tokens_cache_max_size: int = 10_000
+
+    # argon2 runs in threads, calls over max_queue waiting for a thread get 503
+    password_hashing_max_workers: int = 4
+    password_hashing_max_queue: int = 64
+
+    # limits of expensive endpoints per client, "<requests>/<seconds>", see app.ratelimit
+    # disabled in test environment by default
+    rate_limit_enabled: bool | None = None
+    rate_limits: dict[str, str] = {
+        "auth_token": "10/60",
+        "create_user": "5/600",
+        "resend_verify_email": "3/600",
+        "refresh_password": "3/600",
+    }
+    # peers whose X-Forwarded-For is trusted when client is identified by IP:
+    # nginx of Dokku connects to app from docker bridge network
+    rate_limit_trusted_proxies: list[str] = ["127.0.0.1", "::1", "172.17.0.0/16"]
+
+    # durable background jobs, see app.jobs.queue
+    # run eagerly in request by default in test environment
+    jobs_run_eagerly: bool | None = None
+    jobs_concurrency: int = 8
+    jobs_poll_seconds: float = 1
+    # claimed job is given to another worker if it isn't finished in lease
+    jobs_lease_seconds: float = 300
+    jobs_max_attempts: int = 5
+    jobs_retry_base_seconds: float = 5
+    jobs_retry_max_seconds: float = 600
+    jobs_drain_timeout_seconds: float = 10
+
+    # key for /internal endpoints, they are disabled if it's not set
+    internal_api_key: str | None = None
+
     @validator("app_env")
     def set_to_default(  # pylint: disable=no-self-argument
         cls, value: AppEnvTypes | None
@@ -34,17 +106,45 @@ class Settings(BaseSettings):
             value = AppEnvTypes.PROD
         return value
 
+    @validator("rate_limit_enabled", always=True)
+    def enable_rate_limit_by_default(  # pylint: disable=no-self-argument
+        cls, value: bool | None, values: dict[str, Any]
+    ) -> bool:
+        if value is None:
+            value = values.get("app_env") != AppEnvTypes.TEST
+        return value
+
+    @validator("jobs_run_eagerly", always=True)
+    def run_jobs_eagerly_in_tests(  # pylint: disable=no-self-argument
+        cls, value: bool | None, values: dict[str, Any]
+    ) -> bool:
+        if value is None:
+            value = values.get("app_env") == AppEnvTypes.TEST
+        return value
+
     @property
     def db_options(self) -> dict[str, Any]:
-        if "postgres" in self.database_url:
-            options = {
-                "min_size": self.min_connection_count,
-                "max_size": self.max_connection_count,
-            }
-        elif "sqlite" in self.database_url:
+        return self._pool_options(
+            self.database_url, self.min_connection_count, self.max_connection_count
+        )
+
+    @property
+    def read_db_options(self) -> dict[str, Any]:
+        assert self.database_read_url is not None
+        return self._pool_options(
+            self.database_read_url,
+            self.min_read_connection_count,
+            self.max_read_connection_count,
+        )
+
+    @staticmethod
+    def _pool_options(db_url: str, min_size: int, max_size: int) -> dict[str, Any]:
+        if "postgres" in db_url:
+            options = {"min_size": min_size, "max_size": max_size}
+        elif "sqlite" in db_url:
             options = {}
         else:
-            raise ValueError(f"Unknown db engine = {self.database_url}")
+            raise ValueError(f"Unknown db engine = {db_url}")
         return options
 
     @property
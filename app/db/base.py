@@ -32,4 +32,17 @@ def get_db(db_url: str | PostgresDsn) -> Database:
     return databases.Database(url=db_url, force_rollback=force_rollback, **db_options)
 
 
+def get_read_db(read_db_url: str | PostgresDsn | None) -> Database:
+    """
+    Replica for read-only queries, it might lag behind primary.
+    Primary is used if replica isn't configured and in tests,
+    where every query runs in one rolled back transaction of primary.
+    """
+    if read_db_url is None or settings.app_env == AppEnvTypes.TEST:
+        return database
+    return databases.Database(url=read_db_url, **settings.read_db_options)
+
+
 database = get_db(db_url=settings.database_url)
+# writes and reads of just written data must go to database
+read_database = get_read_db(read_db_url=settings.database_read_url)
@@ -1,7 +1,9 @@
 import logging
 import sys
 
-from app.db.base import database
+from app.config import settings
+from app.db.base import database, read_database
+from app.db.metrics import instrument_pool, primary_pool_metrics, replica_pool_metrics
 
 logging.basicConfig(stream=sys.stdout, level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -11,6 +13,14 @@ async def connect_to_db() -> None:
     logger.info("Connecting to Database")
 
     await database.connect()
+    if read_database is not database:
+        await read_database.connect()
+
+    if database.url.scheme.startswith("postgres"):
+        timeout = settings.db_acquire_timeout_seconds
+        instrument_pool(database, primary_pool_metrics, timeout)
+        if read_database is not database:
+            instrument_pool(read_database, replica_pool_metrics, timeout)
 
     logger.info("Connection established")
 
@@ -19,5 +29,7 @@ async def close_db_connection() -> None:
     logger.info("Closing connection to database")
 
     await database.disconnect()
+    if read_database is not database:
+        await read_database.disconnect()
 
     logger.info("Connection closed")
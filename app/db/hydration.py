@@ -0,0 +1,97 @@
+"""
+Trusted hydration of response models from DB rows.
+
+parse_obj validates every field again: regexes of emails and urls, lengths, etc.
+Rows written by the app have passed this validation already, so they are mapped
+to models with construct and only types DB can't return as is are converted:
+enums from strings, datetimes from JSON strings and nested models from JSON.
+Conformance of hydrated models to parse_obj is checked by tests.
+"""
+import json
+from collections.abc import Callable, Mapping
+from datetime import datetime
+from enum import Enum
+from functools import partial
+from typing import Any, TypeVar
+
+from pydantic import BaseModel
+from pydantic.datetime_parse import parse_datetime
+from pydantic.fields import SHAPE_SINGLETON, ModelField
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+Converter = Callable[[Any], Any]
+
+# field name, field, converter or None if value is taken as is
+_FieldPlan = tuple[str, ModelField, Converter | None]
+_plans: dict[type[BaseModel], list[_FieldPlan]] = {}
+
+
+def _to_datetime(value: Any) -> datetime:
+    if isinstance(value, datetime):
+        return value
+    res: datetime = parse_datetime(value)
+    return res
+
+
+def _to_model(model: type[BaseModel], value: Any) -> BaseModel:
+    if isinstance(value, model):
+        return value
+    if isinstance(value, (str, bytes)):
+        value = json.loads(value)
+    return hydrate(model, value)
+
+
+def _field_converter(field: ModelField) -> Converter | None:
+    type_ = field.type_
+    if field.shape != SHAPE_SINGLETON or not isinstance(type_, type):
+        return None
+
+    convert: Converter
+    if issubclass(type_, Enum):
+        convert = type_
+    elif issubclass(type_, datetime):
+        convert = _to_datetime
+    elif issubclass(type_, BaseModel):
+        convert = partial(_to_model, type_)
+    else:
+        return None
+
+    if field.allow_none:
+        return lambda value: None if value is None else convert(value)
+    return convert
+
+
+def _get_plan(model: type[BaseModel]) -> list[_FieldPlan]:
+    if (plan := _plans.get(model)) is None:
+        plan = [
+            (name, field, _field_converter(field))
+            for name, field in model.__fields__.items()
+        ]
+        _plans[model] = plan
+    return plan
+
+
+def hydrate(model: type[ModelT], data: Mapping[str, Any]) -> ModelT:
+    """
+    Model from trusted data, e.g. DB row or JSON built by DB, without validation.
+    Like parse_obj, only fields present in data are set, others get defaults,
+    unknown keys are ignored.
+    data: dict, Record._mapping of databases or asyncpg Record converted to dict.
+    """
+    values: dict[str, Any] = {}
+    fields_set: set[str] = set()
+    for name, field, convert in _get_plan(model):
+        if name in data:
+            value = data[name]
+            values[name] = value if convert is None else convert(value)
+            fields_set.add(name)
+        elif not field.required:
+            values[name] = field.get_default()
+
+    # same as model.construct, which is noticeably slower on hot paths
+    res: ModelT = object.__new__(model)
+    object.__setattr__(res, "__dict__", values)
+    object.__setattr__(res, "__fields_set__", fields_set)
+    if model.__private_attributes__:
+        res._init_private_attributes()  # pylint: disable=protected-access
+    return res
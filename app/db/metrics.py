@@ -0,0 +1,130 @@
+"""
+Metrics of connection pools and DB handlers, exposed on /internal/metrics.
+
+Waiting for a free connection is measured separately from handlers,
+so queueing on a too small pool can be told apart from slow queries.
+"""
+import asyncio
+import functools
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, ParamSpec, TypeVar
+
+from asyncpg.pool import Pool
+from databases import Database
+
+from app.api.errors import DatabaseOverloaded
+from app.metrics import Histogram
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.pool: Pool | None = None
+        self.waiting = 0
+        self.acquired = 0
+        self.timeouts = 0
+        self.acquire_wait = Histogram()
+
+    def stats(self) -> dict[str, Any]:
+        pool = self.pool
+        size = pool.get_size() if pool is not None else 0
+        idle = pool.get_idle_size() if pool is not None else 0
+        return {
+            "min_size": pool.get_min_size() if pool is not None else 0,
+            "max_size": pool.get_max_size() if pool is not None else 0,
+            "size": size,
+            "in_use": size - idle,
+            "idle": idle,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "timeouts": self.timeouts,
+            "acquire_wait": self.acquire_wait.stats(),
+        }
+
+
+class InstrumentedPool:
+    """
+    Proxy of asyncpg pool of databases backend, measures waiting for connections.
+    Waiting longer than acquire_timeout fails request with 503.
+    """
+
+    def __init__(
+        self, pool: Pool, metrics: PoolMetrics, acquire_timeout: float | None
+    ) -> None:
+        self._pool = pool
+        self._metrics = metrics
+        self._acquire_timeout = acquire_timeout
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._pool, name)
+
+    async def acquire(self) -> Any:
+        metrics = self._metrics
+        metrics.waiting += 1
+        started = time.perf_counter()
+        try:
+            connection = await self._pool.acquire(timeout=self._acquire_timeout)
+        except asyncio.TimeoutError as exc:
+            metrics.timeouts += 1
+            raise DatabaseOverloaded from exc
+        finally:
+            metrics.waiting -= 1
+            metrics.acquire_wait.observe(time.perf_counter() - started)
+
+        metrics.acquired += 1
+        return connection
+
+
+def instrument_pool(
+    db: Database, metrics: PoolMetrics, acquire_timeout: float | None
+) -> None:
+    """
+    Call after db.connect(), pool is created on connect.
+    """
+    # databases doesn't expose its pool, backend calls only acquire/release/close
+    backend = db._backend  # pylint: disable=protected-access
+    pool: Pool = backend._pool  # pylint: disable=protected-access
+    backend._pool = InstrumentedPool(  # pylint: disable=protected-access
+        pool, metrics, acquire_timeout
+    )
+    metrics.pool = pool
+
+
+primary_pool_metrics = PoolMetrics()
+replica_pool_metrics = PoolMetrics()
+
+handlers_durations: dict[str, Histogram] = {}
+
+
+def timed(handler: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    """
+    Collects durations of DB handler, including waiting for connection.
+    """
+    module = handler.__module__.removeprefix("app.db.models.")
+    durations = handlers_durations.setdefault(f"{module}.{handler.__name__}", Histogram())
+
+    @functools.wraps(handler)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        started = time.perf_counter()
+        try:
+            return await handler(*args, **kwargs)
+        finally:
+            durations.observe(time.perf_counter() - started)
+
+    return wrapper
+
+
+def db_stats() -> dict[str, Any]:
+    pools = {"primary": primary_pool_metrics.stats()}
+    if replica_pool_metrics.pool is not None:
+        pools["replica"] = replica_pool_metrics.stats()
+    return {
+        "pools": pools,
+        "handlers": {
+            name: durations.stats()
+            for name, durations in sorted(handlers_durations.items())
+        },
+    }
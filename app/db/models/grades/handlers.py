@@ -6,13 +6,15 @@ from sqlalchemy import insert, select
 from databases.backends.postgres import Record
 from pydantic import ValidationError
 
-from app.db.base import database
+from app.db.base import database, read_database
+from app.db.metrics import timed
 from app.schemas import GradeFeed, CreateGrade, Grade
 from app.db.models.grades.schemas import Grade as GradeSchema
 
 logger = logging.getLogger()
 
 
+@timed
 async def create_grade(
     create_grade_params: CreateGrade,
 ) -> tuple[Grade | None, str | None]:
@@ -42,6 +44,7 @@ async def create_grade(
         return grade, None
 
 
+@timed
 async def get_grade_by_id(grade_id: str) -> Grade | None:
     query = select(Grade).where(Grade.id == grade_id).limit(1)
 
@@ -57,6 +60,7 @@ async def get_grade_by_id(grade_id: str) -> Grade | None:
         return parsed_grade
 
 
+@timed
 async def get_user_grades(user_id: str) -> GradeFeed:
     """
     Returns user grades, along with its applicability:
@@ -68,6 +72,6 @@ async def get_user_grades(user_id: str) -> GradeFeed:
     5: Is creator
     """
     query = select(GradeSchema).where(GradeSchema.user_id == user_id)
-    fetched_data = await database.fetch_one(query)
+    fetched_data = await read_database.fetch_one(query)
     res: GradeFeed = GradeFeed.parse_obj({"grades": json.loads(fetched_data["grades"])})
     return res
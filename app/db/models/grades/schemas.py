@@ -20,5 +20,7 @@ class Grade(Base):
     )
     grade_variant_int = Column(Integer, default=-1, nullable=False)
     grade_rights = Column(JSON, nullable=True)
-    task_id = Column(String, ForeignKey("tasks.id"), index=True, nullable=True)
+    task_id = Column(
+        String, ForeignKey("tasks.id", ondelete="CASCADE"), index=True, nullable=True
+    )
     degrades_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,10 +1,9 @@
 import logging
 
-from sqlalchemy import delete, select
+from sqlalchemy import select
 
-from sqlalchemy.dialects.postgresql import insert
-
-from app.db.base import database
+from app.db.base import database, read_database
+from app.db.metrics import timed
 from app.db.models.hashtags.schemas import Hashtag
 from app.schemas import TaskHashtags
 
@@ -12,22 +11,45 @@ from app.schemas import TaskHashtags
 logger = logging.getLogger()
 
 
-async def add_hashtags(tags: list[str], task_id: str) -> None:
+_SYNC_HASHTAGS_QUERY = """
+WITH deleted AS (
+    DELETE FROM hashtags
+    WHERE task_id = :task_id AND hashtag <> ALL(CAST(:tags AS varchar[]))
+    RETURNING 1
+),
+inserted AS (
+    INSERT INTO hashtags (task_id, hashtag)
+    SELECT :task_id, tag FROM unnest(CAST(:tags AS varchar[])) AS tag
+    ON CONFLICT (task_id, hashtag) DO NOTHING
+    RETURNING 1
+),
+-- hashtags are part of task detail, see get_task_detail_json
+bumped AS (
+    UPDATE tasks SET version = nextval('tasks_version_seq')
+    WHERE id = :task_id
+        AND (EXISTS (SELECT FROM deleted) OR EXISTS (SELECT FROM inserted))
+    RETURNING 1
+)
+SELECT count(*) FROM bumped;
+"""
+
+
+@timed
+async def add_hashtags(tags: list[str], task_id: str) -> bool:
     """
-    Remove all hastags for task
-    And then insert new ones
+    Sync hashtags of task with tags in one statement: only removed hashtags
+    are deleted and only new ones are inserted, unchanged rows aren't touched.
+    Version of task is bumped only if hashtags have changed.
+    Returns True if they have.
     """
-    data = [{"task_id": task_id, "hashtag": tag} for tag in tags]
-
-    insert_query = insert(Hashtag)
-    delete_query = delete(Hashtag).where(Hashtag.task_id == task_id)
-    async with database.transaction():
-        await database.execute(delete_query)
-        await database.execute_many(insert_query, data)
+    values = {"task_id": task_id, "tags": sorted(set(tags))}
+    n_bumped: int = await database.fetch_val(_SYNC_HASHTAGS_QUERY, values)
+    return n_bumped > 0
 
 
+@timed
 async def get_hashtags_for_task(task_id: str) -> TaskHashtags:
     query = select(Hashtag.id, Hashtag.hashtag).where(Hashtag.task_id == task_id)
-    fetched_data = await database.fetch_all(query)
+    fetched_data = await read_database.fetch_all(query)
     res: TaskHashtags = TaskHashtags.parse_obj({"hashtags": fetched_data})
     return res
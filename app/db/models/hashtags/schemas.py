@@ -1,4 +1,4 @@
-from sqlalchemy import String, text, Column, ForeignKey
+from sqlalchemy import String, text, Column, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
@@ -13,5 +13,13 @@ class Hashtag(Base):
 
     hashtag = Column(String(length=20), nullable=False)
 
-    task_id = Column(String, ForeignKey("tasks.id"), index=True, nullable=False)
+    task_id = Column(String, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
     assignee = relationship("Task", foreign_keys=[task_id], backref="hashtags")
+
+    __table_args__ = (
+        # hashtags of task are synced by diff, see add_hashtags;
+        # also serves lookups by task_id
+        UniqueConstraint("task_id", "hashtag", name="uq_hashtags_task_id_hashtag"),
+        # feed filtered by hashtags, see get_feed_tasks_by_cursor
+        Index("ix_hashtags_hashtag_task_id", "hashtag", "task_id"),
+    )
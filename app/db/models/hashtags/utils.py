@@ -2,6 +2,9 @@ import re
 
 from app.db.models.hashtags.handlers import add_hashtags
 
+# hashtag without '#', as it's stored in db
+HASHTAG_REGEX = r"[-_0-9a-zA-Z]{1,20}"
+
 
 def extract_hashtags_from_text(text: str) -> list[str]:
     hashtag_reg = r"\B\#([-_0-9a-zA-Z]{1,20}\b)\s?(?![;=@!±§<>\.\?#$%^&*\(\)])"
@@ -0,0 +1,115 @@
+import json
+from typing import Any, NamedTuple
+
+from databases.backends.postgres import Record
+from pydantic.json import pydantic_encoder
+
+from app.db.base import database
+from app.db.metrics import timed
+
+
+class ClaimedJob(NamedTuple):
+    id: str  # noqa
+    kind: str
+    payload: dict[str, Any]
+    attempts: int
+
+
+@timed
+async def enqueue_job(kind: str, payload: dict[str, Any]) -> str:
+    """
+    payload: JSON-serializable keyword arguments of job handler,
+    datetimes, enums and models are encoded like in responses.
+    Returns id of job.
+    """
+    query = """
+    INSERT INTO jobs (kind, payload) VALUES (:kind, :payload) RETURNING id
+    """
+    values = {"kind": kind, "payload": json.dumps(payload, default=pydantic_encoder)}
+    res: str = await database.fetch_val(query, values)
+    return res
+
+
+@timed
+async def claim_jobs(limit: int, lease_seconds: float) -> list[ClaimedJob]:
+    """
+    Jobs ready to run, each is claimed by one worker only.
+    Claimed job becomes available again after lease, unless it's done or retried.
+    """
+    query = """
+    UPDATE jobs
+    SET run_at = now() + make_interval(secs => :lease_seconds),
+        attempts = attempts + 1
+    WHERE id IN (
+        SELECT id FROM jobs
+        WHERE failed_at IS NULL AND run_at <= now()
+        ORDER BY run_at
+        LIMIT :limit
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING id, kind, payload, attempts
+    """
+    values = {"limit": limit, "lease_seconds": lease_seconds}
+    rows: list[Record] = await database.fetch_all(query, values)
+    return [
+        ClaimedJob(row["id"], row["kind"], json.loads(row["payload"]), row["attempts"])
+        for row in rows
+    ]
+
+
+@timed
+async def complete_job(job_id: str) -> None:
+    await database.execute("DELETE FROM jobs WHERE id=:job_id", {"job_id": job_id})
+
+
+@timed
+async def retry_job(job_id: str, delay_seconds: float, error: str) -> None:
+    query = """
+    UPDATE jobs
+    SET run_at = now() + make_interval(secs => :delay_seconds), last_error = :error
+    WHERE id=:job_id
+    """
+    values = {"job_id": job_id, "delay_seconds": delay_seconds, "error": error}
+    await database.execute(query, values)
+
+
+@timed
+async def fail_job(job_id: str, error: str) -> None:
+    query = """
+    UPDATE jobs SET failed_at = now(), last_error = :error WHERE id=:job_id
+    """
+    await database.execute(query, {"job_id": job_id, "error": error})
+
+
+@timed
+async def release_jobs(job_ids: list[str], delay_seconds: float = 0) -> None:
+    """
+    Return claimed jobs to queue, e.g. when they are interrupted by shutdown.
+    Attempt isn't counted.
+    """
+    query = """
+    UPDATE jobs
+    SET run_at = now() + make_interval(secs => :delay_seconds),
+        attempts = attempts - 1
+    WHERE id = ANY(CAST(:job_ids AS varchar[]))
+    """
+    await database.execute(query, {"job_ids": job_ids, "delay_seconds": delay_seconds})
+
+
+@timed
+async def get_jobs_counts() -> dict[str, dict[str, int]]:
+    """
+    Counts of pending (including running) and failed jobs by kind.
+    """
+    query = """
+    SELECT
+        kind,
+        count(*) FILTER (WHERE failed_at IS NULL) AS pending,
+        count(*) FILTER (WHERE failed_at IS NOT NULL) AS failed
+    FROM jobs
+    GROUP BY kind
+    """
+    rows: list[Record] = await database.fetch_all(query)
+    return {
+        row["kind"]: {"pending": row["pending"], "failed": row["failed"]} for row in rows
+    }
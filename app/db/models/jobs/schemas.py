@@ -0,0 +1,34 @@
+from sqlalchemy import Column, String, Text, DateTime, Integer, JSON, Index, func, text
+
+from app.db.base import Base
+
+
+class Job(Base):
+    """
+    Durable background job, see app.jobs.queue.
+    Claimed job has run_at moved forward by lease, so jobs of crashed workers
+    become available again when lease expires. Done jobs are deleted.
+    """
+
+    __tablename__ = "jobs"
+
+    id = Column(  # noqa
+        String, primary_key=True, server_default=text("gen_random_uuid()::varchar")
+    )
+
+    kind = Column(String(length=64), nullable=False)
+    # keyword arguments of handler registered for kind
+    payload = Column(JSON, nullable=False)
+
+    attempts = Column(Integer, server_default="0", default=0, nullable=False)
+    run_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    last_error = Column(Text, nullable=True)
+    # set when all attempts have failed, such jobs are kept for investigation
+    failed_at = Column(DateTime(timezone=True), nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # jobs ready to run, see claim_jobs
+        Index("ix_jobs_run_at", "run_at", postgresql_where=text("failed_at IS NULL")),
+    )
@@ -0,0 +1,14 @@
+from app.cache import AsyncSWRCache, TTLCache
+from app.config import settings
+
+TASKS_COUNT_KEY = "tasks"
+tasks_count_cache: TTLCache[str, int] = TTLCache(
+    maxsize=1, ttl=settings.tasks_count_cache_ttl_seconds
+)
+
+# (page, size) -> (tasks version, serialized Page[TaskFeed]) of anonymous feed
+feed_pages_cache: AsyncSWRCache[tuple[int, int], tuple[int, bytes]] = AsyncSWRCache(
+    maxsize=settings.feed_cache_max_pages,
+    ttl=settings.feed_cache_ttl_seconds,
+    stale_ttl=settings.feed_cache_stale_seconds,
+)
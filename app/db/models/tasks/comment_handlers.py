@@ -1,25 +1,44 @@
 import asyncio
-import json
 import logging
 from datetime import datetime, timezone
 from typing import Any
 
-from math import ceil
-
 from asyncpg import NotNullViolationError, UniqueViolationError, ForeignKeyViolationError
+from databases import Database
 from databases.backends.postgres import Record
-from fastapi_pagination import Page
 from pydantic import ValidationError
 from sqlalchemy import insert, literal_column, select, update, delete
 
-from app.db.base import database
-from app.db.models.tasks.schemas import TaskComment
-from app.schemas import CreateTaskComment, GetTaskComment, GetPaginatedTaskComment
+from app.db.base import database, read_database
+from app.db.metrics import timed
+from app.db.hydration import hydrate
+from app.db.prepared import prepared_queries, select_columns
+from app.db.models.tasks.cache import feed_pages_cache
+from app.db.models.tasks.schemas import Task, TaskComment, tasks_version_seq
+from app.db.models.tasks.version import bump_tasks_version
+from app.db.raw_page import build_raw_page
+from app.schemas import CreateTaskComment, GetTaskComment
 
 
 logger = logging.getLogger()
 
-
+# comments of soft deleted task are hidden, they are being purged
+_TASK_NOT_DELETED = (
+    "EXISTS (SELECT 1 FROM tasks "
+    "WHERE tasks.id = tasks_comments.task_id AND tasks.deleted_at IS NULL)"
+)
+GET_TASK_COMMENT = prepared_queries.register(
+    "get_task_comment",
+    f"SELECT {select_columns(TaskComment.__table__)} "
+    f"FROM tasks_comments WHERE id = $1 AND {_TASK_NOT_DELETED} LIMIT 1",
+)
+COMMENT_EXISTS = prepared_queries.register(
+    "comment_exists",
+    f"SELECT 1 FROM tasks_comments WHERE id = $1 AND {_TASK_NOT_DELETED} LIMIT 1",
+)
+
+
+@timed
 async def add_comment_to_task(
     create_comment_params: CreateTaskComment,
 ) -> tuple[GetTaskComment | None, str | None]:
@@ -32,8 +51,20 @@ async def add_comment_to_task(
         .values(create_params)
         .returning(literal_column("id"), literal_column("created_at"))
     )
+    # soft deleted task doesn't get new comments, its row stays locked till commit,
+    # so it isn't soft deleted concurrently either
+    increment_query = (
+        update(Task)
+        .where(Task.id == task_id, Task.deleted_at.is_(None))
+        .values(n_comments=Task.n_comments + 1, version=tasks_version_seq.next_value())
+        .returning(Task.id)
+    )
     transaction = await database.transaction()
     try:
+        if await database.fetch_val(increment_query) is None:
+            await transaction.rollback()
+            return None, f"Task {task_id} doesn't exist"
+
         row: Record = await database.fetch_one(query)
 
         comment_id, created_at = row._mapping.values()
@@ -51,24 +82,61 @@ async def add_comment_to_task(
         return None, str(exc)
     else:
         await transaction.commit()
+        feed_pages_cache.invalidate()
+        await bump_tasks_version()
         return task, None
 
 
+@timed
 async def comment_exists_in_db(comment_id: str) -> bool:
-    query = select([TaskComment.id]).where(TaskComment.id == comment_id).limit(1)
-    res: Record = await database.fetch_one(query)
-    return bool(res)
+    return await prepared_queries.fetch_val(COMMENT_EXISTS, comment_id) is not None
+
 
+@timed
+async def get_total_count_of_comment_for_task(
+    task_id: str, db: Database = read_database
+) -> int:
+    """
+    Counter is maintained by add_comment_to_task and delete_task_comment,
+    see reconcile_comments_counters in case of drift.
+    Replica might lag, read from primary if count is used for writes.
+    """
+    query = select(Task.n_comments).where(Task.id == task_id, Task.deleted_at.is_(None))
+    res: int | None = await db.fetch_val(query)
+    return res or 0
 
-async def get_total_count_of_comment_for_task(task_id: str) -> int:
-    # todo: cache this value for each task_id
 
-    query = "SELECT COUNT(*) FROM tasks_comments WHERE task_id=:task_id"
-    res: int = await database.fetch_val(query, {"task_id": task_id})
+@timed
+async def reconcile_comments_counters() -> int:
+    """
+    Recount comments for all tasks and fix drifted counters in one statement.
+    Returns number of fixed tasks.
+    """
+    query = """
+    WITH fixed AS (
+        UPDATE tasks
+        SET n_comments = counts.n_comments
+        FROM (
+            SELECT tasks.id, count(tc.id) as n_comments
+            FROM tasks
+            LEFT JOIN tasks_comments tc ON tasks.id = tc.task_id
+            GROUP BY tasks.id
+        ) counts
+        WHERE tasks.id = counts.id AND tasks.n_comments <> counts.n_comments
+        RETURNING tasks.id
+    )
+    SELECT count(*) FROM fixed;
+    """
+    res: int = await database.fetch_val(query)
     return res
 
 
-async def get_comments_for_task(task_id: str, page: int, size: int) -> Page:
+@timed
+async def get_comments_for_task_json(task_id: str, page: int, size: int) -> bytes:
+    """
+    Serialized Page[GetPaginatedTaskComment],
+    JSON of comments is built by DB and isn't parsed.
+    """
     _query = """
     WITH comments_table as (
         SELECT
@@ -86,7 +154,10 @@ async def get_comments_for_task(task_id: str, page: int, size: int) -> Page:
             ) as comments
         FROM tasks_comments comment
         LEFT JOIN users ON comment.user_id = users.id
-        WHERE comment.task_id=:task_id
+        WHERE comment.task_id=:task_id AND NOT EXISTS (
+            -- soft deleted task, comments are being purged
+            SELECT 1 FROM tasks WHERE tasks.id=:task_id AND tasks.deleted_at IS NOT NULL
+        )
         ORDER BY comment.created_at DESC
         LIMIT :limit
         OFFSET :offset
@@ -95,38 +166,24 @@ async def get_comments_for_task(task_id: str, page: int, size: int) -> Page:
     """
     values = {"task_id": task_id, "limit": size, "offset": (page - 1) * size}
 
-    fetched_comments: Record
-    fetched_comments, total = await asyncio.gather(
+    comments_json, total = await asyncio.gather(
         *(
-            database.fetch_one(_query, values),
+            read_database.fetch_val(_query, values),
             get_total_count_of_comment_for_task(task_id),
         )
     )
-    if not fetched_comments or not fetched_comments["comments"]:
-        comments = []
-    else:
-        _dict_comments = json.loads(fetched_comments["comments"])
-        comments = [GetPaginatedTaskComment.parse_obj(com) for com in _dict_comments]
-
-    total_pages = ceil(total / size)
-    return Page(total=total, page=page, size=size, items=comments, pages=total_pages)
+    return build_raw_page(comments_json, total=total, page=page, size=size)
 
 
+@timed
 async def get_task_comment(comment_id: str) -> GetTaskComment | None:
-    query = select(TaskComment).where(TaskComment.id == comment_id).limit(1)
-
-    if not (_res := await database.fetch_one(query)):
+    if not (_res := await prepared_queries.fetch_one(GET_TASK_COMMENT, comment_id)):
         return None
 
-    try:
-        parsed_comment: GetTaskComment = GetTaskComment.parse_obj(_res)
-    except ValidationError as exc:
-        logger.error(f"Can't parse task comment with {comment_id=}, {_res}: {exc}")
-        return None
-    else:
-        return parsed_comment
+    return hydrate(GetTaskComment, dict(_res))
 
 
+@timed
 async def update_task_comment(comment_id: str, values: dict[str, Any]) -> str | None:
     """
     Returns optional error
@@ -154,6 +211,24 @@ async def update_task_comment(comment_id: str, values: dict[str, Any]) -> str |
         return None
 
 
+@timed
 async def delete_task_comment(comment_id: str) -> None:
-    query = delete(TaskComment).where(TaskComment.id == comment_id)
-    await database.execute(query)
+    query = (
+        delete(TaskComment)
+        .where(TaskComment.id == comment_id)
+        .returning(TaskComment.task_id)
+    )
+    async with database.transaction():
+        if (task_id := await database.fetch_val(query)) is None:
+            return
+
+        decrement_query = (
+            update(Task)
+            .where(Task.id == task_id)
+            .values(
+                n_comments=Task.n_comments - 1, version=tasks_version_seq.next_value()
+            )
+        )
+        await database.execute(decrement_query)
+    feed_pages_cache.invalidate()
+    await bump_tasks_version()
@@ -0,0 +1,109 @@
+import base64
+import binascii
+import json
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import NamedTuple
+
+from databases.backends.postgres import Record
+
+from app.db.hydration import hydrate
+from app.schemas import TaskFeed, TasksCursorPage
+
+
+def encode_cursor(*values: str | float) -> str:
+    """
+    Pack values into opaque url-safe string, which is handed to the client.
+    """
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> list[str | float]:
+    """
+    Reverse of encode_cursor.
+    Raises ValueError if cursor is malformed.
+    """
+    padded = cursor + "=" * (-len(cursor) % 4)
+    try:
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as exc:
+        raise ValueError(f"Malformed cursor: {cursor}") from exc
+
+    if not isinstance(values, list):
+        raise ValueError(f"Malformed cursor: {cursor}")
+    return values
+
+
+class FeedCursor(NamedTuple):
+    """
+    Position in feed ordered by (created_at DESC, id DESC).
+    Next page starts strictly after this task.
+    """
+
+    created_at: datetime
+    id: str  # noqa
+
+    def encode(self) -> str:
+        return encode_cursor(self.created_at.isoformat(), self.id)
+
+    @classmethod
+    def decode(cls, cursor: str) -> "FeedCursor":
+        values = decode_cursor(cursor)
+        if len(values) != 2 or not all(isinstance(value, str) for value in values):
+            raise ValueError(f"Malformed cursor: {cursor}")
+
+        created_at, task_id = values
+        parsed_created_at = datetime.fromisoformat(str(created_at))
+        if parsed_created_at.tzinfo is None:
+            raise ValueError(f"Malformed cursor: {cursor}")
+        return cls(created_at=parsed_created_at, id=str(task_id))
+
+
+class SearchCursor(NamedTuple):
+    """
+    Position in search results ordered by (rank DESC, id DESC).
+    """
+
+    rank: float
+    id: str  # noqa
+
+    def encode(self) -> str:
+        return encode_cursor(self.rank, self.id)
+
+    @classmethod
+    def decode(cls, cursor: str) -> "SearchCursor":
+        values = decode_cursor(cursor)
+        if (
+            len(values) != 2
+            or not isinstance(values[0], (int, float))
+            or not isinstance(values[1], str)
+        ):
+            raise ValueError(f"Malformed cursor: {cursor}")
+
+        rank, task_id = values
+        return cls(rank=float(rank), id=str(task_id))
+
+
+def build_cursor_page(
+    rows: Sequence[Record], size: int, cursor_from_row: Callable[[Record], str]
+) -> TasksCursorPage:
+    """
+    rows: up to size + 1 rows with json 'task' column in pagination order.
+        Extra row means there is a next page.
+    cursor_from_row: encoded position of row, next page starts after it.
+    """
+    page_rows = rows[:size]
+    tasks = [hydrate(TaskFeed, json.loads(row["task"])) for row in page_rows]
+
+    next_cursor = cursor_from_row(page_rows[-1]) if len(rows) > size else None
+    return TasksCursorPage(items=tasks, size=size, next_cursor=next_cursor)
+
+
+def build_feed_cursor_page(rows: Sequence[Record], size: int) -> TasksCursorPage:
+    """
+    rows: ordered by (created_at DESC, id DESC), with 'id' and 'created_at' columns.
+    """
+    return build_cursor_page(
+        rows, size, lambda row: FeedCursor(row["created_at"], row["id"]).encode()
+    )
@@ -0,0 +1,102 @@
+"""
+Purge of soft deleted tasks, see soft_delete_task.
+
+Rows of task are deleted by batches, every batch is a separate short statement,
+so deleting a task with thousands of comments doesn't hold locks for long.
+Task itself is deleted last, remaining rows are removed by cascading foreign keys.
+Purges which didn't finish, e.g. because worker was restarted, are retried by sweeper.
+"""
+import asyncio
+import contextlib
+import logging
+
+from databases.backends.postgres import Record
+
+from app.config import settings
+from app.db.base import database
+from app.db.metrics import timed
+
+logger = logging.getLogger()
+
+# tables with a lot of rows per task, others are left to cascades
+_PURGE_QUERIES = (
+    """
+    WITH deleted AS (
+        DELETE FROM tasks_comments
+        WHERE id IN (
+            SELECT id FROM tasks_comments WHERE task_id=:task_id LIMIT :limit
+        )
+        RETURNING 1
+    )
+    SELECT count(*) FROM deleted
+    """,
+    """
+    WITH deleted AS (
+        DELETE FROM timelines
+        WHERE (user_id, task_id) IN (
+            SELECT user_id, task_id FROM timelines WHERE task_id=:task_id LIMIT :limit
+        )
+        RETURNING 1
+    )
+    SELECT count(*) FROM deleted
+    """,
+)
+
+
+@timed
+async def purge_deleted_task(task_id: str) -> None:
+    batch_size = settings.tasks_purge_batch_size
+    values = {"task_id": task_id, "limit": batch_size}
+    for query in _PURGE_QUERIES:
+        while True:
+            n_deleted: int = await database.fetch_val(query, values)
+            if n_deleted < batch_size:
+                break
+
+    query = "DELETE FROM tasks WHERE id=:task_id AND deleted_at IS NOT NULL"
+    await database.execute(query, {"task_id": task_id})
+
+
+@timed
+async def purge_deleted_tasks() -> int:
+    """
+    Purge tasks which were soft deleted before the previous sweep.
+    Returns number of purged tasks.
+    """
+    query = """
+    SELECT id FROM tasks
+    WHERE deleted_at IS NOT NULL
+        AND deleted_at < now() - make_interval(secs => :interval)
+    ORDER BY deleted_at
+    """
+    values = {"interval": settings.tasks_purge_interval_seconds}
+    rows: list[Record] = await database.fetch_all(query, values)
+    for row in rows:
+        await purge_deleted_task(row["id"])
+    return len(rows)
+
+
+_purge_task: asyncio.Task[None] | None = None
+
+
+async def _purge_periodically() -> None:
+    while True:
+        await asyncio.sleep(settings.tasks_purge_interval_seconds)
+        try:
+            if n_purged := await purge_deleted_tasks():
+                logger.info(f"Purged {n_purged} soft deleted tasks")
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error(f"Can't purge soft deleted tasks: {exc}")
+
+
+async def start_tasks_purge() -> None:
+    global _purge_task  # pylint: disable=global-statement
+
+    _purge_task = asyncio.create_task(_purge_periodically())
+
+
+async def stop_tasks_purge() -> None:
+    if _purge_task is not None:
+        _purge_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _purge_task
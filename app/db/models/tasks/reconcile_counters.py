@@ -0,0 +1,24 @@
+"""
+Repair denormalized tasks.n_comments counters in bulk.
+Usage: PYTHONPATH=. python -m app.db.models.tasks.reconcile_counters
+"""
+import asyncio
+import logging
+
+from app.db.events import connect_to_db, close_db_connection
+from app.db.models.tasks.comment_handlers import reconcile_comments_counters
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    await connect_to_db()
+    try:
+        n_fixed = await reconcile_comments_counters()
+        logger.info(f"Fixed comments counters for {n_fixed} tasks")
+    finally:
+        await close_db_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
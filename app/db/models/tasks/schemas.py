@@ -1,9 +1,27 @@
-from sqlalchemy import Column, String, Enum, DateTime, func, text, ForeignKey, Boolean
+from sqlalchemy import (
+    Column,
+    String,
+    Enum,
+    DateTime,
+    func,
+    text,
+    ForeignKey,
+    Boolean,
+    Index,
+    Integer,
+    Computed,
+    BigInteger,
+    Sequence,
+)
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import relationship
 
 from app.db.base import Base
 from app.types import TaskStatus
 
+# every write of a task takes next value, see app.db.models.tasks.version
+tasks_version_seq = Sequence("tasks_version_seq", metadata=Base.metadata)
+
 
 class Task(Base):
     __tablename__ = "tasks"
@@ -29,18 +47,52 @@ class Task(Base):
     creator_id = Column(String, ForeignKey("users.id"), nullable=False)
 
     # any user can suggest a task to creator
-    suggested_by_id = Column(String, ForeignKey("users.id"), nullable=True)
+    suggested_by_id = Column(String, ForeignKey("users.id"), index=True, nullable=True)
 
     # some user might be responsible for an execution of task
-    assignee_id = Column(String, ForeignKey("users.id"), nullable=True)
+    assignee_id = Column(String, ForeignKey("users.id"), index=True, nullable=True)
     assigned_at = Column(DateTime(timezone=True), nullable=True)
 
+    # denormalized, maintained on comment insert/delete
+    n_comments = Column(Integer, server_default="0", default=0, nullable=False)
+
+    version = Column(
+        BigInteger, server_default=tasks_version_seq.next_value(), nullable=False
+    )
+
+    # soft deleted task is hidden, its rows are purged in background,
+    # see app.db.models.tasks.purge
+    deleted_at = Column(DateTime(timezone=True), nullable=True)
+
+    # full-text search over title and description, see search_tasks
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            "to_tsvector('simple', "
+            "coalesce(title, '') || ' ' || coalesce(description, ''))",
+            persisted=True,
+        ),
+    )
+
     creator = relationship("User", foreign_keys=[creator_id], backref="tasks")
     suggested_by = relationship(
         "User", foreign_keys=[suggested_by_id], backref="suggested_tasks"
     )
     assignee = relationship("User", foreign_keys=[assignee_id], backref="asigned_tasks")
 
+    __table_args__ = (
+        # keyset pagination of feed, see get_feed_tasks_by_cursor
+        Index("ix_tasks_created_at_id", "created_at", "id"),
+        # timelines of creators with fan-out on read, see get_timeline_tasks
+        Index("ix_tasks_creator_id_created_at_id", "creator_id", "created_at", "id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        Index(
+            "ix_tasks_deleted_at",
+            "deleted_at",
+            postgresql_where=text("deleted_at IS NOT NULL"),
+        ),
+    )
+
 
 class TaskComment(Base):
     __tablename__ = "tasks_comments"
@@ -51,13 +103,21 @@ class TaskComment(Base):
 
     content = Column(String(length=2000), nullable=False)
 
-    task_id = Column(String, ForeignKey("tasks.id"), nullable=False)
+    task_id = Column(String, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False)
     task = relationship("Task", foreign_keys=[task_id], backref="comments")
 
-    user_id = Column(String, ForeignKey("users.id"), nullable=False)
+    user_id = Column(String, ForeignKey("users.id"), index=True, nullable=False)
     user = relationship("User", foreign_keys=[user_id], backref="task_comments")
 
     edited = Column(Boolean, server_default="0", default=False, nullable=False)
     edited_at = Column(DateTime(timezone=True), nullable=True)
 
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# comments page of task, newest first, see get_comments_for_task_json
+Index(
+    "ix_tasks_comments_task_id_created_at",
+    TaskComment.task_id,
+    TaskComment.created_at.desc(),
+)
@@ -1,30 +1,50 @@
 import asyncio
-import json
 import logging
-from typing import Any
-from math import ceil
+from typing import Any, NamedTuple
 
 from asyncpg import NotNullViolationError, UniqueViolationError, ForeignKeyViolationError
+from databases import Database
 from databases.backends.postgres import Record
-from fastapi_pagination import Page
 from pydantic import ValidationError
-from sqlalchemy import insert, literal_column, select, update, delete
+from sqlalchemy import func, insert, literal_column, update, delete
 
-from app.db.base import database
-from app.db.models.hashtags.schemas import Hashtag
-from app.db.models.tasks.comment_handlers import get_total_count_of_comment_for_task
-from app.db.models.tasks.schemas import Task, TaskComment
+from app.config import settings
+from app.db.base import database, read_database
+from app.db.metrics import timed
+from app.db.hydration import hydrate
+from app.db.prepared import prepared_queries, select_columns
+from app.db.raw_page import build_raw_page
+from app.db.models.tasks.cache import (
+    TASKS_COUNT_KEY,
+    tasks_count_cache,
+    feed_pages_cache,
+)
+from app.db.models.tasks.cursor import (
+    FeedCursor,
+    SearchCursor,
+    build_cursor_page,
+    build_feed_cursor_page,
+)
+from app.db.models.tasks.schemas import Task, tasks_version_seq
+from app.db.models.tasks.version import bump_tasks_version
 from app.schemas import (
     CreateTask,
     GetTaskNoForeigns,
-    GetTask,
-    TaskFeed,
+    TasksCursorPage,
 )
+from app.types import HashtagsMatch
 
 
 logger = logging.getLogger()
 
+GET_TASK_BY_ID = prepared_queries.register(
+    "get_task_by_id",
+    f"SELECT {select_columns(Task.__table__)} FROM tasks "
+    "WHERE id = $1 AND deleted_at IS NULL LIMIT 1",
+)
+
 
+@timed
 async def create_task(
     create_task_params: CreateTask,
 ) -> tuple[GetTaskNoForeigns | None, str | None]:
@@ -53,24 +73,21 @@ async def create_task(
         return None, str(exc)
     else:
         await transaction.commit()
+        tasks_count_cache.clear()
+        feed_pages_cache.invalidate()
+        await bump_tasks_version()
         return task, None
 
 
+@timed
 async def get_task_by_id(task_id: str) -> GetTaskNoForeigns | None:
-    query = select(Task).where(Task.id == task_id).limit(1)
-
-    if not (_res := await database.fetch_one(query)):
+    if not (_res := await prepared_queries.fetch_one(GET_TASK_BY_ID, task_id)):
         return None
 
-    try:
-        parsed_task: GetTaskNoForeigns = GetTaskNoForeigns.parse_obj(_res)
-    except ValidationError as exc:
-        logger.error(f"Can't parse task with {task_id=}, {_res}: {exc}")
-        return None
-    else:
-        return parsed_task
+    return hydrate(GetTaskNoForeigns, dict(_res))
 
 
+@timed
 async def update_task(task_id: str, values: dict[str, Any]) -> str | None:
     """
     Returns optional error
@@ -78,7 +95,12 @@ async def update_task(task_id: str, values: dict[str, Any]) -> str | None:
     if not values:
         return None
 
-    query = update(Task).where(Task.id == task_id).values(values)
+    query = (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(values)
+        .values(version=tasks_version_seq.next_value())
+    )
     transaction = await database.transaction()
     try:
         await database.execute(query)
@@ -91,137 +113,355 @@ async def update_task(task_id: str, values: dict[str, Any]) -> str | None:
         return "No row with such foreign key id"
     else:
         await transaction.commit()
+        feed_pages_cache.invalidate()
+        await bump_tasks_version()
         return None
 
 
+@timed
 async def delete_task(task_id: str) -> str | None:
-    delete_hashtag_query = delete(Hashtag).where(Hashtag.task_id == task_id)
-    delete_comments_query = delete(TaskComment).where(TaskComment.task_id == task_id)
-    delete_task_query = delete(Task).where(Task.id == task_id)
-
-    transaction = await database.transaction()
+    """
+    Hashtags, comments, grades and timelines of task are deleted by cascading
+    foreign keys in the same statement. Use soft_delete_task for large tasks.
+    """
+    query = delete(Task).where(Task.id == task_id)
     try:
-        await database.execute(delete_hashtag_query)
-        await database.execute(delete_comments_query)
-        await database.execute(delete_task_query)
+        await database.execute(query)
     except Exception as exc:  # pylint: disable=broad-except
         err = f"Can't delete {task_id=}: {exc}"
         logger.error(err)
-        await transaction.rollback()
         return err
     else:
-        await transaction.commit()
+        tasks_count_cache.clear()
+        feed_pages_cache.invalidate()
+        await bump_tasks_version()
         return None
 
 
-async def get_total_counf_of_tasks() -> int:
-    # todo: cache this value
+@timed
+async def soft_delete_task(task_id: str) -> str | None:
+    """
+    Hide task at once, its rows are deleted later by purge_deleted_task.
+    Cascading delete of thousands of comments would hold locks for too long.
+    """
+    query = (
+        update(Task)
+        .where(Task.id == task_id, Task.deleted_at.is_(None))
+        .values(deleted_at=func.now(), version=tasks_version_seq.next_value())
+    )
+    try:
+        await database.execute(query)
+    except Exception as exc:  # pylint: disable=broad-except
+        err = f"Can't soft delete {task_id=}: {exc}"
+        logger.error(err)
+        return err
+    else:
+        tasks_count_cache.clear()
+        feed_pages_cache.invalidate()
+        await bump_tasks_version()
+        return None
+
 
-    query = "SELECT COUNT(*) FROM tasks"
+async def _estimate_count_of_tasks() -> int:
+    """
+    Planner statistics, updated by autovacuum/ANALYZE, without soft deleted tasks,
+    they are few and counted by partial index.
+    Returns -1 if table has never been analyzed.
+    """
+    query = """
+    SELECT CASE
+        WHEN reltuples < 0 THEN -1
+        ELSE greatest(
+            reltuples::bigint
+            - (SELECT count(*) FROM tasks WHERE deleted_at IS NOT NULL),
+            0
+        )
+    END
+    FROM pg_class WHERE oid = 'tasks'::regclass
+    """
     res: int = await database.fetch_val(query)
     return res
 
 
-async def get_joined_task(task_id: str) -> GetTask | None:
-    query = """
-    SELECT
-        tasks.id,
-        tasks.creator_id,
-        tasks.title,
-        tasks.description,
-        tasks.status,
-        tasks.due_to_date,
-        tasks.assigned_at,
-        tasks.created_at,
-        jsonb_build_object(
+@timed
+async def get_total_counf_of_tasks() -> int:
+    """
+    Cached count of tasks, invalidated by create_task and deletes of tasks.
+    For very large tables estimated count is used if it's configured.
+    """
+    if (cached := tasks_count_cache.get(TASKS_COUNT_KEY)) is not None:
+        return cached
+
+    generation = tasks_count_cache.generation
+    res: int
+    threshold = settings.tasks_count_estimate_threshold
+    if (
+        threshold is not None
+        and (estimated := await _estimate_count_of_tasks()) >= threshold
+    ):
+        res = estimated
+    else:
+        res = await database.fetch_val(
+            "SELECT COUNT(*) FROM tasks WHERE deleted_at IS NULL"
+        )
+
+    tasks_count_cache.put(TASKS_COUNT_KEY, res, generation=generation)
+    return res
+
+
+class TaskDetail(NamedTuple):
+    version: int
+    creator_id: str
+    # serialized GetTask as seen by viewer
+    content: bytes
+
+
+_TASK_DETAIL_QUERY = """
+SELECT
+    tasks.version,
+    tasks.creator_id,
+    json_build_object(
+        'id', tasks.id,
+        'creator_id', tasks.creator_id,
+        'title', tasks.title,
+        'description', tasks.description,
+        'status', tasks.status,
+        'created_at', tasks.created_at,
+        'n_comments', tasks.n_comments,
+        'creator', json_build_object(
             'id', creator.id,
             'username', creator.username,
             'avatar_url', creator.avatar_url
-        ) as creator,
-        CASE
-            WHEN tasks.assignee_id IS NULL THEN NULL
-            ELSE
-                jsonb_build_object(
-                    'id', assignee.id,
-                    'username', assignee.username,
-                    'avatar_url', assignee.avatar_url
-                )
-        END assignee,
-        CASE
-            WHEN tasks.suggested_by_id IS NULL THEN NULL
-            ELSE
-                jsonb_build_object(
-                    'id', suggested_by.id,
-                    'username', suggested_by.username,
-                    'avatar_url', suggested_by.avatar_url
-                )
-        END suggested_by
-    FROM tasks
-    LEFT JOIN users creator on tasks.creator_id = creator.id
-    LEFT JOIN users assignee on tasks.assignee_id = assignee.id
-    LEFT JOIN users suggested_by on tasks.suggested_by_id = suggested_by.id
-    WHERE tasks.id=:task_id;
-    """
-    fetched_data: Record | None
-    fetched_data, n_comments = await asyncio.gather(
-        *(
-            database.fetch_one(query, values={"task_id": task_id}),
-            get_total_count_of_comment_for_task(task_id),
-        )
-    )
-    data: GetTask | None = None
-    if fetched_data:
-        _data = dict(fetched_data._mapping.items(), n_comments=n_comments)
-        data = GetTask.parse_obj(_data)
-    return data
+        ),
+        'hashtags', coalesce(
+            (
+                SELECT json_agg(hashtags.hashtag ORDER BY hashtags.hashtag)
+                FROM hashtags
+                WHERE hashtags.task_id = tasks.id
+            ),
+            '[]'::json
+        ),
+        -- only creator sees who is responsible for the task and when it's due
+        'due_to_date', CASE WHEN tasks.creator_id = :viewer_id THEN tasks.due_to_date END,
+        'assigned_at', CASE WHEN tasks.creator_id = :viewer_id THEN tasks.assigned_at END,
+        'assignee_id', assignee.id,
+        'assignee', CASE
+            WHEN assignee.id IS NULL THEN NULL
+            ELSE json_build_object(
+                'id', assignee.id,
+                'username', assignee.username,
+                'avatar_url', assignee.avatar_url
+            )
+        END,
+        'suggested_by_id', suggested_by.id,
+        'suggested_by', CASE
+            WHEN suggested_by.id IS NULL THEN NULL
+            ELSE json_build_object(
+                'id', suggested_by.id,
+                'username', suggested_by.username,
+                'avatar_url', suggested_by.avatar_url
+            )
+        END
+    )::text AS task
+FROM tasks
+LEFT JOIN users creator ON tasks.creator_id = creator.id
+LEFT JOIN users assignee
+    ON tasks.assignee_id = assignee.id AND tasks.creator_id = :viewer_id
+LEFT JOIN users suggested_by
+    ON tasks.suggested_by_id = suggested_by.id AND tasks.creator_id = :viewer_id
+WHERE tasks.id = :task_id AND tasks.deleted_at IS NULL;
+"""
 
 
-async def get_feed_tasks(page: int, size: int) -> Page[TaskFeed]:
+@timed
+async def get_task_detail_json(
+    task_id: str, viewer_id: str, db: Database = read_database
+) -> TaskDetail | None:
+    """
+    Task with users, hashtags and count of comments in one statement,
+    JSON is built by DB and isn't parsed. None if task doesn't exist in db.
+    Replica might lag, read from primary if task must be there.
+    """
+    values = {"task_id": task_id, "viewer_id": viewer_id}
+    row: Record | None = await db.fetch_one(_TASK_DETAIL_QUERY, values)
+    if row is None:
+        return None
+    return TaskDetail(row["version"], row["creator_id"], row["task"].encode())
+
+
+@timed
+async def get_feed_tasks_json(page: int, size: int) -> bytes:
+    """
+    Serialized Page[TaskFeed], JSON of tasks is built by DB and isn't parsed.
+    """
     query = """
-    WITH tasks_with_comment_count AS (
-        SELECT
-            tasks.id,
-            count(tc.*) as comments_count
+    WITH page_tasks AS (
+        SELECT tasks.id
         FROM tasks
-        LEFT JOIN tasks_comments tc on tasks.id = tc.task_id
-        GROUP BY 1
+        WHERE tasks.deleted_at IS NULL
+        ORDER BY tasks.created_at DESC, tasks.id DESC
         LIMIT :limit
         OFFSET :offset
     ),
     table_with_json_rows AS (
         SELECT
+            tasks.id,
+            tasks.created_at,
             json_build_object(
                 'id', tasks.id,
                 'title', tasks.title,
                 'description', tasks.description,
                 'created_at', tasks.created_at,
                 'status', tasks.status,
-                'n_comments', tcc.comments_count,
+                'n_comments', tasks.n_comments,
                 'creator', json_build_object(
                      'id', creator.id,
                      'username', creator.username,
                      'avatar_url', creator.avatar_url
                 )
             ) AS _tasks
-        FROM tasks_with_comment_count tcc
-        LEFT JOIN tasks ON tcc.id = tasks.id
+        FROM page_tasks
+        LEFT JOIN tasks ON page_tasks.id = tasks.id
         LEFT JOIN users creator ON tasks.creator_id = creator.id
-        ORDER BY tasks.created_at DESC
     )
-    SELECT json_agg(_tasks) tasks from table_with_json_rows;
+    SELECT
+        json_agg(_tasks ORDER BY created_at DESC, id DESC) tasks
+    FROM table_with_json_rows;
     """
     values = {"limit": size, "offset": (page - 1) * size}
-    fetched_tasks, total = await asyncio.gather(
+    tasks_json, total = await asyncio.gather(
         *(
-            database.fetch_one(query, values),
+            database.fetch_val(query, values),
             get_total_counf_of_tasks(),
         )
     )
-    if not fetched_tasks or not fetched_tasks["tasks"]:
-        tasks = []
+    return build_raw_page(tasks_json, total=total, page=page, size=size)
+
+
+_FEED_CURSOR_QUERY = """
+SELECT
+    tasks.id,
+    tasks.created_at,
+    json_build_object(
+        'id', tasks.id,
+        'title', tasks.title,
+        'description', tasks.description,
+        'created_at', tasks.created_at,
+        'status', tasks.status,
+        'n_comments', tasks.n_comments,
+        'creator', json_build_object(
+             'id', creator.id,
+             'username', creator.username,
+             'avatar_url', creator.avatar_url
+        )
+    ) AS task
+FROM tasks
+LEFT JOIN users creator ON tasks.creator_id = creator.id
+{where}
+ORDER BY tasks.created_at DESC, tasks.id DESC
+LIMIT :limit;
+"""
+_FEED_AFTER_CURSOR = "(tasks.created_at, tasks.id) < (:created_at, :task_id)"
+_FEED_WITH_ANY_HASHTAG = """
+tasks.id IN (
+    SELECT hashtags.task_id FROM hashtags WHERE hashtags.hashtag = ANY(:hashtags)
+)
+"""
+_FEED_WITH_ALL_HASHTAGS = """
+tasks.id IN (
+    SELECT hashtags.task_id
+    FROM hashtags
+    WHERE hashtags.hashtag = ANY(:hashtags)
+    GROUP BY hashtags.task_id
+    HAVING count(DISTINCT hashtags.hashtag) = :n_hashtags
+)
+"""
+
+
+@timed
+async def get_feed_tasks_by_cursor(
+    cursor: FeedCursor | None,
+    size: int,
+    hashtags: list[str] | None = None,
+    match: HashtagsMatch = HashtagsMatch.ANY,
+) -> TasksCursorPage:
+    """
+    Keyset pagination over (created_at, id).
+    Cost of every page is the same and newly created tasks don't shift pages.
+
+    hashtags: return only tasks with any/all of these hashtags, depending on match
+    """
+    # one extra row tells if there is a next page
+    values: dict[str, Any] = {"limit": size + 1}
+    conditions = ["tasks.deleted_at IS NULL"]
+    if cursor is not None:
+        conditions.append(_FEED_AFTER_CURSOR)
+        values |= {"created_at": cursor.created_at, "task_id": cursor.id}
+
+    if hashtags:
+        values["hashtags"] = hashtags
+        if match == HashtagsMatch.ALL:
+            conditions.append(_FEED_WITH_ALL_HASHTAGS)
+            values["n_hashtags"] = len(set(hashtags))
+        else:
+            conditions.append(_FEED_WITH_ANY_HASHTAG)
+
+    query = _FEED_CURSOR_QUERY.format(where=f"WHERE {' AND '.join(conditions)}")
+
+    rows: list[Record] = await read_database.fetch_all(query, values)
+    return build_feed_cursor_page(rows, size)
+
+
+_SEARCH_QUERY = """
+WITH matched_tasks AS (
+    SELECT
+        tasks.id,
+        ts_rank(tasks.search_vector, search_query) AS rank
+    FROM tasks, websearch_to_tsquery('simple', :search_text) search_query
+    WHERE tasks.search_vector @@ search_query AND tasks.deleted_at IS NULL
+)
+SELECT
+    matched_tasks.id,
+    matched_tasks.rank,
+    json_build_object(
+        'id', tasks.id,
+        'title', tasks.title,
+        'description', tasks.description,
+        'created_at', tasks.created_at,
+        'status', tasks.status,
+        'n_comments', tasks.n_comments,
+        'creator', json_build_object(
+             'id', creator.id,
+             'username', creator.username,
+             'avatar_url', creator.avatar_url
+        )
+    ) AS task
+FROM matched_tasks
+JOIN tasks ON matched_tasks.id = tasks.id
+LEFT JOIN users creator ON tasks.creator_id = creator.id
+{where}
+ORDER BY matched_tasks.rank DESC, matched_tasks.id DESC
+LIMIT :limit;
+"""
+_SEARCH_AFTER_CURSOR = "WHERE (matched_tasks.rank, matched_tasks.id) < (:rank, :task_id)"
+
+
+@timed
+async def search_tasks(
+    search_text: str, cursor: SearchCursor | None, size: int
+) -> TasksCursorPage:
+    """
+    Full-text search over title and description, most relevant tasks first.
+    search_text supports web search syntax: "quoted phrase", or, -excluded.
+    """
+    values: dict[str, Any] = {"search_text": search_text, "limit": size + 1}
+    if cursor is None:
+        query = _SEARCH_QUERY.format(where="")
     else:
-        _dict_tasks = json.loads(fetched_tasks["tasks"])
-        tasks = [TaskFeed.parse_obj(task) for task in _dict_tasks]
+        query = _SEARCH_QUERY.format(where=_SEARCH_AFTER_CURSOR)
+        values |= {"rank": cursor.rank, "task_id": cursor.id}
 
-    total_pages = ceil(total / size)
-    return Page(total=total, page=page, size=size, items=tasks, pages=total_pages)
+    rows: list[Record] = await read_database.fetch_all(query, values)
+    return build_cursor_page(
+        rows, size, lambda row: SearchCursor(row["rank"], row["id"]).encode()
+    )
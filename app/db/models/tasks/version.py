@@ -0,0 +1,42 @@
+"""
+Cheap version stamps of tasks, used as ETags for conditional GET.
+
+Every write of a task sets its version to next value of tasks_version_seq.
+Sequences are not transactional, so stamp of the whole table is bumped once more
+after commit: a reader who saw the new stamp is guaranteed to see the new data.
+"""
+from databases.backends.postgres import Record
+
+from app.db.base import database
+from app.db.metrics import timed
+
+
+@timed
+async def bump_tasks_version() -> None:
+    """
+    Call after commit of any write which changes feed.
+    """
+    await database.execute("SELECT nextval('tasks_version_seq')")
+
+
+@timed
+async def get_tasks_version() -> int:
+    """
+    Stamp of the whole tasks table, changes after every committed write.
+    """
+    res: int = await database.fetch_val("SELECT last_value FROM tasks_version_seq")
+    return res
+
+
+@timed
+async def get_task_version(task_id: str) -> tuple[int, str] | None:
+    """
+    Returns (version, creator_id) of task or None if task doesn't exist.
+    """
+    query = """
+    SELECT version, creator_id FROM tasks WHERE id = :task_id AND deleted_at IS NULL
+    """
+    row: Record | None = await database.fetch_one(query, {"task_id": task_id})
+    if row is None:
+        return None
+    return row["version"], row["creator_id"]
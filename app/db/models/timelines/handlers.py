@@ -0,0 +1,175 @@
+import logging
+from datetime import datetime
+from typing import Any
+
+from databases.backends.postgres import Record
+
+from app.config import settings
+from app.db.base import database
+from app.db.metrics import timed
+from app.db.models.tasks.cursor import FeedCursor, build_feed_cursor_page
+from app.schemas import TasksCursorPage
+
+
+logger = logging.getLogger()
+
+
+async def _get_number_of_subscribers(creator_id: str) -> int | None:
+    """
+    None if creator is switched to fan-out on read already, subscribers aren't counted.
+    """
+    query = """
+    SELECT CASE WHEN users.timeline_fanout_on_read THEN NULL ELSE (
+        SELECT count(DISTINCT grades.user_id)
+        FROM grades
+        WHERE grades.creator_id=:creator_id
+            AND grades.grade_variant IN ('SUBSCRIBED', 'PAYED_SUBSCRIBED')
+    ) END
+    FROM users
+    WHERE users.id=:creator_id
+    """
+    res: int | None = await database.fetch_val(query, {"creator_id": creator_id})
+    return res
+
+
+async def _switch_to_fan_out_on_read(creator_id: str) -> None:
+    query = """
+    UPDATE users SET timeline_fanout_on_read = true
+    WHERE id=:creator_id AND NOT timeline_fanout_on_read
+    """
+    await database.execute(query, {"creator_id": creator_id})
+
+
+@timed
+async def fan_out_task(task_id: str, creator_id: str, created_at: datetime) -> None:
+    """
+    Insert new task into timelines of all creator's subscribers, free or paid.
+    Subscribers are inserted by batches, each batch is a single statement.
+
+    Creators with too many subscribers are switched to fan-out on read:
+    their tasks are merged into timelines while reading, see get_timeline_tasks.
+    """
+    n_subscribers = await _get_number_of_subscribers(creator_id)
+    if not n_subscribers:
+        return
+
+    if n_subscribers > settings.timeline_fanout_max_subscribers:
+        await _switch_to_fan_out_on_read(creator_id)
+        return
+
+    subscribers_query = """
+    SELECT DISTINCT user_id
+    FROM grades
+    WHERE creator_id=:creator_id
+        AND grade_variant IN ('SUBSCRIBED', 'PAYED_SUBSCRIBED')
+        AND user_id > :after_user_id
+    ORDER BY user_id
+    LIMIT :limit
+    """
+    insert_query = """
+    INSERT INTO timelines (user_id, task_id, creator_id, created_at)
+    SELECT user_id, :task_id, :creator_id, :created_at
+    FROM unnest(CAST(:user_ids AS varchar[])) AS user_id
+    ON CONFLICT DO NOTHING
+    """
+    batch_size = settings.timeline_fanout_batch_size
+    after_user_id = ""
+    while True:
+        rows: list[Record] = await database.fetch_all(
+            subscribers_query,
+            {
+                "creator_id": creator_id,
+                "after_user_id": after_user_id,
+                "limit": batch_size,
+            },
+        )
+        if not rows:
+            break
+
+        user_ids = [row["user_id"] for row in rows]
+        values = {
+            "user_ids": user_ids,
+            "task_id": task_id,
+            "creator_id": creator_id,
+            "created_at": created_at,
+        }
+        await database.execute(insert_query, values)
+
+        if len(user_ids) < batch_size:
+            break
+        after_user_id = user_ids[-1]
+
+
+_TIMELINE_QUERY = """
+WITH timeline AS (
+    (
+        SELECT timelines.task_id, timelines.created_at
+        FROM timelines
+        JOIN tasks ON timelines.task_id = tasks.id AND tasks.deleted_at IS NULL
+        WHERE timelines.user_id=:user_id {after_timeline}
+        ORDER BY timelines.created_at DESC, timelines.task_id DESC
+        LIMIT :limit
+    )
+    UNION
+    (
+        -- creators with fan-out on read
+        SELECT tasks.id, tasks.created_at
+        FROM tasks
+        WHERE tasks.creator_id IN (
+            SELECT grades.creator_id
+            FROM grades
+            JOIN users creator ON grades.creator_id = creator.id
+            WHERE grades.user_id=:user_id
+                AND grades.grade_variant IN ('SUBSCRIBED', 'PAYED_SUBSCRIBED')
+                AND creator.timeline_fanout_on_read
+        ) AND tasks.deleted_at IS NULL {after_tasks}
+        ORDER BY tasks.created_at DESC, tasks.id DESC
+        LIMIT :limit
+    )
+)
+SELECT
+    tasks.id,
+    tasks.created_at,
+    json_build_object(
+        'id', tasks.id,
+        'title', tasks.title,
+        'description', tasks.description,
+        'created_at', tasks.created_at,
+        'status', tasks.status,
+        'n_comments', tasks.n_comments,
+        'creator', json_build_object(
+             'id', creator.id,
+             'username', creator.username,
+             'avatar_url', creator.avatar_url
+        )
+    ) AS task
+FROM timeline
+JOIN tasks ON timeline.task_id = tasks.id
+LEFT JOIN users creator ON tasks.creator_id = creator.id
+ORDER BY tasks.created_at DESC, tasks.id DESC
+LIMIT :limit;
+"""
+
+
+@timed
+async def get_timeline_tasks(
+    user_id: str, cursor: FeedCursor | None, size: int
+) -> TasksCursorPage:
+    """
+    Personal feed of user: tasks of creators user is subscribed to.
+    """
+    # one extra row tells if there is a next page
+    values: dict[str, Any] = {"user_id": user_id, "limit": size + 1}
+    if cursor is None:
+        query = _TIMELINE_QUERY.format(after_timeline="", after_tasks="")
+    else:
+        query = _TIMELINE_QUERY.format(
+            after_timeline=(
+                "AND (timelines.created_at, timelines.task_id) < (:created_at, :task_id)"
+            ),
+            after_tasks="AND (tasks.created_at, tasks.id) < (:created_at, :task_id)",
+        )
+        values |= {"created_at": cursor.created_at, "task_id": cursor.id}
+
+    rows: list[Record] = await database.fetch_all(query, values)
+    return build_feed_cursor_page(rows, size)
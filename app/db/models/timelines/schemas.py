@@ -0,0 +1,25 @@
+from sqlalchemy import Column, String, DateTime, ForeignKey, Index
+
+from app.db.base import Base
+
+
+class TimelineEntry(Base):
+    """
+    Task of subscribed creator in user's personal feed.
+    Rows are written on task creation (fan-out on write), see fan_out_task.
+    """
+
+    __tablename__ = "timelines"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    task_id = Column(
+        String, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True, index=True
+    )
+    creator_id = Column(String, ForeignKey("users.id"), nullable=False)
+
+    # copy of tasks.created_at, timeline is ordered by it
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_timelines_user_id_created_at", "user_id", "created_at", "task_id"),
+    )
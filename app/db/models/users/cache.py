@@ -0,0 +1,8 @@
+from app.cache import TTLCache
+from app.config import settings
+from app.schemas import GetUser
+
+# email -> user, see get_user_by_email_cached
+users_by_email_cache: TTLCache[str, GetUser] = TTLCache(
+    maxsize=settings.users_cache_max_size, ttl=settings.users_cache_ttl_seconds
+)
@@ -0,0 +1,172 @@
+import asyncio
+import contextlib
+import logging
+import time
+from datetime import datetime, timedelta
+from typing import Any
+
+from app.bloom import BloomFilter
+from app.config import settings
+from app.db.base import database
+
+logger = logging.getLogger(__name__)
+
+# users are synced by updated_at, which is time of transaction start,
+# overlap covers transactions committed after previous sync
+_SYNC_OVERLAP = timedelta(seconds=30)
+_MIN_CAPACITY = 10_000
+
+
+class UsersExistenceFilter:
+    """
+    Bloom filter of emails and usernames of registered users.
+    "No" is definite, so such checks don't go to DB, "maybe" is checked in DB.
+
+    Filter is per worker: users created or updated by this worker are added at once,
+    users created or updated by other workers are added by sync() every few seconds.
+    rebuild() drops old emails and usernames of updated users and resizes filter.
+    Between syncs new values of other workers are missed,
+    unique constraints in DB still reject duplicates in that case.
+    Until the first rebuild() every check goes to DB.
+    """
+
+    def __init__(self, error_rate: float) -> None:
+        self.error_rate = error_rate
+
+        self._filter: BloomFilter | None = None
+        self._synced_at: datetime | None = None
+        # keys added while rebuild() is reading users
+        self._added_while_building: list[str] | None = None
+
+        self.negatives = 0
+        self.positives = 0
+        self.false_positives = 0
+        self.not_ready = 0
+        self.rebuilds = 0
+
+    @property
+    def ready(self) -> bool:
+        return self._filter is not None
+
+    def _add_key(self, key: str) -> None:
+        if self._filter is not None:
+            self._filter.add(key)
+        if self._added_while_building is not None:
+            self._added_while_building.append(key)
+
+    def add(self, email: str | None = None, username: str | None = None) -> None:
+        if email is not None:
+            self._add_key(f"email:{email}")
+        if username is not None:
+            self._add_key(f"username:{username}")
+
+    def _might_contain(self, key: str) -> bool:
+        if self._filter is None:
+            self.not_ready += 1
+            return True
+
+        if key in self._filter:
+            self.positives += 1
+            return True
+        self.negatives += 1
+        return False
+
+    def might_contain_email(self, email: str) -> bool:
+        return self._might_contain(f"email:{email}")
+
+    def might_contain_username(self, username: str) -> bool:
+        return self._might_contain(f"username:{username}")
+
+    def record_false_positive(self) -> None:
+        self.false_positives += 1
+
+    async def rebuild(self) -> None:
+        """
+        Build new filter from all users, rows are streamed, not fetched at once.
+        """
+        started_at: datetime = await database.fetch_val("SELECT now()")
+        n_users: int = await database.fetch_val("SELECT count(*) FROM users")
+        new_filter = BloomFilter(
+            capacity=max(2 * n_users, _MIN_CAPACITY), error_rate=self.error_rate
+        )
+
+        self._added_while_building = []
+        try:
+            async for row in database.iterate("SELECT email, username FROM users"):
+                new_filter.add(f"email:{row['email']}")
+                if row["username"] is not None:
+                    new_filter.add(f"username:{row['username']}")
+            for key in self._added_while_building:
+                new_filter.add(key)
+        finally:
+            self._added_while_building = None
+
+        self._filter = new_filter
+        self._synced_at = started_at
+        self.rebuilds += 1
+        logger.info(f"Users existence filter is built, {new_filter.stats()}")
+
+    def clear(self) -> None:
+        """
+        Forget all users, every check goes to DB till the next rebuild().
+        """
+        self._filter = None
+        self._synced_at = None
+
+    async def sync(self) -> None:
+        """
+        Add users created or updated since previous sync, e.g. by other workers.
+        """
+        if self._filter is None or self._synced_at is None:
+            return
+
+        started_at: datetime = await database.fetch_val("SELECT now()")
+        query = "SELECT email, username FROM users WHERE updated_at >= :since"
+        rows = await database.fetch_all(query, {"since": self._synced_at - _SYNC_OVERLAP})
+        for row in rows:
+            self.add(email=row["email"], username=row["username"])
+        self._synced_at = started_at
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "ready": self.ready,
+            "negatives": self.negatives,
+            "positives": self.positives,
+            "false_positives": self.false_positives,
+            "not_ready": self.not_ready,
+            "rebuilds": self.rebuilds,
+            "filter": self._filter.stats() if self._filter is not None else None,
+        }
+
+
+users_exists_filter = UsersExistenceFilter(error_rate=settings.users_filter_error_rate)
+
+_refresh_task: asyncio.Task[None] | None = None
+
+
+async def _keep_filter_up_to_date() -> None:
+    rebuilt_at = time.monotonic()
+    while True:
+        await asyncio.sleep(settings.users_filter_sync_seconds)
+        try:
+            if time.monotonic() - rebuilt_at >= settings.users_filter_rebuild_seconds:
+                await users_exists_filter.rebuild()
+                rebuilt_at = time.monotonic()
+            else:
+                await users_exists_filter.sync()
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error(f"Can't refresh users existence filter: {exc}")
+
+
+async def start_users_exists_filter() -> None:
+    global _refresh_task  # pylint: disable=global-statement
+
+    await users_exists_filter.rebuild()
+    _refresh_task = asyncio.create_task(_keep_filter_up_to_date())
+
+
+async def stop_users_exists_filter() -> None:
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await _refresh_task
@@ -7,58 +7,73 @@ from pydantic import ValidationError
 from sqlalchemy import select, insert, literal_column, update
 
 from app.db.base import database
+from app.db.metrics import timed
+from app.db.hydration import hydrate
+from app.db.prepared import prepared_queries, select_columns
+from app.db.models.users.cache import users_by_email_cache
+from app.db.models.users.exists_filter import users_exists_filter
 from app.db.models.users.schemas import User
 from app.schemas import GetUser, CreateUser
 
 logger = logging.getLogger()
 
-
+_USERS_COLUMNS = select_columns(User.__table__)
+GET_USER_BY_ID = prepared_queries.register(
+    "get_user_by_id", f"SELECT {_USERS_COLUMNS} FROM users WHERE id = $1 LIMIT 1"
+)
+GET_USER_BY_EMAIL = prepared_queries.register(
+    "get_user_by_email", f"SELECT {_USERS_COLUMNS} FROM users WHERE email = $1 LIMIT 1"
+)
+USERNAME_EXISTS = prepared_queries.register(
+    "username_exists", "SELECT 1 FROM users WHERE username = $1 LIMIT 1"
+)
+EMAIL_EXISTS = prepared_queries.register(
+    "email_exists", "SELECT 1 FROM users WHERE email = $1 LIMIT 1"
+)
+
+
+@timed
 async def get_user(user_id: str) -> GetUser | None:
-    query = select(User).where(User.id == user_id).limit(1)
-
-    if not (_res := await database.fetch_one(query)):
+    if not (_res := await prepared_queries.fetch_one(GET_USER_BY_ID, user_id)):
         logger.info(f"Can't get user with {user_id=} from db.")
         return None
 
-    try:
-        parsed_user: GetUser = GetUser.parse_obj(_res)
-    except ValidationError as exc:
-        logger.error(f"Can't parse user by {user_id=}, {_res}: {exc}")
-        return None
-    else:
-        return parsed_user
+    return hydrate(GetUser, dict(_res))
 
 
+@timed
 async def get_user_by_email(email: str) -> GetUser | None:
-    query = select(User).where(User.email == email).limit(1)
-
-    if not (_res := await database.fetch_one(query)):
+    if not (_res := await prepared_queries.fetch_one(GET_USER_BY_EMAIL, email)):
         return None
 
-    try:
-        parsed_user: GetUser = GetUser.parse_obj(_res)
-    except ValidationError as exc:
-        logger.error(f"Can't parse user by {email=}, {_res}: {exc}")
-        return None
-    else:
-        return parsed_user
+    return hydrate(GetUser, dict(_res))
+
+
+async def get_user_by_email_cached(email: str) -> GetUser | None:
+    """
+    Same as get_user_by_email, but user is cached for a short time.
+    Don't modify returned user, it's shared between requests.
+    """
+    if (user := users_by_email_cache.get(email)) is not None:
+        return user
 
+    generation = users_by_email_cache.generation
+    if (user := await get_user_by_email(email)) is not None:
+        users_by_email_cache.put(email, user, generation=generation)
+    return user
 
+
+@timed
 async def get_user_by_username(username: str) -> GetUser | None:
     query = select(User).where(User.username == username).limit(1)
 
     if not (_res := await database.fetch_one(query)):
         return None
 
-    try:
-        parsed_user: GetUser = GetUser.parse_obj(_res)
-    except ValidationError as exc:
-        logger.error(f"Can't parse user by {username=}, {_res}: {exc}")
-        return None
-    else:
-        return parsed_user
+    return hydrate(GetUser, _res._mapping)
 
 
+@timed
 async def create_user(
     create_user_params: CreateUser,
 ) -> tuple[GetUser | None, str | None]:
@@ -87,15 +102,33 @@ async def create_user(
         return None, str(exc)
     else:
         await transaction.commit()
+        users_exists_filter.add(email=user.email, username=user.username)
         return user, None
 
 
+@timed
 async def user_exists_in_db(username: str) -> bool:
-    query = select([User.id]).where(User.username == username).limit(1)
-    res: Record = await database.fetch_one(query)
-    return bool(res)
+    if not users_exists_filter.might_contain_username(username):
+        return False
+
+    exists = await prepared_queries.fetch_val(USERNAME_EXISTS, username) is not None
+    if not exists:
+        users_exists_filter.record_false_positive()
+    return exists
+
+
+@timed
+async def user_with_email_exists(email: str) -> bool:
+    if not users_exists_filter.might_contain_email(email):
+        return False
+
+    exists = await prepared_queries.fetch_val(EMAIL_EXISTS, email) is not None
+    if not exists:
+        users_exists_filter.record_false_positive()
+    return exists
 
 
+@timed
 async def update_user(user_id: str, values: dict[str, Any]) -> str | None:
     """
     Returns optional error
@@ -103,13 +136,40 @@ async def update_user(user_id: str, values: dict[str, Any]) -> str | None:
     if not values:
         return None
 
+    # email might be changed, so user is cached by the old one
+    email_query = select(User.email).where(User.id == user_id)
     query = update(User).where(User.id == user_id).values(values)
     transaction = await database.transaction()
     try:
+        old_email: str | None = await database.fetch_val(email_query)
         await database.execute(query)
     except (NotNullViolationError, UniqueViolationError) as exc:
         await transaction.rollback()
         return str(exc)
     else:
         await transaction.commit()
+        if old_email is not None:
+            users_by_email_cache.pop(old_email)
+        users_exists_filter.add(
+            email=values.get("email"), username=values.get("username")
+        )
         return None
+
+
+@timed
+async def replace_password(user_id: str, old_password: str, new_password: str) -> bool:
+    """
+    Store new password hash only if password wasn't changed since old_password
+    was read, e.g. by reset of password. Returns True if it's stored.
+    """
+    query = (
+        update(User)
+        .where(User.id == user_id, User.password == old_password)
+        .values(password=new_password)
+        .returning(User.email)
+    )
+    if (email := await database.fetch_val(query)) is None:
+        return False
+
+    users_by_email_cache.pop(email)
+    return True
@@ -23,4 +23,18 @@ class User(Base):
 
     receive_email_alerts = Column(Boolean, default=True)
 
+    # creator with lots of subscribers, tasks aren't fanned out to timelines
+    timeline_fanout_on_read = Column(
+        Boolean, server_default="false", default=False, nullable=False
+    )
+
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # new and updated users are synced into existence filter by it,
+    # see UsersExistenceFilter
+    updated_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        index=True,
+    )
@@ -0,0 +1,118 @@
+"""
+Hot single-row queries as asyncpg prepared statements.
+
+Usual path builds SQLAlchemy statement, compiles it and wraps result rows on every call.
+Queries registered here are plain SQL, written once at import, prepared once
+per pooled connection and executed with positional arguments ($1, $2, ...).
+
+Statement which became invalid after migration is prepared again and retried,
+except in transaction: it's aborted already, so the error is raised.
+
+Query lock of databases connection and connection behind asyncpg pool proxy
+are private attributes of the pinned versions, check them when upgrading.
+"""
+import asyncio
+import weakref
+from collections import Counter
+from typing import Any
+
+from asyncpg import Record
+from asyncpg.exceptions import InvalidCachedStatementError
+from asyncpg.prepared_stmt import PreparedStatement
+from databases.core import Connection
+from sqlalchemy import Table
+
+from app.db.base import database
+
+
+def select_columns(table: Table) -> str:
+    """
+    Columns of table for SELECT, generated columns are skipped.
+    """
+    return ", ".join(column.name for column in table.columns if column.computed is None)
+
+
+def _query_lock(connection: Connection) -> asyncio.Lock:
+    # raw connection isn't safe for concurrent use, databases takes the same lock
+    lock: asyncio.Lock = connection._query_lock  # pylint: disable=protected-access
+    return lock
+
+
+def _pooled_connection(raw_connection: Any) -> Any:
+    # pool hands out new proxy on every acquire, statements belong to connection
+    return getattr(raw_connection, "_con", raw_connection)
+
+
+class PreparedQueries:
+    def __init__(self) -> None:
+        self._queries: dict[str, str] = {}
+        # connection -> {query name -> statement}, entries go away with connections
+        self._statements: weakref.WeakKeyDictionary[
+            Any, dict[str, PreparedStatement]
+        ] = weakref.WeakKeyDictionary()
+
+        self.calls: Counter[str] = Counter()
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+
+    def register(self, name: str, sql: str) -> str:
+        if name in self._queries:
+            raise ValueError(f"Query {name} is already registered")
+        self._queries[name] = sql
+        return name
+
+    def sql(self, name: str) -> str:
+        return self._queries[name]
+
+    def _connection_statements(self, raw_connection: Any) -> dict[str, PreparedStatement]:
+        return self._statements.setdefault(_pooled_connection(raw_connection), {})
+
+    async def _get_statement(self, raw_connection: Any, name: str) -> PreparedStatement:
+        statements = self._connection_statements(raw_connection)
+        if (statement := statements.get(name)) is not None:
+            self.hits[name] += 1
+            return statement
+
+        self.misses[name] += 1
+        statement = await raw_connection.prepare(self._queries[name])
+        statements[name] = statement
+        return statement
+
+    async def _fetch_row(self, name: str, args: tuple[Any, ...]) -> Record | None:
+        self.calls[name] += 1
+        connection = database.connection()
+        async with connection:
+            async with _query_lock(connection):
+                raw_connection = connection.raw_connection
+                statement = await self._get_statement(raw_connection, name)
+                try:
+                    row: Record | None = await statement.fetchrow(*args)
+                except InvalidCachedStatementError:
+                    # schema was changed by migration, statement is prepared again,
+                    # but failed statement has aborted transaction, caller retries it
+                    self._connection_statements(raw_connection).pop(name, None)
+                    if raw_connection.is_in_transaction():
+                        raise
+                    statement = await self._get_statement(raw_connection, name)
+                    row = await statement.fetchrow(*args)
+                return row
+
+    async def fetch_one(self, name: str, *args: Any) -> Record | None:
+        return await self._fetch_row(name, args)
+
+    async def fetch_val(self, name: str, *args: Any) -> Any:
+        row = await self._fetch_row(name, args)
+        return row[0] if row is not None else None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            name: {
+                "calls": self.calls[name],
+                "hits": self.hits[name],
+                "misses": self.misses[name],
+            }
+            for name in self._queries
+        }
+
+
+prepared_queries = PreparedQueries()
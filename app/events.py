@@ -1,16 +1,33 @@
 from collections.abc import Callable
 
+from app.api.auth.password_utils import password_hashing_pool
+from app.api.auth.utils import wait_for_password_rehashes
 from app.db.events import close_db_connection, connect_to_db
+from app.db.models.tasks.purge import start_tasks_purge, stop_tasks_purge
+from app.db.models.users.exists_filter import (
+    start_users_exists_filter,
+    stop_users_exists_filter,
+)
 from app.http_cli.events import close_http_cli
+from app.jobs.queue import start_jobs_worker, stop_jobs_worker
 
 
 async def start_app_handler() -> None:
     await connect_to_db()
+    await start_users_exists_filter()
+    await start_tasks_purge()
+    await start_jobs_worker()
 
 
 async def stop_app_handler() -> None:
+    # running jobs finish while DB and HTTP client are still available
+    await stop_jobs_worker()
+    await stop_tasks_purge()
+    await stop_users_exists_filter()
+    await wait_for_password_rehashes()
     await close_db_connection()
     await close_http_cli()
+    password_hashing_pool.shutdown()
 
 
 def create_start_app_handler() -> Callable:  # type: ignore
@@ -0,0 +1,239 @@
+"""
+Durable background jobs for side effects of requests: emails, hashtags, timelines.
+
+Jobs are rows of jobs table, so they survive restarts and are retried with
+exponential backoff. Workers of all processes claim ready jobs with
+SELECT ... FOR UPDATE SKIP LOCKED, at most `concurrency` jobs run in each process.
+Job enqueued by this process is picked up at once, others are found by polling.
+
+In test environment jobs run eagerly: enqueue awaits handler, so tests see effects
+without running workers. JobError is only logged there, as there are no retries,
+other exceptions are raised to the caller.
+"""
+import asyncio
+import contextlib
+import json
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from pydantic import validate_arguments
+from pydantic.json import pydantic_encoder
+
+from app.config import settings
+from app.db.models.jobs.handlers import (
+    ClaimedJob,
+    claim_jobs,
+    complete_job,
+    enqueue_job,
+    fail_job,
+    release_jobs,
+    retry_job,
+)
+from app.metrics import Histogram
+
+logger = logging.getLogger()
+
+JobHandler = Callable[..., Awaitable[Any]]
+
+
+class JobError(Exception):
+    """
+    Raise in handler when job failed and should be retried.
+    """
+
+
+class JobsQueue:
+    def __init__(
+        self,
+        concurrency: int,
+        poll_seconds: float,
+        lease_seconds: float,
+        max_attempts: int,
+        retry_base_seconds: float,
+        retry_max_seconds: float,
+        eager: bool = False,
+    ) -> None:
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self.eager = eager
+
+        self._handlers: dict[str, JobHandler] = {}
+        self._worker: asyncio.Task[None] | None = None
+        self._running: dict[asyncio.Task[None], str] = {}
+        self._wakeup = asyncio.Event()
+
+        self.enqueued = 0
+        self.succeeded = 0
+        self.retried = 0
+        self.failed = 0
+        self.durations: dict[str, Histogram] = {}
+
+    def register(self, kind: str, handler: JobHandler) -> str:
+        """
+        Payload of job is passed to handler as keyword arguments, they are
+        converted to annotated types, e.g. datetimes from strings.
+        Returns kind to enqueue jobs with.
+        """
+        if kind in self._handlers:
+            raise ValueError(f"Job {kind!r} is already registered")
+
+        self._handlers[kind] = validate_arguments(handler)
+        self.durations[kind] = Histogram()
+        return kind
+
+    async def enqueue(self, kind: str, **payload: Any) -> None:
+        if kind not in self._handlers:
+            raise ValueError(f"Unknown job {kind!r}")
+
+        self.enqueued += 1
+        if self.eager:
+            # same encoding as for stored jobs, so tests catch unserializable payloads
+            payload = json.loads(json.dumps(payload, default=pydantic_encoder))
+            try:
+                await self._handlers[kind](**payload)
+            except JobError as exc:
+                self.failed += 1
+                logger.error(f"Job {kind} failed: {exc!r}")
+            except Exception:
+                self.failed += 1
+                raise
+            else:
+                self.succeeded += 1
+            return
+
+        await enqueue_job(kind, payload)
+        self._wakeup.set()
+
+    def _retry_delay(self, attempts: int) -> float:
+        delay: float = self.retry_base_seconds * 2 ** (attempts - 1)
+        return min(delay, self.retry_max_seconds)
+
+    async def _run(self, job: ClaimedJob) -> None:
+        started = time.perf_counter()
+        try:
+            await self._handlers[job.kind](**job.payload)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:  # pylint: disable=broad-except
+            err = repr(exc)
+            if job.attempts >= self.max_attempts:
+                self.failed += 1
+                logger.error(f"Job {job.kind} {job.id} failed, no attempts left: {err}")
+                await fail_job(job.id, err)
+            else:
+                self.retried += 1
+                logger.warning(f"Job {job.kind} {job.id} failed, will retry: {err}")
+                await retry_job(job.id, self._retry_delay(job.attempts), err)
+        else:
+            self.succeeded += 1
+            await complete_job(job.id)
+        finally:
+            self.durations[job.kind].observe(time.perf_counter() - started)
+
+    def _on_done(self, task: asyncio.Task[None]) -> None:
+        job_id = self._running.pop(task)
+        if not task.cancelled() and (exc := task.exception()) is not None:
+            # bookkeeping failed, job is retried when its lease expires
+            logger.error(f"Can't finish job {job_id}: {exc!r}")
+        self._wakeup.set()
+
+    async def _claim(self, limit: int) -> list[ClaimedJob]:
+        jobs = await claim_jobs(limit, self.lease_seconds)
+        if unknown := [job for job in jobs if job.kind not in self._handlers]:
+            # enqueued by newer version of app, leave them to its workers
+            await release_jobs([job.id for job in unknown], self.lease_seconds)
+            jobs = [job for job in jobs if job.kind in self._handlers]
+        return jobs
+
+    async def _work(self) -> None:
+        while True:
+            self._wakeup.clear()
+            n_claimed = 0
+            if free := self.concurrency - len(self._running):
+                try:
+                    jobs = await self._claim(free)
+                except Exception as exc:  # pylint: disable=broad-except
+                    logger.error(f"Can't claim jobs: {exc!r}")
+                    jobs = []
+
+                n_claimed = len(jobs)
+                for job in jobs:
+                    task = asyncio.create_task(self._run(job))
+                    self._running[task] = job.id
+                    task.add_done_callback(self._on_done)
+
+            # full batch means more jobs are probably ready
+            if n_claimed and n_claimed == free:
+                continue
+            with contextlib.suppress(asyncio.TimeoutError):
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_seconds)
+
+    def start(self) -> None:
+        if self._worker is None and not self.eager:
+            self._worker = asyncio.create_task(self._work())
+
+    async def stop(self, drain_timeout: float) -> None:
+        """
+        Stop claiming jobs and wait for running ones,
+        jobs which don't finish in drain_timeout are released for other workers.
+        """
+        if self._worker is None:
+            return
+
+        worker, self._worker = self._worker, None
+        worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await worker
+        if not self._running:
+            return
+
+        _, pending = await asyncio.wait(self._running, timeout=drain_timeout)
+        if not pending:
+            return
+
+        job_ids = [self._running[task] for task in pending]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        try:
+            await release_jobs(job_ids)
+        except Exception as exc:  # pylint: disable=broad-except
+            logger.error(f"Can't release interrupted jobs {job_ids}: {exc!r}")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "running": len(self._running),
+            "enqueued": self.enqueued,
+            "succeeded": self.succeeded,
+            "retried": self.retried,
+            "failed": self.failed,
+            "durations": {
+                kind: durations.stats() for kind, durations in self.durations.items()
+            },
+        }
+
+
+jobs_queue = JobsQueue(
+    concurrency=settings.jobs_concurrency,
+    poll_seconds=settings.jobs_poll_seconds,
+    lease_seconds=settings.jobs_lease_seconds,
+    max_attempts=settings.jobs_max_attempts,
+    retry_base_seconds=settings.jobs_retry_base_seconds,
+    retry_max_seconds=settings.jobs_retry_max_seconds,
+    eager=bool(settings.jobs_run_eagerly),
+)
+
+
+async def start_jobs_worker() -> None:
+    jobs_queue.start()
+
+
+async def stop_jobs_worker() -> None:
+    await jobs_queue.stop(settings.jobs_drain_timeout_seconds)
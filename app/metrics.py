@@ -0,0 +1,77 @@
+import bisect
+from typing import Any
+
+# seconds, from fast index lookups to requests which are stuck
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+class Histogram:
+    """
+    Counts of observed durations by buckets, upper bounds are inclusive.
+    Quantiles are estimated as upper bound of the bucket they fall into.
+    """
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise ValueError("Buckets must be non-empty and sorted")
+
+        self.buckets = buckets
+        # last one is for values over the largest bucket
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        if not self.count:
+            return 0.0
+
+        rank = q * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max
+
+    def stats(self) -> dict[str, Any]:
+        """
+        Durations in milliseconds, buckets are cumulative like in Prometheus.
+        """
+        cumulative: dict[str, int] = {}
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            cumulative[f"le_{bound * 1000:g}ms"] = seen
+        cumulative["le_inf"] = self.count
+
+        return {
+            "count": self.count,
+            "avg_ms": round(self.sum / self.count * 1000, 3) if self.count else 0.0,
+            "p50_ms": round(self.quantile(0.5) * 1000, 3),
+            "p95_ms": round(self.quantile(0.95) * 1000, 3),
+            "p99_ms": round(self.quantile(0.99) * 1000, 3),
+            "max_ms": round(self.max * 1000, 3),
+            "buckets": cumulative,
+        }
@@ -0,0 +1,116 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RateLimitPolicy:
+    """
+    At most `limit` requests per `period_seconds`, bursts up to `limit` are allowed.
+    """
+
+    limit: int
+    period_seconds: float
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimitPolicy":
+        """
+        value: "<requests>/<seconds>", e.g. "10/60"
+        """
+        try:
+            limit, period = value.split("/")
+            policy = cls(limit=int(limit), period_seconds=float(period))
+        except ValueError as exc:
+            raise ValueError(f"Invalid rate limit policy: {value}") from exc
+
+        if policy.limit < 1 or policy.period_seconds <= 0:
+            raise ValueError(f"Invalid rate limit policy: {value}")
+        return policy
+
+    @property
+    def rate(self) -> float:
+        """
+        Requests per second
+        """
+        return self.limit / self.period_seconds
+
+
+@dataclass(frozen=True)
+class RateLimitResult:
+    allowed: bool
+    remaining: int
+    # 0 if request is allowed
+    retry_after_seconds: float
+
+
+class RateLimitBackend(ABC):
+    """
+    Storage of limits state.
+    In-memory backend limits every worker separately, implement this interface
+    on top of shared storage (e.g. Redis) to limit all workers together.
+    """
+
+    @abstractmethod
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        """
+        Count one request for key and tell if it's allowed by policy.
+        """
+
+    @abstractmethod
+    async def reset(self) -> None:
+        """
+        Forget all counted requests.
+        """
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated_at: float
+
+
+class InMemoryTokenBucketBackend(RateLimitBackend):
+    """
+    Token bucket per key: bucket holds up to policy.limit tokens, which are refilled
+    evenly over policy.period_seconds, every request takes one token.
+
+    At most max_keys buckets are kept, least recently used are dropped,
+    which is the same as their buckets being full.
+    """
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, _Bucket] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def hit(self, key: str, policy: RateLimitPolicy) -> RateLimitResult:
+        now = time.monotonic()
+        if (bucket := self._buckets.get(key)) is None:
+            bucket = _Bucket(tokens=policy.limit, updated_at=now)
+        else:
+            refilled = (now - bucket.updated_at) * policy.rate
+            bucket.tokens = min(policy.limit, bucket.tokens + refilled)
+            bucket.updated_at = now
+
+        if bucket.tokens >= 1:
+            bucket.tokens -= 1
+            result = RateLimitResult(
+                allowed=True, remaining=int(bucket.tokens), retry_after_seconds=0
+            )
+        else:
+            retry_after = (1 - bucket.tokens) / policy.rate
+            result = RateLimitResult(
+                allowed=False, remaining=0, retry_after_seconds=retry_after
+            )
+
+        self._buckets[key] = bucket
+        self._buckets.move_to_end(key)
+        while len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return result
+
+    async def reset(self) -> None:
+        self._buckets.clear()
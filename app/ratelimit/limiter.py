@@ -0,0 +1,141 @@
+import contextlib
+import ipaddress
+import math
+from collections import Counter
+from collections.abc import Awaitable, Callable, Sequence
+from typing import Any
+
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.api.auth.utils import get_email_from_access_token
+from app.api.errors import TooManyRequests
+from app.config import settings
+from app.ratelimit.backends import (
+    InMemoryTokenBucketBackend,
+    RateLimitBackend,
+    RateLimitPolicy,
+)
+
+
+class RateLimiter:
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        policies: dict[str, RateLimitPolicy],
+        enabled: bool = True,
+    ) -> None:
+        self.backend = backend
+        self.policies = policies
+        self.enabled = enabled
+
+        self.allowed: Counter[str] = Counter()
+        self.rejected: Counter[str] = Counter()
+
+    async def check(self, policy_name: str, identity: str) -> None:
+        """
+        Raises TooManyRequests if identity has exceeded the policy.
+        """
+        if not self.enabled:
+            return
+
+        policy = self.policies[policy_name]
+        result = await self.backend.hit(f"{policy_name}:{identity}", policy)
+        if not result.allowed:
+            self.rejected[policy_name] += 1
+            raise TooManyRequests(math.ceil(result.retry_after_seconds))
+        self.allowed[policy_name] += 1
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "policies": {
+                name: {
+                    "limit": policy.limit,
+                    "period_seconds": policy.period_seconds,
+                    "allowed": self.allowed[name],
+                    "rejected": self.rejected[name],
+                }
+                for name, policy in self.policies.items()
+            },
+        }
+
+
+rate_limiter = RateLimiter(
+    backend=InMemoryTokenBucketBackend(),
+    policies={
+        name: RateLimitPolicy.parse(value) for name, value in settings.rate_limits.items()
+    },
+    enabled=bool(settings.rate_limit_enabled),
+)
+
+IPNetwork = ipaddress.IPv4Network | ipaddress.IPv6Network
+
+trusted_proxies: list[IPNetwork] = [
+    ipaddress.ip_network(network) for network in settings.rate_limit_trusted_proxies
+]
+
+
+def _is_trusted(address: str, proxies: Sequence[IPNetwork]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in proxies)
+
+
+def get_client_ip(
+    peer: str, forwarded_for: str | None, proxies: Sequence[IPNetwork]
+) -> str:
+    """
+    X-Forwarded-For is taken into account only if request came from trusted proxy,
+    otherwise anyone could pick IP to be limited by. Client is the rightmost address
+    which isn't a trusted proxy, addresses to the left of it might be forged.
+    """
+    if not forwarded_for or not _is_trusted(peer, proxies):
+        return peer
+
+    client = peer
+    for address in reversed(forwarded_for.split(",")):
+        client = address.strip()
+        if not _is_trusted(client, proxies):
+            break
+    return client
+
+
+def get_client_identity(request: Request, by_user: bool = False) -> str:
+    """
+    Client is limited by IP address, with by_user authorized user is limited
+    by its email instead. Behind proxy client IP is taken from X-Forwarded-For,
+    see get_client_ip.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    if by_user and scheme.lower() == "bearer" and token:
+        # invalid token, route will reject it itself
+        with contextlib.suppress(HTTPException):
+            return f"user:{get_email_from_access_token(token)}"
+
+    if request.client is None:
+        return "ip:unknown"
+    forwarded_for = request.headers.get("X-Forwarded-For")
+    return f"ip:{get_client_ip(request.client.host, forwarded_for, trusted_proxies)}"
+
+
+def rate_limit(
+    policy_name: str, by_user: bool = False
+) -> Callable[[Request], Awaitable[None]]:
+    """
+    Dependency which limits route by policy from settings.rate_limits:
+
+        @router.post("/token", dependencies=[Depends(rate_limit("auth_token"))])
+
+    by_user is only for routes which require authorization: otherwise client
+    would get a separate bucket for every account it has a token of.
+    """
+    if policy_name not in rate_limiter.policies:
+        raise KeyError(f"Rate limit policy {policy_name} isn't configured")
+
+    async def check_rate_limit(request: Request) -> None:
+        await rate_limiter.check(policy_name, get_client_identity(request, by_user))
+
+    return check_rate_limit
@@ -4,7 +4,6 @@ from typing import Any
 
 from pydantic import BaseModel, validator, Field, root_validator
 
-from app.api.auth.password_utils import get_password_hash
 from app.types import TaskStatus, EMAIL_REGEX, Grades
 
 URL_REGEX = r"(https?:\/\/(?:www\.|(?!www))[a-zA-Z0-9][a-zA-Z0-9-]+[a-zA-Z0-9]\.[^\s]{2,}|www\.[a-zA-Z0-9][a-zA-Z0-9-]+[a-zA-Z0-9]\.[^\s]{2,}|https?:\/\/(?:www\.|(?!www))[a-zA-Z0-9]+\.[^\s]{2,}|www\.[a-zA-Z0-9]+\.[^\s]{2,})"  # noqa
@@ -56,10 +55,6 @@ class CreateUser(_BaseUser):
         assert not system_fields_in_request, err
         return values
 
-    @validator("password")
-    def hash_password(cls, password: str) -> str:  # pylint: disable=no-self-argument
-        return get_password_hash(password)
-
     @root_validator()
     def explicitly_set_to_default_values(  # pylint: disable=no-self-argument
         cls, values: dict[str, Any]
@@ -92,12 +87,6 @@ class UpdateUser(_BaseUser):
     ) -> str | None:
         return value.strip() if value is not None else None
 
-    @validator("password")
-    def hash_new_password(  # pylint: disable=no-self-argument
-        cls, password: str | None
-    ) -> str | None:
-        return get_password_hash(password) if password is not None else password
-
     @root_validator
     def check_presense_of_passwords(  # pylint: disable=no-self-argument
         cls, values: dict[str, Any]
@@ -263,6 +252,8 @@ class GetTask(_BaseTask):
 
     suggested_by: UserTask | None = None
 
+    hashtags: list[str] = []
+
     created_at: datetime
 
     @validator("creator", pre=True)
@@ -386,6 +377,16 @@ class TasksFeed(BaseModel):
     tasks: list[TaskFeed]
 
 
+class TasksCursorPage(BaseModel):
+    """
+    next_cursor is None when there are no more tasks
+    """
+
+    items: list[TaskFeed]
+    size: int
+    next_cursor: str | None
+
+
 class _BaseGrade(BaseModel):
     creator_id: str
     grade_variant: Grades | None = Field(default=Grades.SUBSCRIBED)
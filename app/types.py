@@ -16,3 +16,8 @@ class Grades(str, Enum):
     PAYED_SUBSCRIBED = "payed_subscribed"
     TEAM_CREATOR = "team_creator"
     IS_CREATOR = "is_creator"
+
+
+class HashtagsMatch(str, Enum):
+    ANY = "any"
+    ALL = "all"
@@ -0,0 +1,287 @@
+"""
+End-to-end API benchmark on synthetic data.
+
+Seeds dataset, then measures latency percentiles and throughput of the main
+endpoints at several concurrency levels through in-process ASGI client,
+so numbers include the whole request path except network.
+Results are written as JSON to compare them between commits.
+
+Usage: PYTHONPATH=. python -m benchmarks.api --concurrency 1,10,50 --output bench.json
+"""
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from itertools import cycle
+from typing import Any
+
+from httpx import AsyncClient, Response
+
+from app.config import settings, AppEnvTypes
+from app.db.events import connect_to_db, close_db_connection
+from benchmarks.seed import (
+    SEED_PASSWORD,
+    SeedParams,
+    SeedResult,
+    drop_dataset,
+    seed_dataset,
+)
+from app.ratelimit.limiter import rate_limiter
+from main import app
+
+logger = logging.getLogger(__name__)
+
+Request = Callable[[AsyncClient], Awaitable[Response]]
+
+
+@dataclass
+class Scenario:
+    name: str
+    # builds the next request, called once per request
+    make_request: Callable[[], Request]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration_seconds: float
+    rps: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    max_ms: float
+    status_codes: dict[str, int] = field(default_factory=dict)
+
+
+def _percentiles(latencies: list[float]) -> tuple[float, float, float]:
+    if len(latencies) == 1:
+        return latencies[0], latencies[0], latencies[0]
+    cut_points = statistics.quantiles(latencies, n=100, method="inclusive")
+    return cut_points[49], cut_points[94], cut_points[98]
+
+
+async def run_scenario(
+    client: AsyncClient, scenario: Scenario, concurrency: int, n_requests: int
+) -> ScenarioResult:
+    latencies: list[float] = []
+    status_codes: dict[str, int] = {}
+    remaining = iter(range(n_requests))
+
+    async def worker() -> None:
+        for _ in remaining:
+            request = scenario.make_request()
+            started_at = time.perf_counter()
+            response = await request(client)
+            latencies.append(time.perf_counter() - started_at)
+
+            code = str(response.status_code)
+            status_codes[code] = status_codes.get(code, 0) + 1
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    duration = time.perf_counter() - started_at
+
+    p50, p95, p99 = _percentiles(latencies)
+    errors = sum(n for code, n in status_codes.items() if not code.startswith(("2", "3")))
+    return ScenarioResult(
+        name=scenario.name,
+        concurrency=concurrency,
+        requests=len(latencies),
+        errors=errors,
+        duration_seconds=round(duration, 4),
+        rps=round(len(latencies) / duration, 2),
+        p50_ms=round(p50 * 1000, 3),
+        p95_ms=round(p95 * 1000, 3),
+        p99_ms=round(p99 * 1000, 3),
+        max_ms=round(max(latencies) * 1000, 3),
+        status_codes=status_codes,
+    )
+
+
+async def _get_access_token(client: AsyncClient, email: str) -> str:
+    response = await client.post(
+        "/auth/token", data={"username": email, "password": SEED_PASSWORD}
+    )
+    response.raise_for_status()
+    access_token: str = response.json()["access_token"]
+    return access_token
+
+
+def build_scenarios(
+    seeded: SeedResult, tokens: list[str], n_feed_pages: int
+) -> list[Scenario]:
+    tasks, emails = cycle(seeded.task_ids), cycle(seeded.emails)
+    auth_headers = cycle([{"Authorization": f"Bearer {token}"} for token in tokens])
+    pages = cycle(range(1, n_feed_pages + 1))
+
+    def get(url: str, headers: dict[str, str] | None = None) -> Request:
+        async def request(client: AsyncClient) -> Response:
+            response: Response = await client.get(url, headers=headers)
+            return response
+
+        return request
+
+    def login() -> Request:
+        data = {"username": next(emails), "password": SEED_PASSWORD}
+
+        async def request(client: AsyncClient) -> Response:
+            response: Response = await client.post("/auth/token", data=data)
+            return response
+
+        return request
+
+    return [
+        Scenario("GET /feed", lambda: get(f"/feed?page={next(pages)}&size=20")),
+        Scenario(
+            "GET /feed (authorized)",
+            lambda: get(f"/feed?page={next(pages)}&size=20", next(auth_headers)),
+        ),
+        Scenario(
+            "GET /tasks/{id}", lambda: get(f"/tasks/{next(tasks)}", next(auth_headers))
+        ),
+        Scenario(
+            "GET /tasks/{id}/comments",
+            lambda: get(f"/tasks/{next(tasks)}/comments?size=20", next(auth_headers)),
+        ),
+        Scenario("POST /auth/token", login),
+        Scenario("GET /users/me", lambda: get("/users/me", next(auth_headers))),
+    ]
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(
+    params: SeedParams,
+    concurrency_levels: list[int],
+    n_requests: int,
+    n_warmup: int,
+    only: list[str] | None,
+    keep_data: bool,
+) -> dict[str, Any]:
+    # all requests come from one client, logins would hit its rate limits
+    rate_limiter.enabled = False
+    await connect_to_db()
+    seeded: SeedResult | None = None
+    try:
+        seeded = await seed_dataset(params)
+        async with AsyncClient(app=app, base_url="http://bench") as client:
+            # tokens of different users, so per-user caches aren't always hot
+            tokens = [
+                await _get_access_token(client, email) for email in seeded.emails[:20]
+            ]
+            n_feed_pages = max(1, min(50, params.n_tasks // 20))
+            scenarios = build_scenarios(seeded, tokens, n_feed_pages)
+            if only:
+                scenarios = [s for s in scenarios if any(o in s.name for o in only)]
+
+            results: list[ScenarioResult] = []
+            for scenario in scenarios:
+                if n_warmup:
+                    await run_scenario(client, scenario, 1, n_warmup)
+                for concurrency in concurrency_levels:
+                    result = await run_scenario(client, scenario, concurrency, n_requests)
+                    logger.info(
+                        f"{result.name:<28} c={concurrency:<4} rps={result.rps:<9} "
+                        f"p50={result.p50_ms}ms p95={result.p95_ms}ms "
+                        f"p99={result.p99_ms}ms errors={result.errors}"
+                    )
+                    results.append(result)
+    finally:
+        if seeded is not None and not keep_data:
+            await drop_dataset(seeded.tag)
+        await close_db_connection()
+
+    return {
+        "meta": {
+            "git_commit": _git_commit(),
+            "started_at": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "app_env": settings.app_env.value,
+            "dataset": params.to_dict(),
+            "requests_per_level": n_requests,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    defaults = SeedParams()
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--users", type=int, default=defaults.n_users)
+    parser.add_argument("--tasks", type=int, default=defaults.n_tasks)
+    parser.add_argument(
+        "--comments-per-task", type=int, default=defaults.comments_per_task
+    )
+    parser.add_argument("--hashtags", type=int, default=defaults.n_hashtags)
+    parser.add_argument(
+        "--hashtags-per-task", type=int, default=defaults.hashtags_per_task
+    )
+    parser.add_argument(
+        "--subscriptions-per-user", type=int, default=defaults.subscriptions_per_user
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=lambda value: [int(level) for level in value.split(",")],
+        default=[1, 10, 50],
+        help="comma separated concurrency levels",
+    )
+    parser.add_argument("--requests", type=int, default=500, help="per level")
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument(
+        "--only", action="append", help="run only scenarios containing this substring"
+    )
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument(
+        "--keep-data", action="store_true", help="don't remove seeded rows"
+    )
+    return parser.parse_args()
+
+
+def main() -> None:
+    if settings.app_env == AppEnvTypes.PROD:
+        raise SystemExit("Benchmarks insert synthetic data, don't run them on prod")
+
+    args = _parse_args()
+    params = SeedParams(
+        n_users=args.users,
+        n_tasks=args.tasks,
+        comments_per_task=args.comments_per_task,
+        n_hashtags=args.hashtags,
+        hashtags_per_task=args.hashtags_per_task,
+        subscriptions_per_user=args.subscriptions_per_user,
+    )
+    report = asyncio.run(
+        run_benchmark(
+            params,
+            concurrency_levels=args.concurrency,
+            n_requests=args.requests,
+            n_warmup=args.warmup,
+            only=args.only,
+            keep_data=args.keep_data,
+        )
+    )
+    with open(args.output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    logger.info(f"Results are written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Microbenchmark of mapping DB rows to response models:
+parse_obj (full validation) vs trusted hydration, per row of a 30 tasks feed page
+and a 20 comments page.
+
+Usage: PYTHONPATH=. python -m benchmarks.hydration --iterations 2000
+"""
+import argparse
+import json
+import logging
+import timeit
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any
+
+from pydantic import BaseModel
+
+from app.db.hydration import hydrate
+from app.schemas import GetTaskComment, TaskFeed
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FEED_PAGE_SIZE = 30
+COMMENTS_PAGE_SIZE = 20
+
+
+def _feed_rows(n_rows: int) -> list[str]:
+    """
+    JSON of tasks as built by feed queries.
+    """
+    now = datetime.now(timezone.utc)
+    return [
+        json.dumps(
+            {
+                "id": str(uuid.uuid4()),
+                "title": f"Task {i}",
+                "description": f"Description of task {i} #benchmark",
+                "created_at": (now - timedelta(minutes=i)).isoformat(),
+                "status": "IDEA",
+                "n_comments": i,
+                "creator": {
+                    "id": str(uuid.uuid4()),
+                    "username": f"creator{i}",
+                    "avatar_url": "https://google.com/some_picture.jpg",
+                },
+            }
+        )
+        for i in range(n_rows)
+    ]
+
+
+def _comment_rows(n_rows: int) -> list[dict[str, Any]]:
+    now = datetime.now(timezone.utc)
+    task_id = str(uuid.uuid4())
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "content": f"Comment {i}",
+            "task_id": task_id,
+            "user_id": str(uuid.uuid4()),
+            "edited": False,
+            "edited_at": None,
+            "created_at": now - timedelta(minutes=i),
+        }
+        for i in range(n_rows)
+    ]
+
+
+def _per_row_us(seconds: float, iterations: int, n_rows: int) -> float:
+    return round(seconds / (iterations * n_rows) * 1_000_000, 3)
+
+
+def _compare(
+    model: type[BaseModel], rows: list[Any], iterations: int, from_json: bool
+) -> dict[str, float]:
+    def via_parse_obj() -> None:
+        for row in rows:
+            model.parse_obj(json.loads(row) if from_json else row)
+
+    def via_hydrate() -> None:
+        for row in rows:
+            hydrate(model, json.loads(row) if from_json else row)
+
+    parse_time = min(timeit.repeat(via_parse_obj, number=iterations, repeat=3))
+    hydrate_time = min(timeit.repeat(via_hydrate, number=iterations, repeat=3))
+    return {
+        "rows": len(rows),
+        "parse_obj_us_per_row": _per_row_us(parse_time, iterations, len(rows)),
+        "hydrate_us_per_row": _per_row_us(hydrate_time, iterations, len(rows)),
+        "speedup": round(parse_time / hydrate_time, 2),
+    }
+
+
+def run(iterations: int) -> dict[str, Any]:
+    return {
+        "iterations": iterations,
+        "feed_page": _compare(
+            TaskFeed, _feed_rows(FEED_PAGE_SIZE), iterations, from_json=True
+        ),
+        "comments_page": _compare(
+            GetTaskComment, _comment_rows(COMMENTS_PAGE_SIZE), iterations, from_json=False
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=2_000)
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = run(args.iterations)
+    logger.info(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Microbenchmark of hot single-row lookups: SQLAlchemy select compiled and sent
+by databases on every call vs statement prepared once per connection.
+
+Usage: PYTHONPATH=. python -m benchmarks.prepared_queries --iterations 5000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import secrets
+import time
+from collections.abc import Awaitable, Callable
+
+from sqlalchemy import select
+
+from app.config import settings, AppEnvTypes
+from app.db.base import database
+from app.db.events import connect_to_db, close_db_connection
+from app.db.models.users.handlers import GET_USER_BY_EMAIL, create_user
+from app.db.models.users.schemas import User
+from app.db.prepared import prepared_queries
+from app.schemas import CreateUser, GetUser
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+async def _per_call_us(func: Callable[[], Awaitable[None]], iterations: int) -> float:
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await func()
+    return round((time.perf_counter() - started) / iterations * 1_000_000, 3)
+
+
+async def run(iterations: int) -> dict[str, float]:
+    email = f"{secrets.token_hex(4)}@prepared.bench"
+    user_params = CreateUser.construct(
+        first_name="Bench",
+        last_name="Mark",
+        username=f"bench_{secrets.token_hex(4)}",
+        email=email,
+        password="-",
+        email_is_verified=True,
+    )
+    user, err = await create_user(user_params)
+    if err:
+        raise RuntimeError(f"Can't create user for benchmark: {err}")
+    assert user is not None
+
+    async def via_sqlalchemy() -> None:
+        query = select(User).where(User.email == email).limit(1)
+        GetUser.parse_obj(await database.fetch_one(query))
+
+    async def via_prepared() -> None:
+        row = await prepared_queries.fetch_one(GET_USER_BY_EMAIL, email)
+        assert row is not None
+        GetUser.parse_obj(dict(row))
+
+    try:
+        # warm up both paths, asyncpg caches statements of databases too
+        await via_sqlalchemy()
+        await via_prepared()
+        sqlalchemy_us = await _per_call_us(via_sqlalchemy, iterations)
+        prepared_us = await _per_call_us(via_prepared, iterations)
+    finally:
+        await database.execute("DELETE FROM users WHERE id = :id", {"id": user.id})
+
+    return {
+        "iterations": iterations,
+        "sqlalchemy_us_per_call": sqlalchemy_us,
+        "prepared_us_per_call": prepared_us,
+        "speedup": round(sqlalchemy_us / prepared_us, 2),
+    }
+
+
+async def _run_connected(iterations: int) -> dict[str, float]:
+    await connect_to_db()
+    try:
+        return await run(iterations)
+    finally:
+        await close_db_connection()
+
+
+def main() -> None:
+    if settings.app_env == AppEnvTypes.PROD:
+        raise SystemExit("Benchmarks insert synthetic data, don't run them on prod")
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--iterations", type=int, default=5_000)
+    parser.add_argument("--output", default=None, help="write results as JSON")
+    args = parser.parse_args()
+
+    results = asyncio.run(_run_connected(args.iterations))
+    logger.info(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
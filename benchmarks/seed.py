@@ -0,0 +1,204 @@
+"""
+Synthetic dataset for benchmarks.
+Everything is inserted by a few INSERT ... SELECT FROM generate_series statements,
+seeded rows are marked with tag in emails, so they can be removed afterwards.
+"""
+import logging
+import secrets
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from app.api.auth.password_utils import get_password_hash
+from app.db.base import database
+
+logger = logging.getLogger(__name__)
+
+SEED_PASSWORD = "benchmark-password"
+
+
+@dataclass
+class SeedParams:
+    n_users: int = 200
+    n_tasks: int = 10_000
+    comments_per_task: int = 5
+    n_hashtags: int = 50
+    hashtags_per_task: int = 2
+    subscriptions_per_user: int = 10
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class SeedResult:
+    tag: str
+    user_ids: list[str]
+    emails: list[str]
+    task_ids: list[str]
+
+
+def _email_domain(tag: str) -> str:
+    return f"{tag}.bench"
+
+
+async def seed_dataset(params: SeedParams) -> SeedResult:
+    tag = secrets.token_hex(4)
+    domain = _email_domain(tag)
+    # hashing is slow on purpose, all seeded users share one password
+    password_hash = get_password_hash(SEED_PASSWORD)
+
+    async with database.transaction():
+        users = await database.fetch_all(
+            """
+            INSERT INTO users (username, password, email, email_is_verified)
+            SELECT
+                'bench_' || :tag || '_' || i,
+                :password,
+                'u' || i || '@' || :domain,
+                true
+            FROM generate_series(1, :n_users) i
+            RETURNING id, email
+            """,
+            {
+                "tag": tag,
+                "password": password_hash,
+                "domain": domain,
+                "n_users": params.n_users,
+            },
+        )
+        user_ids = [row["id"] for row in users]
+
+        # tasks are spread over creators and time, so feed pages differ
+        tasks = await database.fetch_all(
+            """
+            INSERT INTO tasks (title, description, creator_id, status, created_at)
+            SELECT
+                'Benchmark task ' || i,
+                'Description of benchmark task ' || i || ' #tag' || (i % :n_hashtags),
+                (CAST(:user_ids AS varchar[]))[1 + i % :n_users],
+                'IDEA',
+                now() - i * interval '1 second'
+            FROM generate_series(1, :n_tasks) i
+            RETURNING id
+            """,
+            {
+                "user_ids": user_ids,
+                "n_users": len(user_ids),
+                "n_tasks": params.n_tasks,
+                "n_hashtags": params.n_hashtags,
+            },
+        )
+        task_ids = [row["id"] for row in tasks]
+
+        await database.execute(
+            """
+            INSERT INTO tasks_comments (content, task_id, user_id, edited, created_at)
+            SELECT
+                'Benchmark comment ' || i,
+                task_id,
+                (CAST(:user_ids AS varchar[]))[1 + (task_n + i) % :n_users],
+                false,
+                now() - i * interval '1 second'
+            FROM
+                unnest(CAST(:task_ids AS varchar[]))
+                    WITH ORDINALITY AS t(task_id, task_n),
+                generate_series(1, :comments_per_task) i
+            """,
+            {
+                "user_ids": user_ids,
+                "n_users": len(user_ids),
+                "task_ids": task_ids,
+                "comments_per_task": params.comments_per_task,
+            },
+        )
+        await database.execute(
+            """
+            UPDATE tasks SET n_comments = :comments_per_task
+            WHERE id = ANY(CAST(:task_ids AS varchar[]))
+            """,
+            {"task_ids": task_ids, "comments_per_task": params.comments_per_task},
+        )
+
+        await database.execute(
+            """
+            INSERT INTO hashtags (hashtag, task_id)
+            SELECT 'tag' || ((task_n + i) % :n_hashtags), task_id
+            FROM
+                unnest(CAST(:task_ids AS varchar[]))
+                    WITH ORDINALITY AS t(task_id, task_n),
+                generate_series(0, :hashtags_per_task - 1) i
+            """,
+            {
+                "task_ids": task_ids,
+                "n_hashtags": params.n_hashtags,
+                "hashtags_per_task": params.hashtags_per_task,
+            },
+        )
+
+        await database.execute(
+            """
+            INSERT INTO grades (user_id, creator_id, grade_variant, grade_variant_int)
+            SELECT
+                user_id,
+                (CAST(:user_ids AS varchar[]))[1 + (user_n + i) % :n_users],
+                'SUBSCRIBED',
+                1
+            FROM
+                unnest(CAST(:user_ids AS varchar[]))
+                    WITH ORDINALITY AS u(user_id, user_n),
+                generate_series(1, :subscriptions_per_user) i
+            """,
+            {
+                "user_ids": user_ids,
+                "n_users": len(user_ids),
+                "subscriptions_per_user": min(
+                    params.subscriptions_per_user, len(user_ids) - 1
+                ),
+            },
+        )
+
+    logger.info(f"Seeded dataset {tag}: {params.to_dict()}")
+    return SeedResult(
+        tag=tag,
+        user_ids=user_ids,
+        emails=[row["email"] for row in users],
+        task_ids=task_ids,
+    )
+
+
+async def drop_dataset(tag: str) -> None:
+    """
+    Remove everything created by seed_dataset and by benchmarked requests
+    of seeded users.
+    """
+    values = {"email_pattern": f"%@{_email_domain(tag)}"}
+    seeded_users = "SELECT id FROM users WHERE email LIKE :email_pattern"
+    seeded_tasks = f"SELECT id FROM tasks WHERE creator_id IN ({seeded_users})"
+
+    async with database.transaction():
+        await database.execute(
+            f"DELETE FROM hashtags WHERE task_id IN ({seeded_tasks})", values
+        )
+        await database.execute(
+            f"""
+            DELETE FROM tasks_comments
+            WHERE task_id IN ({seeded_tasks}) OR user_id IN ({seeded_users})
+            """,
+            values,
+        )
+        await database.execute(
+            f"""
+            DELETE FROM grades
+            WHERE user_id IN ({seeded_users}) OR creator_id IN ({seeded_users})
+            """,
+            values,
+        )
+        await database.execute(
+            f"DELETE FROM timelines WHERE user_id IN ({seeded_users})", values
+        )
+        await database.execute(f"DELETE FROM tasks WHERE id IN ({seeded_tasks})", values)
+        await database.execute(
+            "DELETE FROM users WHERE email LIKE :email_pattern", values
+        )
+
+    logger.info(f"Dropped dataset {tag}")
@@ -11,6 +11,7 @@ from starlette.responses import JSONResponse
 
 from app.api.auth.routers import auth_router
 from app.api.feed.routers import feed_router
+from app.api.internal.routers import internal_router
 from app.api.tasks.comment_routers import comment_router
 from app.api.tasks.task_routers import task_router
 from app.api.tasks.grade_routers import grade_router
@@ -56,6 +57,7 @@ def get_application() -> FastAPI:
     application.include_router(comment_router)
     application.include_router(feed_router)
     application.include_router(grade_router)
+    application.include_router(internal_router)
 
     # origins = [
     #     "https://frontend-three-red.vercel.app/",  # dev frontend
@@ -10,6 +10,8 @@ from app.db.models.users.schemas import User
 from app.db.models.tasks.schemas import Task, TaskComment
 from app.db.models.hashtags.schemas import Hashtag
 from app.db.models.grades.schemas import Grade
+from app.db.models.timelines.schemas import TimelineEntry
+from app.db.models.jobs.schemas import Job
 
 
 config = context.config
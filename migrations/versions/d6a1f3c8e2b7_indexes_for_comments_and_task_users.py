@@ -0,0 +1,33 @@
+"""indexes for comments page and users of tasks
+
+Revision ID: d6a1f3c8e2b7
+Revises: b9d3f1a6c274
+Create Date: 2023-04-13 11:05:37.204519
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd6a1f3c8e2b7'
+down_revision = 'b9d3f1a6c274'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # don't block writes while indexes are built on existing data
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_comments_task_id_created_at', 'tasks_comments', ['task_id', sa.text('created_at DESC')], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_tasks_comments_user_id'), 'tasks_comments', ['user_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_tasks_assignee_id'), 'tasks', ['assignee_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_tasks_suggested_by_id'), 'tasks', ['suggested_by_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_tasks_suggested_by_id'), table_name='tasks', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_tasks_assignee_id'), table_name='tasks', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_tasks_comments_user_id'), table_name='tasks_comments', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_comments_task_id_created_at', table_name='tasks_comments', postgresql_concurrently=True)
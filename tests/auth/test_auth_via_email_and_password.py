@@ -1,10 +1,17 @@
+import asyncio
 from http import HTTPStatus
 
 import pytest
+from argon2 import PasswordHasher
 
-from app.api.auth.password_utils import get_password_hash
+from app.api.auth.password_utils import (
+    get_password_hash,
+    password_needs_rehash,
+    passwords_are_equal,
+)
 from app.api.auth.types import AccessTokenType
-from app.db.models.users.handlers import create_user
+from app.api.auth.utils import rehash_password
+from app.db.models.users.handlers import create_user, get_user_by_email, update_user
 from app.schemas import CreateUser
 
 pytestmark = pytest.mark.asyncio
@@ -94,3 +101,51 @@ async def test_success_auth(async_client):
 
     assert len(json_response["access_token"]) != 0, json_response
     assert json_response["token_type"] == AccessTokenType.BEARER, json_response
+
+
+async def test_password_is_rehashed_on_login(async_client):
+    password, email = "appleapple", "rehashed@apple.com"
+    outdated_hash = PasswordHasher(time_cost=1, memory_cost=1024).hash(password)
+    assert password_needs_rehash(outdated_hash)
+
+    user_data = {
+        "username": "rehashedsteve",
+        "password": outdated_hash,
+        "email": email,
+        "email_is_verified": True,
+    }
+    await create_user(CreateUser.construct(**user_data))
+
+    auth_data = {"username": email, "password": password}
+    response = await async_client.post("/auth/token", data=auth_data)
+    assert response.status_code == HTTPStatus.OK, response.text
+
+    # password is rehashed in background after response
+    for _ in range(50):
+        user = await get_user_by_email(email)
+        if user.password != outdated_hash:
+            break
+        await asyncio.sleep(0.1)
+
+    assert not password_needs_rehash(user.password)
+    assert passwords_are_equal(password, user.password)
+
+
+async def test_rehash_does_not_overwrite_changed_password():
+    password, email = "appleapple", "rehashed2@apple.com"
+    outdated_hash = PasswordHasher(time_cost=1, memory_cost=1024).hash(password)
+    user_data = {
+        "username": "rehashedsteve2",
+        "password": outdated_hash,
+        "email": email,
+        "email_is_verified": True,
+    }
+    user, _ = await create_user(CreateUser.construct(**user_data))
+
+    # password is reset while rehash of the old one is running
+    new_hash = get_password_hash("newpassword")
+    await update_user(user_id=user.id, values={"password": new_hash})
+    await rehash_password(user.id, password, old_password=outdated_hash)
+
+    user = await get_user_by_email(email)
+    assert user.password == new_hash
@@ -0,0 +1,70 @@
+import pytest
+from sqlalchemy import update
+
+from app.api.auth.password_utils import get_password_hash
+from app.db.base import database
+from app.db.models.users.exists_filter import users_exists_filter
+from app.db.models.users.handlers import create_user
+from app.db.models.users.schemas import User
+from app.schemas import CreateUser
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _create_user(email: str, username: str) -> None:
+    user_data = {
+        "username": username,
+        "password": get_password_hash("password"),
+        "email": email,
+        "email_is_verified": True,
+    }
+    await create_user(CreateUser.construct(**user_data))
+
+
+async def test_check_email_without_filter(async_client):
+    await _create_user("checked1@apple.com", "checkedone")
+
+    response = await async_client.get("/auth/check-email?email=checked1@apple.com")
+    assert response.json() == {"user_exists": True}
+
+    response = await async_client.get("/auth/check-email?email=unknown1@apple.com")
+    assert response.json() == {"user_exists": False}
+
+
+async def test_check_email_with_filter(async_client):
+    await _create_user("checked2@apple.com", "checkedtwo")
+    await users_exists_filter.rebuild()
+    try:
+        negatives = users_exists_filter.negatives
+        response = await async_client.get("/auth/check-email?email=unknown2@apple.com")
+        assert response.json() == {"user_exists": False}
+        assert users_exists_filter.negatives == negatives + 1
+
+        response = await async_client.get("/auth/check-email?email=checked2@apple.com")
+        assert response.json() == {"user_exists": True}
+
+        # created users are added to filter at once
+        await _create_user("checked3@apple.com", "checkedthree")
+        response = await async_client.get("/auth/check-email?email=checked3@apple.com")
+        assert response.json() == {"user_exists": True}
+    finally:
+        users_exists_filter.clear()
+
+
+async def test_check_email_updated_by_other_worker(async_client):
+    await _create_user("checked4@apple.com", "checkedfour")
+    await users_exists_filter.rebuild()
+    try:
+        # update of other worker isn't added to filter of this one
+        query = (
+            update(User)
+            .where(User.email == "checked4@apple.com")
+            .values(email="checked5@apple.com")
+        )
+        await database.execute(query)
+        await users_exists_filter.sync()
+
+        response = await async_client.get("/auth/check-email?email=checked5@apple.com")
+        assert response.json() == {"user_exists": True}
+    finally:
+        users_exists_filter.clear()
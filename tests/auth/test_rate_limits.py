@@ -0,0 +1,50 @@
+from http import HTTPStatus
+
+import pytest
+
+from app.api.auth.utils import create_access_token
+from app.ratelimit.backends import RateLimitPolicy
+from app.ratelimit.limiter import rate_limiter
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+async def enabled_rate_limiter():
+    policies, enabled = rate_limiter.policies, rate_limiter.enabled
+    rate_limiter.policies = {**policies, "refresh_password": RateLimitPolicy.parse("2/60")}
+    rate_limiter.enabled = True
+    try:
+        yield rate_limiter
+    finally:
+        rate_limiter.policies, rate_limiter.enabled = policies, enabled
+        await rate_limiter.backend.reset()
+
+
+async def test_refresh_password_is_rate_limited(async_client, enabled_rate_limiter):
+    data = {"email": "limited@apple.com"}
+    for _ in range(2):
+        response = await async_client.post("/auth/refresh-password/", json=data)
+        assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS, response.text
+
+    response = await async_client.post("/auth/refresh-password/", json=data)
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, response.text
+    assert 0 < int(response.headers["Retry-After"]) <= 30
+
+
+async def test_token_of_other_account_does_not_reset_login_limit(
+    async_client, enabled_rate_limiter
+):
+    enabled_rate_limiter.policies = {
+        **enabled_rate_limiter.policies,
+        "auth_token": RateLimitPolicy.parse("2/60"),
+    }
+    data = {"username": "limited@apple.com", "password": "guessed"}
+    for _ in range(2):
+        response = await async_client.post("/auth/token", data=data)
+        assert response.status_code != HTTPStatus.TOO_MANY_REQUESTS, response.text
+
+    # login is limited by IP, token of any account doesn't give a new bucket
+    headers = {"Authorization": f"Bearer {create_access_token('owned@apple.com')}"}
+    response = await async_client.post("/auth/token", data=data, headers=headers)
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, response.text
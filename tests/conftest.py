@@ -9,6 +9,10 @@ from sqlalchemy_utils import database_exists, create_database
 from app.config import settings, AppEnvTypes
 from app.db.base import database
 from app.db.events import connect_to_db, close_db_connection
+from app.api.auth.cache import access_tokens_cache
+from app.db.models.tasks.cache import feed_pages_cache, tasks_count_cache
+from app.db.models.users.cache import users_by_email_cache
+from app.db.models.users.exists_filter import users_exists_filter
 from main import app
 
 
@@ -37,6 +41,16 @@ async def connect_db(db_url: str) -> AsyncGenerator:
     if not database_exists(db_url):
         create_database(db_url)
 
+    # DB is rolled back after every module, so must be in-process caches
+    for cache in (
+        feed_pages_cache,
+        tasks_count_cache,
+        users_by_email_cache,
+        access_tokens_cache,
+        users_exists_filter,
+    ):
+        cache.clear()
+
     try:
         await connect_to_db()
         yield
@@ -1,13 +1,15 @@
 from http import HTTPStatus
 
 import pytest
+from fastapi_pagination import Page
 
 from app.api.auth.password_utils import get_password_hash
+from app.db.models.tasks.cache import feed_pages_cache
 from app.db.models.tasks.task_handlers import create_task
 from app.db.models.tasks.comment_handlers import add_comment_to_task
 from app.db.models.users.handlers import create_user
 from app.schemas import GetUser, CreateUser, GetTaskNoForeigns, CreateTask, \
-    CreateTaskComment
+    CreateTaskComment, TaskFeed, UserFeed
 
 
 pytestmark = pytest.mark.asyncio
@@ -136,3 +138,99 @@ async def test_get_paginated_feed(
 async def test_can_get_feed_while_unauthorized(async_client):
     response = await async_client.get("/feed")
     assert response.status_code == HTTPStatus.OK, response.text
+
+
+async def test_get_feed_by_cursor(async_client, access_token_and_user: tuple[str, GetUser]):
+    access_token, user = access_token_and_user
+    auth_header = f"Bearer {access_token}"
+
+    task_data = {
+        "title": "Hello",
+        "description": "Some description",
+        "creator_id": user.id,
+    }
+    for _ in range(25):
+        await create_task(CreateTask.construct(**task_data))
+
+    response = await async_client.get("/feed?page=1&size=20", headers={"Authorization": auth_header})
+    total = response.json()['total']
+
+    page_size = 20
+    response = await async_client.get(f"/feed/cursor?size={page_size}", headers={"Authorization": auth_header})
+    assert response.status_code == HTTPStatus.OK, response.text
+    response_json = response.json()
+    assert len(response_json['items']) == page_size
+    assert response_json['next_cursor'] is not None
+    seen_items: list = response_json['items']
+
+    # new tasks must not shift next pages
+    for _ in range(3):
+        await create_task(CreateTask.construct(**task_data))
+
+    next_cursor = response_json['next_cursor']
+    while next_cursor is not None:
+        response = await async_client.get(
+            f"/feed/cursor?size={page_size}&cursor={next_cursor}", headers={"Authorization": auth_header}
+        )
+        assert response.status_code == HTTPStatus.OK, response.text
+        response_json = response.json()
+        seen_items.extend(response_json['items'])
+        next_cursor = response_json['next_cursor']
+
+    seen_ids = [task['id'] for task in seen_items]
+    assert len(seen_ids) == total
+    assert len(set(seen_ids)) == len(seen_ids), "Duplicates in feed"
+
+    created_at = [task['created_at'] for task in seen_items]
+    assert created_at == sorted(created_at, reverse=True)
+
+
+async def test_get_feed_with_invalid_cursor(async_client):
+    response = await async_client.get("/feed/cursor?cursor=invalid")
+    assert response.status_code == HTTPStatus.BAD_REQUEST, response.text
+
+
+async def test_anonymous_feed_is_cached(async_client):
+    feed_pages_cache.clear()
+    hits = feed_pages_cache.hits
+    for _ in range(2):
+        response = await async_client.get("/feed?page=1&size=20")
+        assert response.status_code == HTTPStatus.OK, response.text
+    assert feed_pages_cache.hits == hits + 1
+    assert response.json()['page'] == 1
+
+
+async def test_feed_page_conforms_to_schema(async_client, task_with_one_comment):
+    """
+    Page of feed is built by DB and returned without validation
+    """
+    response = await async_client.get("/feed?page=1&size=20")
+    assert response.status_code == HTTPStatus.OK, response.text
+
+    page = Page[TaskFeed].parse_raw(response.content)
+    assert page.items
+    for task in response.json()['items']:
+        assert set(task) == set(TaskFeed.__fields__)
+        assert set(task['creator']) == set(UserFeed.__fields__)
+
+
+async def test_feed_not_modified(async_client, access_token_and_user):
+    access_token, user = access_token_and_user
+    # authorized feed isn't cached, so new task is visible at once
+    auth_header = f"Bearer {access_token}"
+
+    response = await async_client.get("/feed?page=1&size=20", headers={"Authorization": auth_header})
+    assert response.status_code == HTTPStatus.OK, response.text
+    etag = response.headers["ETag"]
+
+    headers = {"Authorization": auth_header, "If-None-Match": etag}
+    response = await async_client.get("/feed?page=1&size=20", headers=headers)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, response.text
+    assert not response.content
+
+    data = {"title": "Hello", "description": "New task", "creator_id": user.id}
+    await create_task(CreateTask.construct(**data))
+
+    response = await async_client.get("/feed?page=1&size=20", headers=headers)
+    assert response.status_code == HTTPStatus.OK, response.text
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,116 @@
+from http import HTTPStatus
+
+import pytest
+
+from app.api.auth.password_utils import get_password_hash
+from app.config import settings
+from app.db.base import database
+from app.db.models.tasks.task_handlers import create_task
+from app.db.models.timelines.handlers import fan_out_task
+from app.db.models.users.handlers import create_user
+from app.schemas import GetUser, CreateUser, GetTaskNoForeigns, CreateTask
+
+pytestmark = pytest.mark.asyncio
+
+
+async def _create_user(async_client, email: str, username: str) -> tuple[str, GetUser]:
+    password = "aglafknaf"
+    user_data = {
+        "username": username,
+        "password": get_password_hash(password),
+        "email": email,
+        "email_is_verified": True,
+    }
+    user, _ = await create_user(CreateUser.construct(**user_data))
+
+    auth_data = {"username": email, "password": password}
+    auth_response = await async_client.post("/auth/token", data=auth_data)
+    return auth_response.json()["access_token"], user
+
+
+async def _create_and_fan_out_task(creator: GetUser) -> GetTaskNoForeigns:
+    data = {"title": "Hello", "description": "Some description", "creator_id": creator.id}
+    task, _ = await create_task(CreateTask.construct(**data))
+    await fan_out_task(task.id, creator_id=creator.id, created_at=task.created_at)
+    return task
+
+
+@pytest.fixture(scope="module")
+async def creator(async_client) -> GetUser:
+    _, user = await _create_user(async_client, "timeline_creator@apple.com", "tlcreator")
+    return user
+
+
+@pytest.fixture(scope="module")
+async def subscriber(async_client, creator: GetUser) -> tuple[str, GetUser]:
+    access_token, user = await _create_user(async_client, "timeline_sub@apple.com", "tlsubscriber")
+    query = """
+    INSERT INTO grades (user_id, creator_id, grade_variant, grade_variant_int)
+    VALUES (:user_id, :creator_id, 'SUBSCRIBED', 1)
+    """
+    await database.execute(query, {"user_id": user.id, "creator_id": creator.id})
+    return access_token, user
+
+
+async def test_timeline_contains_tasks_of_subscribed_creators(async_client, creator, subscriber):
+    access_token, _ = subscriber
+    auth_header = f"Bearer {access_token}"
+
+    _, other_creator = await _create_user(async_client, "timeline_other@apple.com", "tlother")
+    foreign_task = await _create_and_fan_out_task(other_creator)
+    tasks = [await _create_and_fan_out_task(creator) for _ in range(25)]
+
+    seen_ids = []
+    url = "/feed/timeline?size=20"
+    while url:
+        response = await async_client.get(url, headers={"Authorization": auth_header})
+        assert response.status_code == HTTPStatus.OK, response.text
+        response_json = response.json()
+        seen_ids.extend(task['id'] for task in response_json['items'])
+        next_cursor = response_json['next_cursor']
+        url = f"/feed/timeline?size=20&cursor={next_cursor}" if next_cursor else None
+
+    assert len(seen_ids) == len(set(seen_ids)), "Duplicates in timeline"
+    assert set(seen_ids) == {task.id for task in tasks}
+    assert foreign_task.id not in seen_ids
+
+
+async def test_timeline_only_of_subscribers(async_client):
+    _, creator = await _create_user(async_client, "timeline_grades@apple.com", "tlgrades")
+    _, subscriber = await _create_user(async_client, "timeline_paid@apple.com", "tlpaid")
+    _, team_member = await _create_user(async_client, "timeline_team@apple.com", "tlteam")
+    query = """
+    INSERT INTO grades (user_id, creator_id, grade_variant, grade_variant_int)
+    VALUES (:user_id, :creator_id, CAST(:grade_variant AS grade_variant), 1)
+    """
+    for user, grade_variant in ((subscriber, "PAYED_SUBSCRIBED"), (team_member, "TEAM_CREATOR")):
+        values = {"user_id": user.id, "creator_id": creator.id, "grade_variant": grade_variant}
+        await database.execute(query, values)
+
+    task = await _create_and_fan_out_task(creator)
+
+    query = "SELECT user_id FROM timelines WHERE task_id=:task_id"
+    rows = await database.fetch_all(query, {"task_id": task.id})
+    assert [row["user_id"] for row in rows] == [subscriber.id]
+
+
+async def test_timeline_of_creator_with_fan_out_on_read(async_client, creator, subscriber, monkeypatch):
+    access_token, user = subscriber
+    auth_header = f"Bearer {access_token}"
+
+    monkeypatch.setattr(settings, "timeline_fanout_max_subscribers", 0)
+    task = await _create_and_fan_out_task(creator)
+
+    query = "SELECT count(*) FROM timelines WHERE task_id=:task_id"
+    assert await database.fetch_val(query, {"task_id": task.id}) == 0
+
+    response = await async_client.get("/feed/timeline", headers={"Authorization": auth_header})
+    assert response.status_code == HTTPStatus.OK, response.text
+    items = response.json()['items']
+    assert task.id in {item['id'] for item in items}
+    assert len({item['id'] for item in items}) == len(items), "Duplicates in timeline"
+
+
+async def test_timeline_while_unauthorized(async_client):
+    response = await async_client.get("/feed/timeline")
+    assert response.status_code == HTTPStatus.UNAUTHORIZED, response.text
@@ -0,0 +1,66 @@
+from http import HTTPStatus
+
+import pytest
+
+from app.db.models.hashtags.handlers import add_hashtags
+from app.db.models.tasks.task_handlers import create_task
+from app.db.models.users.handlers import create_user
+from app.schemas import CreateUser, GetUser, GetTaskNoForeigns, CreateTask
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(scope="module")
+async def creator(async_client) -> GetUser:
+    user_data = {
+        "username": "hashtagsfeed",
+        "password": "asdkadfs",
+        "email": "hashtagsfeed@apple.com",
+        "email_is_verified": True,
+    }
+    user, _ = await create_user(CreateUser.construct(**user_data))
+    return user
+
+
+async def _create_task_with_hashtags(creator: GetUser, hashtags: list[str]) -> GetTaskNoForeigns:
+    data = {"title": "Hello", "description": "Some description", "creator_id": creator.id}
+    task, _ = await create_task(CreateTask.construct(**data))
+    await add_hashtags(hashtags, task_id=task.id)
+    return task
+
+
+async def _get_feed_ids(async_client, query: str) -> list[str]:
+    ids = []
+    url = f"/feed/cursor?size=20&{query}"
+    while url:
+        response = await async_client.get(url)
+        assert response.status_code == HTTPStatus.OK, response.text
+        response_json = response.json()
+        ids.extend(task['id'] for task in response_json['items'])
+        next_cursor = response_json['next_cursor']
+        url = f"/feed/cursor?size=20&{query}&cursor={next_cursor}" if next_cursor else None
+    return ids
+
+
+async def test_feed_filtered_by_hashtags(async_client, creator: GetUser):
+    only_python = [await _create_task_with_hashtags(creator, ["python"]) for _ in range(21)]
+    python_and_sql = await _create_task_with_hashtags(creator, ["python", "sql"])
+    only_sql = await _create_task_with_hashtags(creator, ["sql"])
+    await _create_task_with_hashtags(creator, ["rust"])
+
+    ids = await _get_feed_ids(async_client, "hashtag=python")
+    assert len(ids) == len(set(ids)), "Duplicates in feed"
+    assert set(ids) == {task.id for task in only_python} | {python_and_sql.id}
+
+    ids = await _get_feed_ids(async_client, "hashtag=PYTHON&hashtag=sql&match=any")
+    assert set(ids) == {task.id for task in only_python} | {python_and_sql.id, only_sql.id}
+
+    ids = await _get_feed_ids(async_client, "hashtag=python&hashtag=sql&match=all")
+    assert ids == [python_and_sql.id]
+
+    assert await _get_feed_ids(async_client, "hashtag=unknown") == []
+
+
+async def test_feed_with_invalid_hashtag(async_client):
+    response = await async_client.get("/feed/cursor?hashtag=%23python")
+    assert response.status_code == HTTPStatus.BAD_REQUEST, response.text
@@ -2,9 +2,11 @@ from collections import Counter
 
 import pytest
 
-from app.db.models.hashtags.handlers import get_hashtags_for_task
+from app.api.tasks.task_routers import extract_hashtags_of_task
+from app.db.models.hashtags.handlers import add_hashtags, get_hashtags_for_task
 from app.db.models.hashtags.utils import extract_and_insert_hashtags
-from app.db.models.tasks.task_handlers import create_task
+from app.db.models.tasks.task_handlers import create_task, update_task
+from app.db.models.tasks.version import get_task_version
 from app.db.models.users.handlers import create_user
 from app.schemas import CreateUser, GetUser, GetTaskNoForeigns, CreateTask
 
@@ -59,3 +61,35 @@ async def test_hashtags_are_inserted(created_task: GetTaskNoForeigns):
     valid_hashtags = [tag.lower() for tag in _valid_hashtags]
 
     assert Counter(valid_hashtags) == Counter(hashtags_from_db)
+
+
+async def test_only_changed_hashtags_are_synced(created_task: GetTaskNoForeigns):
+    assert await add_hashtags(["swift", "apple", "apple"], task_id=created_task.id)
+    before = {tag.hashtag: tag.id for tag in (await get_hashtags_for_task(created_task.id)).hashtags}
+    assert set(before) == {"swift", "apple"}, "Duplicates must be inserted once"
+    version_before, _ = await get_task_version(created_task.id)
+
+    # nothing changed
+    assert not await add_hashtags(["apple", "swift"], task_id=created_task.id)
+    version, _ = await get_task_version(created_task.id)
+    assert version == version_before, "Version must not change if hashtags are the same"
+
+    assert await add_hashtags(["apple", "ios"], task_id=created_task.id)
+    after = {tag.hashtag: tag.id for tag in (await get_hashtags_for_task(created_task.id)).hashtags}
+    assert set(after) == {"apple", "ios"}
+    assert after["apple"] == before["apple"], "Unchanged hashtag must not be reinserted"
+    version, _ = await get_task_version(created_task.id)
+    assert version > version_before
+
+    assert await add_hashtags([], task_id=created_task.id)
+    assert (await get_hashtags_for_task(created_task.id)).hashtags == []
+
+
+async def test_stale_job_extracts_current_description(created_task: GetTaskNoForeigns):
+    await update_task(task_id=created_task.id, values={"description": "#new"})
+    await add_hashtags(["old"], task_id=created_task.id)
+
+    # job of previous description runs after the update
+    await extract_hashtags_of_task(created_task.id)
+    hashtags = (await get_hashtags_for_task(created_task.id)).hashtags
+    assert [tag.hashtag for tag in hashtags] == ["new"]
@@ -0,0 +1,143 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db.base import database
+from app.db.models.jobs.handlers import claim_jobs, release_jobs
+from app.jobs.queue import JobError, JobsQueue
+
+pytestmark = pytest.mark.asyncio
+
+
+def _make_queue(eager: bool = False) -> JobsQueue:
+    return JobsQueue(
+        concurrency=2,
+        poll_seconds=0.05,
+        lease_seconds=60,
+        max_attempts=2,
+        retry_base_seconds=30,
+        retry_max_seconds=60,
+        eager=eager,
+    )
+
+
+async def _get_job(job_id: str):
+    query = "SELECT attempts, run_at > now() AS delayed, last_error, failed_at FROM jobs WHERE id=:job_id"
+    return await database.fetch_one(query, {"job_id": job_id})
+
+
+async def test_payload_is_passed_to_handler():
+    calls = []
+
+    async def handler(task_id: str, created_at: datetime) -> None:
+        calls.append((task_id, created_at))
+
+    queue = _make_queue(eager=True)
+    kind = queue.register("test_payload", handler)
+
+    created_at = datetime.now(timezone.utc)
+    await queue.enqueue(kind, task_id="123", created_at=created_at)
+    assert calls == [("123", created_at)], "Payload must be decoded to annotated types"
+
+    with pytest.raises(ValueError):
+        queue.register("test_payload", handler)
+    with pytest.raises(ValueError):
+        await queue.enqueue("unknown_job")
+
+
+async def test_eager_job_errors():
+    async def broken() -> None:
+        raise RuntimeError("bug")
+
+    async def failing() -> None:
+        raise JobError("mailgun is down")
+
+    queue = _make_queue(eager=True)
+    broken_kind = queue.register("test_eager_broken", broken)
+    failing_kind = queue.register("test_eager_failing", failing)
+
+    with pytest.raises(RuntimeError):
+        await queue.enqueue(broken_kind)
+    # can't be retried, only logged
+    await queue.enqueue(failing_kind)
+    assert queue.stats()["failed"] == 2
+
+
+async def test_job_is_claimed_once():
+    async def handler() -> None:
+        pass
+
+    queue = _make_queue()
+    kind = queue.register("test_claimed_once", handler)
+    await queue.enqueue(kind)
+
+    jobs = await claim_jobs(10, lease_seconds=60)
+    assert [job.kind for job in jobs] == [kind]
+    assert jobs[0].attempts == 1
+    assert await claim_jobs(10, lease_seconds=60) == [], "Claimed job is leased"
+
+    await release_jobs([jobs[0].id])
+    jobs_again = await claim_jobs(10, lease_seconds=60)
+    assert [job.id for job in jobs_again] == [jobs[0].id]
+    assert jobs_again[0].attempts == 1, "Released attempt must not be counted"
+
+    await queue._run(jobs_again[0])
+    assert await _get_job(jobs[0].id) is None, "Done job must be deleted"
+
+
+async def test_failed_job_is_retried_with_backoff():
+    async def handler() -> None:
+        raise JobError("mailgun is down")
+
+    queue = _make_queue()
+    kind = queue.register("test_retried", handler)
+    await queue.enqueue(kind)
+
+    [job] = await claim_jobs(10, lease_seconds=60)
+    await queue._run(job)
+    row = await _get_job(job.id)
+    assert row["attempts"] == 1 and row["delayed"] and row["failed_at"] is None
+    assert "mailgun is down" in row["last_error"]
+    assert await claim_jobs(10, lease_seconds=60) == [], "Retry must be delayed"
+
+    # last attempt
+    await database.execute("UPDATE jobs SET run_at = now() WHERE id=:job_id", {"job_id": job.id})
+    [job] = await claim_jobs(10, lease_seconds=60)
+    await queue._run(job)
+    row = await _get_job(job.id)
+    assert row["attempts"] == 2 and row["failed_at"] is not None
+
+    await database.execute("UPDATE jobs SET run_at = now() WHERE id=:job_id", {"job_id": job.id})
+    assert await claim_jobs(10, lease_seconds=60) == [], "Failed job must not be claimed"
+    assert queue.stats()["retried"] == 1 and queue.stats()["failed"] == 1
+
+
+async def test_worker_runs_jobs_and_drains_on_stop():
+    done = asyncio.Event()
+    started = asyncio.Event()
+
+    async def quick() -> None:
+        done.set()
+
+    async def slow() -> None:
+        started.set()
+        await asyncio.sleep(60)
+
+    queue = _make_queue()
+    quick_kind = queue.register("test_quick", quick)
+    slow_kind = queue.register("test_slow", slow)
+    queue.start()
+
+    await queue.enqueue(quick_kind)
+    await asyncio.wait_for(done.wait(), timeout=5)
+
+    await queue.enqueue(slow_kind)
+    await asyncio.wait_for(started.wait(), timeout=5)
+    await queue.stop(drain_timeout=0.1)
+
+    assert queue.stats()["running"] == 0
+    assert queue.stats()["succeeded"] == 1
+    # interrupted job is returned to queue without counting the attempt
+    [job] = await claim_jobs(10, lease_seconds=60)
+    assert job.kind == slow_kind and job.attempts == 1
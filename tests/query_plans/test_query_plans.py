@@ -0,0 +1,200 @@
+"""
+Plans of queries run by read handlers mustn't contain sequential scans.
+Tables are tiny here, so seq scans are disabled: planner picks one anyway
+only if there is no index for the query.
+"""
+from typing import Any
+
+import pytest
+from databases.backends.postgres import PostgresConnection
+
+from app.db.base import database
+from app.db.models.hashtags.handlers import add_hashtags, get_hashtags_for_task
+from app.db.models.tasks.comment_handlers import (
+    COMMENT_EXISTS,
+    GET_TASK_COMMENT,
+    add_comment_to_task,
+    get_comments_for_task_json,
+)
+from app.db.models.tasks.cursor import FeedCursor
+from app.db.models.tasks.task_handlers import (
+    GET_TASK_BY_ID,
+    create_task,
+    get_feed_tasks_by_cursor,
+    get_feed_tasks_json,
+    get_task_detail_json,
+    get_total_counf_of_tasks,
+    search_tasks,
+)
+from app.db.models.tasks.version import get_task_version
+from app.db.models.timelines.handlers import fan_out_task, get_timeline_tasks
+from app.db.models.users.handlers import (
+    EMAIL_EXISTS,
+    GET_USER_BY_EMAIL,
+    GET_USER_BY_ID,
+    USERNAME_EXISTS,
+    create_user,
+    get_user_by_username,
+)
+from app.db.prepared import prepared_queries
+from app.schemas import (
+    CreateTask,
+    CreateTaskComment,
+    CreateUser,
+    GetTaskComment,
+    GetTaskNoForeigns,
+    GetUser,
+)
+from app.types import HashtagsMatch
+
+pytestmark = pytest.mark.asyncio
+
+Seeded = tuple[GetUser, GetUser, list[GetTaskNoForeigns], GetTaskComment]
+
+
+@pytest.fixture(scope="module")
+async def seeded(connect_db) -> Seeded:
+    # reverted with the rest of module's transaction
+    await database.execute("SET LOCAL enable_seqscan = off")
+
+    users = []
+    for name in ("plans_creator", "plans_subscriber"):
+        user_data = {
+            "username": name,
+            "password": "-",
+            "email": f"{name}@apple.com",
+            "email_is_verified": True,
+        }
+        user, _ = await create_user(CreateUser.construct(**user_data))
+        users.append(user)
+    creator, subscriber = users
+
+    query = """
+    INSERT INTO grades (user_id, creator_id, grade_variant, grade_variant_int)
+    VALUES (:user_id, :creator_id, 'SUBSCRIBED', 1)
+    """
+    await database.execute(query, {"user_id": subscriber.id, "creator_id": creator.id})
+
+    tasks = []
+    for i in range(30):
+        data = {"title": f"Plans task {i}", "description": "Plans", "creator_id": creator.id}
+        task, _ = await create_task(CreateTask.construct(**data))
+        await add_hashtags(["plans", f"plans{i % 3}"], task_id=task.id)
+        await fan_out_task(task.id, creator_id=creator.id, created_at=task.created_at)
+        tasks.append(task)
+
+    comment = None
+    for i in range(5):
+        comment_data = {"content": f"Comment {i}", "task_id": tasks[0].id, "user_id": subscriber.id}
+        comment, _ = await add_comment_to_task(CreateTaskComment.construct(**comment_data))
+
+    return creator, subscriber, tasks, comment
+
+
+@pytest.fixture
+def captured_queries(monkeypatch) -> list[tuple[str, list[Any]]]:
+    """
+    SQL and arguments of every SELECT sent through databases.
+    """
+    captured = []
+    compile_query = PostgresConnection._compile
+
+    def _compile(self, query):
+        query_str, args, result_map = compile_query(self, query)
+        if query_str.lstrip().upper().startswith(("SELECT", "WITH")):
+            captured.append((query_str, args))
+        return query_str, args, result_map
+
+    monkeypatch.setattr(PostgresConnection, "_compile", _compile)
+    return captured
+
+
+async def _explain(sql: str, args: list[Any]) -> str:
+    connection = database.connection()
+    async with connection:
+        rows = await connection.raw_connection.fetch(f"EXPLAIN {sql}", *args)
+    return "\n".join(row[0] for row in rows)
+
+
+async def _assert_no_seq_scans(queries: list[tuple[str, list[Any]]]) -> None:
+    assert queries, "No queries were captured"
+    for sql, args in queries:
+        plan = await _explain(sql, args)
+        assert "Seq Scan" not in plan, f"{sql}\n{plan}"
+
+
+async def test_feed(seeded: Seeded, captured_queries):
+    # count of all tasks is a full scan by nature, it's cached
+    await get_total_counf_of_tasks()
+    captured_queries.clear()
+
+    await get_feed_tasks_json(page=2, size=20)
+    await _assert_no_seq_scans(captured_queries)
+
+
+async def test_feed_by_cursor(seeded: Seeded, captured_queries):
+    _, _, tasks, _ = seeded
+    cursor = FeedCursor(created_at=tasks[10].created_at, id=tasks[10].id)
+
+    await get_feed_tasks_by_cursor(None, size=20)
+    await get_feed_tasks_by_cursor(cursor, size=20)
+    await get_feed_tasks_by_cursor(cursor, size=20, hashtags=["plans1"])
+    await get_feed_tasks_by_cursor(
+        None, size=20, hashtags=["plans", "plans2"], match=HashtagsMatch.ALL
+    )
+    await _assert_no_seq_scans(captured_queries)
+
+
+async def test_search(seeded: Seeded, captured_queries):
+    await search_tasks("plans task", None, size=20)
+    await _assert_no_seq_scans(captured_queries)
+
+
+async def test_task(seeded: Seeded, captured_queries):
+    creator, subscriber, tasks, _ = seeded
+
+    await get_task_version(tasks[0].id)
+    await get_task_detail_json(tasks[0].id, viewer_id=creator.id)
+    await get_task_detail_json(tasks[0].id, viewer_id=subscriber.id)
+    await get_hashtags_for_task(tasks[0].id)
+    await _assert_no_seq_scans(captured_queries)
+
+
+async def test_comments(seeded: Seeded, captured_queries):
+    _, _, tasks, _ = seeded
+
+    await get_comments_for_task_json(tasks[0].id, page=1, size=20)
+    await _assert_no_seq_scans(captured_queries)
+
+
+async def test_timeline(seeded: Seeded, captured_queries):
+    _, subscriber, tasks, _ = seeded
+    cursor = FeedCursor(created_at=tasks[10].created_at, id=tasks[10].id)
+
+    await get_timeline_tasks(subscriber.id, None, size=20)
+    await get_timeline_tasks(subscriber.id, cursor, size=20)
+    await _assert_no_seq_scans(captured_queries)
+
+
+async def test_users(seeded: Seeded, captured_queries):
+    creator, _, _, _ = seeded
+
+    await get_user_by_username(creator.username)
+    await _assert_no_seq_scans(captured_queries)
+
+
+async def test_prepared_queries(seeded: Seeded):
+    creator, _, tasks, comment = seeded
+    args = {
+        GET_USER_BY_ID: creator.id,
+        GET_USER_BY_EMAIL: creator.email,
+        USERNAME_EXISTS: creator.username,
+        EMAIL_EXISTS: creator.email,
+        GET_TASK_BY_ID: tasks[0].id,
+        GET_TASK_COMMENT: comment.id,
+        COMMENT_EXISTS: comment.id,
+    }
+    # every registered query must be checked
+    assert set(args) == set(prepared_queries.stats())
+
+    await _assert_no_seq_scans([(prepared_queries.sql(name), [arg]) for name, arg in args.items()])
@@ -0,0 +1,72 @@
+import pytest
+
+from app.db.base import database
+from app.db.models.tasks.task_handlers import create_task
+from app.db.models.tasks.comment_handlers import (
+    add_comment_to_task,
+    delete_task_comment,
+    get_total_count_of_comment_for_task,
+    reconcile_comments_counters,
+)
+from app.db.models.users.handlers import create_user
+from app.schemas import GetUser, CreateUser, GetTaskNoForeigns, CreateTask, \
+    CreateTaskComment
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(scope="module")
+async def user(async_client) -> GetUser:
+    user_data = {
+        "first_name": "Steve",
+        "last_name": "Jobs",
+        "username": "countercomments",
+        "password": "asdkadfs",
+        "email": "counter@apple.com",
+        "email_is_verified": True,
+    }
+    user, _ = await create_user(CreateUser.construct(**user_data))
+    return user
+
+
+@pytest.fixture(scope="function")
+async def created_task(user: GetUser) -> GetTaskNoForeigns:
+    data = {
+        "title": "Hello",
+        "description": "Some description",
+        "creator_id": user.id,
+    }
+    task, _ = await create_task(CreateTask.construct(**data))
+    return task
+
+
+async def test_counter_is_maintained_on_write(user: GetUser, created_task: GetTaskNoForeigns):
+    assert await get_total_count_of_comment_for_task(created_task.id) == 0
+
+    comments = []
+    for i in range(3):
+        comment, _ = await add_comment_to_task(
+            CreateTaskComment(content=f"content_{i}", task_id=created_task.id, user_id=user.id)
+        )
+        comments.append(comment)
+    assert await get_total_count_of_comment_for_task(created_task.id) == 3
+
+    await delete_task_comment(comments[0].id)
+    assert await get_total_count_of_comment_for_task(created_task.id) == 2
+
+    # deleting already deleted comment doesn't change counter
+    await delete_task_comment(comments[0].id)
+    assert await get_total_count_of_comment_for_task(created_task.id) == 2
+
+
+async def test_reconcile_drifted_counter(user: GetUser, created_task: GetTaskNoForeigns):
+    await add_comment_to_task(
+        CreateTaskComment(content="content", task_id=created_task.id, user_id=user.id)
+    )
+    await database.execute(
+        "UPDATE tasks SET n_comments = 42 WHERE id=:task_id", {"task_id": created_task.id}
+    )
+
+    assert await reconcile_comments_counters() == 1
+    assert await get_total_count_of_comment_for_task(created_task.id) == 1
+    assert await reconcile_comments_counters() == 0
@@ -2,13 +2,14 @@ import asyncio
 from http import HTTPStatus
 
 import pytest
+from fastapi_pagination import Page
 
 from app.api.auth.password_utils import get_password_hash
 from app.db.models.tasks.task_handlers import create_task
 from app.db.models.tasks.comment_handlers import add_comment_to_task
 from app.db.models.users.handlers import create_user
 from app.schemas import GetUser, CreateUser, GetTaskNoForeigns, CreateTask, \
-    CreateTaskComment
+    CreateTaskComment, GetPaginatedTaskComment, UserComment
 
 pytestmark = pytest.mark.asyncio
 
@@ -190,3 +191,21 @@ async def test_cant_get_comments_while_unauthorized(async_client, task_with_20_c
     for task in (task_without_comments, task_with_one_comment, task_with_20_comments):
         response = await async_client.get(f"/tasks/{task.id}/comments")
         assert response.status_code == HTTPStatus.UNAUTHORIZED, response.text
+
+
+async def test_comments_page_conforms_to_schema(async_client, access_token_and_user, task_with_20_comments):
+    """
+    Page of comments is built by DB and returned without validation
+    """
+    access_token, _ = access_token_and_user
+    auth_header = f"Bearer {access_token}"
+
+    url = f"/tasks/{task_with_20_comments.id}/comments?size=10"
+    response = await async_client.get(url, headers={"Authorization": auth_header})
+    assert response.status_code == 200, response.text
+
+    page = Page[GetPaginatedTaskComment].parse_raw(response.content)
+    assert len(page.items) == 10
+    for comment in response.json()['items']:
+        assert set(comment) == set(GetPaginatedTaskComment.__fields__)
+        assert set(comment['user']) == set(UserComment.__fields__)
@@ -4,11 +4,16 @@ from http import HTTPStatus
 import pytest
 
 from app.api.auth.password_utils import get_password_hash
+from app.config import settings
+from app.db.base import database
 from app.db.models.hashtags.handlers import add_hashtags, get_hashtags_for_task
+from app.db.models.tasks.purge import purge_deleted_task
 from app.db.models.tasks.task_handlers import create_task, get_task_by_id
+from app.db.models.tasks.version import get_task_version
 from app.db.models.tasks.comment_handlers import add_comment_to_task, \
-    get_total_count_of_comment_for_task
+    get_task_comment, get_total_count_of_comment_for_task
 from app.db.models.users.handlers import create_user
+from app.jobs.queue import jobs_queue
 from app.schemas import GetUser, CreateUser, CreateTask, GetTaskNoForeigns, \
     CreateTaskComment
 
@@ -116,6 +121,48 @@ async def test_success_delete(async_client, access_token_and_user, task: GetTask
     assert total_comments == 0, "Comments are not deleted"
 
 
+async def test_soft_delete_of_task_with_many_comments(
+    async_client, access_token_and_user, task: GetTaskNoForeigns, monkeypatch
+):
+    monkeypatch.setattr(settings, "tasks_soft_delete_min_comments", len(COMMENTS))
+    monkeypatch.setattr(settings, "tasks_purge_batch_size", 1)
+    # purge job is only enqueued, there are no workers in tests
+    monkeypatch.setattr(jobs_queue, "eager", False)
+    access_token, _ = access_token_and_user
+    auth_header, url = f"Bearer {access_token}", f"/tasks/{task.id}"
+
+    response = await async_client.delete(url, headers={"Authorization": auth_header})
+    assert response.status_code == 200
+
+    # task is hidden at once
+    assert await get_task_by_id(task.id) is None
+    assert await get_task_version(task.id) is None
+    assert await get_total_count_of_comment_for_task(task.id) == 0
+
+    response = await async_client.get(url, headers={"Authorization": auth_header})
+    assert response.status_code == HTTPStatus.NOT_FOUND
+
+    # its comments are hidden and new ones aren't added
+    query = "SELECT id FROM tasks_comments WHERE task_id=:task_id LIMIT 1"
+    comment_id = await database.fetch_val(query, {"task_id": task.id})
+    assert await get_task_comment(comment_id) is None
+
+    _, user = access_token_and_user
+    params = CreateTaskComment(content="late", task_id=task.id, user_id=user.id)
+    comment, err = await add_comment_to_task(create_comment_params=params)
+    assert comment is None and err
+
+    await purge_deleted_task(task.id)
+
+    values = {"task_id": task.id}
+    for query in (
+        "SELECT count(*) FROM tasks WHERE id=:task_id",
+        "SELECT count(*) FROM tasks_comments WHERE task_id=:task_id",
+        "SELECT count(*) FROM hashtags WHERE task_id=:task_id",
+    ):
+        assert await database.fetch_val(query, values) == 0, f"Not purged: {query}"
+
+
 async def test_delete_while_unauthorized(
     async_client, access_token_and_user, task: GetTaskNoForeigns
 ):
@@ -5,6 +5,7 @@ from uuid import uuid4
 import pytest
 
 from app.api.auth.password_utils import get_password_hash
+from app.db.models.hashtags.handlers import add_hashtags
 from app.db.models.tasks.task_handlers import create_task
 from app.db.models.tasks.comment_handlers import add_comment_to_task
 from app.db.models.users.handlers import create_user
@@ -162,6 +163,32 @@ async def test_success_get_by_user(
         assert json_response['suggested_by'] is None, "Regular user cant see suggested_by info"
 
 
+async def test_get_task_with_hashtags(
+    async_client, access_token_and_creator: tuple[str, GetUser],
+    access_token_and_user: tuple[str, GetUser], created_task: GetTaskNoForeigns
+):
+    creator_token, _ = access_token_and_creator
+    user_token, user = access_token_and_user
+    url = f"/tasks/{created_task.id}"
+
+    response = await async_client.get(url, headers={"Authorization": f"Bearer {creator_token}"})
+    assert response.status_code == HTTPStatus.OK, response.text
+    assert response.json()['hashtags'] == []
+
+    await add_hashtags(["swift", "apple"], task_id=created_task.id)
+    response = await async_client.get(url, headers={"Authorization": f"Bearer {creator_token}"})
+    json_response = response.json()
+    assert json_response['hashtags'] == ["apple", "swift"]
+    assert json_response['assignee_id'] == user.id
+    assert json_response['suggested_by_id'] == user.id
+
+    response = await async_client.get(url, headers={"Authorization": f"Bearer {user_token}"})
+    json_response = response.json()
+    assert json_response['hashtags'] == ["apple", "swift"]
+    assert json_response['assignee_id'] is None
+    assert json_response['suggested_by_id'] is None
+
+
 async def test_get_non_existing_task(async_client, access_token_and_user: tuple[str, GetUser]):
     access_token, _ = access_token_and_user
     auth_header = f"Bearer {access_token}"
@@ -179,3 +206,40 @@ async def test_with_wrong_auth_token(async_client, access_token_and_creator, cre
     headers = {"Authorization": "some token"}
     response = await async_client.get(f"/tasks/{created_task.id}", headers=headers)
     assert response.status_code == HTTPStatus.UNAUTHORIZED, response.text
+
+
+async def test_get_task_not_modified(
+    async_client,
+    access_token_and_creator: tuple[str, GetUser],
+    access_token_and_user: tuple[str, GetUser],
+    created_task: GetTaskNoForeigns,
+):
+    creator_token, creator = access_token_and_creator
+    user_token, _ = access_token_and_user
+    url = f"/tasks/{created_task.id}"
+
+    response = await async_client.get(url, headers={"Authorization": f"Bearer {creator_token}"})
+    assert response.status_code == HTTPStatus.OK, response.text
+    etag = response.headers["ETag"]
+
+    headers = {"Authorization": f"Bearer {creator_token}", "If-None-Match": etag}
+    response = await async_client.get(url, headers=headers)
+    assert response.status_code == HTTPStatus.NOT_MODIFIED, response.text
+    assert response.headers["ETag"] == etag
+    assert not response.content
+
+    # other user sees less fields, so etag is different
+    headers = {"Authorization": f"Bearer {user_token}", "If-None-Match": etag}
+    response = await async_client.get(url, headers=headers)
+    assert response.status_code == HTTPStatus.OK, response.text
+
+    # new comment changes the task
+    await add_comment_to_task(
+        create_comment_params=CreateTaskComment(
+            content="new", task_id=created_task.id, user_id=creator.id
+        )
+    )
+    headers = {"Authorization": f"Bearer {creator_token}", "If-None-Match": etag}
+    response = await async_client.get(url, headers=headers)
+    assert response.status_code == HTTPStatus.OK, response.text
+    assert response.headers["ETag"] != etag
@@ -0,0 +1,70 @@
+from http import HTTPStatus
+
+import pytest
+
+from app.db.models.tasks.task_handlers import create_task
+from app.db.models.users.handlers import create_user
+from app.schemas import CreateUser, GetUser, GetTaskNoForeigns, CreateTask
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(scope="module")
+async def creator(async_client) -> GetUser:
+    user_data = {
+        "username": "searchcreator",
+        "password": "asdkadfs",
+        "email": "searchcreator@apple.com",
+        "email_is_verified": True,
+    }
+    user, _ = await create_user(CreateUser.construct(**user_data))
+    return user
+
+
+async def _create_task(creator: GetUser, title: str, description: str) -> GetTaskNoForeigns:
+    data = {"title": title, "description": description, "creator_id": creator.id}
+    task, _ = await create_task(CreateTask.construct(**data))
+    return task
+
+
+async def test_search_by_title_and_description(async_client, creator: GetUser):
+    in_title = await _create_task(creator, "Record guitar cover", "Some description")
+    in_both = await _create_task(creator, "Guitar stream", "Play guitar with chat, guitar solo")
+    in_description = await _create_task(creator, "Stream", "Maybe some guitar")
+    await _create_task(creator, "Cooking", "Make a pie")
+
+    response = await async_client.get("/tasks/search?q=guitar")
+    assert response.status_code == HTTPStatus.OK, response.text
+    response_json = response.json()
+
+    ids = [task['id'] for task in response_json['items']]
+    assert set(ids) == {in_title.id, in_both.id, in_description.id}
+    # the most relevant is first
+    assert ids[0] == in_both.id
+    assert response_json['next_cursor'] is None
+
+    response = await async_client.get("/tasks/search?q=guitar -stream")
+    ids = [task['id'] for task in response.json()['items']]
+    assert ids == [in_title.id]
+
+
+async def test_search_pagination(async_client, creator: GetUser):
+    tasks = [await _create_task(creator, "Piano", f"Piano lesson {i}") for i in range(25)]
+
+    seen_ids = []
+    url = "/tasks/search?q=piano&size=20"
+    while url:
+        response = await async_client.get(url)
+        assert response.status_code == HTTPStatus.OK, response.text
+        response_json = response.json()
+        seen_ids.extend(task['id'] for task in response_json['items'])
+        next_cursor = response_json['next_cursor']
+        url = f"/tasks/search?q=piano&size=20&cursor={next_cursor}" if next_cursor else None
+
+    assert len(seen_ids) == len(set(seen_ids)), "Duplicates in search results"
+    assert set(seen_ids) == {task.id for task in tasks}
+
+
+async def test_search_with_invalid_cursor(async_client):
+    response = await async_client.get("/tasks/search?q=piano&cursor=invalid")
+    assert response.status_code == HTTPStatus.BAD_REQUEST, response.text
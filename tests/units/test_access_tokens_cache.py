@@ -0,0 +1,38 @@
+import pytest
+
+from app.api.auth.cache import access_tokens_cache
+from app.api.auth.utils import create_access_token, get_email_from_access_token
+from app.api.errors import AccessTokenExpired, InvalidAccessToken
+
+EMAIL = "cached@apple.com"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    access_tokens_cache.clear()
+
+
+def test_verified_token_is_cached():
+    token = create_access_token(email=EMAIL)
+
+    misses = access_tokens_cache.misses
+    assert get_email_from_access_token(token) == EMAIL
+    assert access_tokens_cache.misses == misses + 1
+
+    hits = access_tokens_cache.hits
+    assert get_email_from_access_token(token) == EMAIL
+    assert access_tokens_cache.hits == hits + 1
+
+
+def test_invalid_tokens_are_not_cached():
+    expired_token = create_access_token(email=EMAIL, expires_minutes=-1)
+    for _ in range(2):
+        with pytest.raises(AccessTokenExpired):
+            get_email_from_access_token(expired_token)
+
+    tampered_token = create_access_token(email=EMAIL)[:-2] + "xx"
+    for _ in range(2):
+        with pytest.raises(InvalidAccessToken):
+            get_email_from_access_token(tampered_token)
+
+    assert len(access_tokens_cache) == 0
@@ -0,0 +1,23 @@
+from app.bloom import BloomFilter
+
+
+def test_no_false_negatives():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    values = [f"user{i}@apple.com" for i in range(1000)]
+    for value in values:
+        bloom.add(value)
+
+    assert all(value in bloom for value in values)
+    assert bloom.n_added == 1000
+
+
+def test_false_positive_rate():
+    bloom = BloomFilter(capacity=1000, error_rate=0.01)
+    for i in range(1000):
+        bloom.add(f"user{i}@apple.com")
+
+    n_checks = 10_000
+    false_positives = sum(f"other{i}@apple.com" in bloom for i in range(n_checks))
+    # some slack over expected 1%
+    assert false_positives / n_checks < 0.03
+    assert 0.005 < bloom.expected_error_rate < 0.015
@@ -0,0 +1,88 @@
+import asyncio
+import time
+
+import pytest
+
+from app.cache import AsyncSWRCache, TTLCache
+
+
+def test_lru_eviction():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+
+    # "a" becomes most recently used
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.evictions == 1
+
+
+def test_entry_expires():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=0.01)
+    cache.put("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert cache.misses == 1
+
+
+def test_value_loaded_before_invalidation_is_not_stored():
+    cache: TTLCache[str, int] = TTLCache(maxsize=2, ttl=60)
+
+    generation = cache.generation
+    cache.clear()
+    cache.put("a", 1, generation=generation)
+    assert cache.get("a") is None
+
+    cache.put("a", 2, generation=cache.generation)
+    assert cache.get("a") == 2
+    assert cache.stats()["hit_ratio"] == 0.5
+
+
+@pytest.mark.asyncio
+async def test_concurrent_misses_share_one_load():
+    cache: AsyncSWRCache[str, int] = AsyncSWRCache(maxsize=2, ttl=60, stale_ttl=60)
+    n_loads = 0
+
+    async def loader() -> int:
+        nonlocal n_loads
+        n_loads += 1
+        await asyncio.sleep(0.01)
+        return n_loads
+
+    results = await asyncio.gather(*(cache.get_or_load("a", loader) for _ in range(10)))
+    assert results == [1] * 10
+    assert n_loads == 1
+    assert cache.misses == 1
+    assert cache.coalesced == 9
+
+    assert await cache.get_or_load("a", loader) == 1
+    assert cache.hits == 1
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_one_refresh_runs():
+    cache: AsyncSWRCache[str, int] = AsyncSWRCache(maxsize=2, ttl=60, stale_ttl=60)
+    n_loads = 0
+
+    async def loader() -> int:
+        nonlocal n_loads
+        n_loads += 1
+        await asyncio.sleep(0.01)
+        return n_loads
+
+    await cache.get_or_load("a", loader)
+    cache.invalidate()
+
+    # burst of readers after invalidation gets stale value and triggers one refresh
+    results = await asyncio.gather(*(cache.get_or_load("a", loader) for _ in range(10)))
+    assert results == [1] * 10
+    assert cache.stale_hits == 10
+    assert cache.refreshes == 1
+
+    await asyncio.sleep(0.05)
+    assert await cache.get_or_load("a", loader) == 2
+    assert n_loads == 2
@@ -0,0 +1,93 @@
+import asyncio
+
+import pytest
+
+from app.api.errors import DatabaseOverloaded
+from app.db.metrics import InstrumentedPool, PoolMetrics, handlers_durations, timed
+from app.metrics import Histogram
+
+
+class _Pool:
+    """
+    Pool with one connection, acquire waits until it's released.
+    """
+
+    def __init__(self) -> None:
+        self._free = asyncio.Semaphore(1)
+
+    async def acquire(self, timeout: float | None = None) -> str:
+        await asyncio.wait_for(self._free.acquire(), timeout)
+        return "connection"
+
+    async def release(self, connection: str) -> None:
+        self._free.release()
+
+    def get_size(self) -> int:
+        return 1
+
+    def get_idle_size(self) -> int:
+        return 1 if not self._free.locked() else 0
+
+    def get_min_size(self) -> int:
+        return 1
+
+    def get_max_size(self) -> int:
+        return 1
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(0.001, 0.01, 0.1))
+    for value in (0.0005, 0.005, 0.005, 0.05, 1.0):
+        histogram.observe(value)
+
+    stats = histogram.stats()
+    assert stats["count"] == 5
+    assert stats["buckets"] == {"le_1ms": 1, "le_10ms": 3, "le_100ms": 4, "le_inf": 5}
+    assert stats["p50_ms"] == 10
+    assert stats["p99_ms"] == stats["max_ms"] == 1000
+
+
+def test_histogram_buckets_must_be_sorted():
+    with pytest.raises(ValueError):
+        Histogram(buckets=(0.1, 0.01))
+
+
+@pytest.mark.asyncio
+async def test_pool_acquire_is_measured():
+    metrics = PoolMetrics()
+    pool = _Pool()
+    instrumented = InstrumentedPool(pool, metrics, acquire_timeout=1)  # type: ignore
+    metrics.pool = pool  # type: ignore
+
+    connection = await instrumented.acquire()
+    assert metrics.stats()["in_use"] == 1
+    await instrumented.release(connection)
+
+    stats = metrics.stats()
+    assert stats["acquired"] == 1
+    assert stats["in_use"] == 0 and stats["idle"] == 1
+    assert stats["acquire_wait"]["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_pool_acquire_timeout():
+    metrics = PoolMetrics()
+    instrumented = InstrumentedPool(_Pool(), metrics, acquire_timeout=0.01)  # type: ignore
+
+    await instrumented.acquire()
+    with pytest.raises(DatabaseOverloaded):
+        await instrumented.acquire()
+
+    assert metrics.timeouts == 1
+    assert metrics.waiting == 0
+    assert metrics.acquire_wait.count == 2
+
+
+@pytest.mark.asyncio
+async def test_handler_durations():
+    @timed
+    async def some_handler() -> int:
+        return 1
+
+    assert await some_handler() == 1
+    assert handlers_durations[f"{__name__}.some_handler"].count == 1
@@ -0,0 +1,135 @@
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from app.db.hydration import hydrate
+from app.schemas import (
+    GetTask,
+    GetTaskComment,
+    GetTaskNoForeigns,
+    GetUser,
+    TaskFeed,
+    UserTask,
+)
+from app.types import TaskStatus
+
+CREATED_AT = datetime(2023, 4, 1, 12, 30, 15, 123456, tzinfo=timezone.utc)
+USER_ID = "7c5b6f1e-3b8a-4c47-9a4e-6a1d2f0b9c31"
+TASK_ID = "1f0e8b2d-6c4a-4d5e-8f7a-9b3c2d1e0f4a"
+
+USER_ROW = {
+    "id": USER_ID,
+    "first_name": "Steve",
+    "last_name": "Jobs",
+    "username": "svjobs",
+    "password": "$2b$12$somehashofpasswordsomehashofpasswordsomehashofpassw",
+    "avatar_url": "https://apple.com/steve.jpg",
+    "email": "svjobs@apple.com",
+    "receive_email_alerts": True,
+    "email_is_verified": True,
+    "email_verified_at": CREATED_AT,
+    "created_at": CREATED_AT,
+}
+
+TASK_ROW = {
+    "id": TASK_ID,
+    "title": "Some task",
+    "description": "Description of #some task",
+    "due_to_date": None,
+    "status": "IN_PROGRESS",
+    "creator_id": USER_ID,
+    "suggested_by_id": None,
+    "assignee_id": USER_ID,
+    "assigned_at": CREATED_AT,
+    "created_at": CREATED_AT,
+    "n_comments": 3,
+    "version": 42,
+}
+
+COMMENT_ROW = {
+    "id": "0a9b8c7d-6e5f-4a3b-2c1d-0e9f8a7b6c5d",
+    "content": "Some comment",
+    "task_id": TASK_ID,
+    "user_id": USER_ID,
+    "edited": True,
+    "edited_at": CREATED_AT,
+    "created_at": CREATED_AT,
+}
+
+_USER_JSON = json.dumps({"id": USER_ID, "username": "svjobs", "avatar_url": None})
+
+JOINED_TASK_ROW = {
+    key: TASK_ROW[key]
+    for key in (
+        "id",
+        "creator_id",
+        "title",
+        "description",
+        "status",
+        "due_to_date",
+        "assigned_at",
+        "created_at",
+        "n_comments",
+    )
+} | {"creator": _USER_JSON, "assignee": _USER_JSON, "suggested_by": None}
+
+FEED_TASK = json.loads(
+    json.dumps(
+        {
+            "id": TASK_ID,
+            "title": "Some task",
+            "description": None,
+            "created_at": CREATED_AT.isoformat(),
+            "status": "IDEA",
+            "n_comments": 0,
+            "creator": {"id": USER_ID, "username": "svjobs", "avatar_url": None},
+        }
+    )
+)
+
+
+@pytest.mark.parametrize(
+    "model, row",
+    [
+        (GetUser, USER_ROW),
+        (GetTaskNoForeigns, TASK_ROW),
+        (GetTaskComment, COMMENT_ROW),
+        (GetTask, JOINED_TASK_ROW),
+        (TaskFeed, FEED_TASK),
+    ],
+)
+def test_same_as_parse_obj(model, row):
+    hydrated = hydrate(model, row)
+    parsed = model.parse_obj(row)
+
+    assert hydrated == parsed
+    assert hydrated.__fields_set__ == parsed.__fields_set__
+    assert hydrated.dict(exclude_unset=True) == parsed.dict(exclude_unset=True)
+    assert hydrated.json() == parsed.json()
+
+
+def test_types_are_converted():
+    task = hydrate(GetTask, JOINED_TASK_ROW)
+
+    assert task.status is TaskStatus.IN_PROGRESS
+    assert isinstance(task.creator, UserTask)
+    assert task.assignee == UserTask(id=USER_ID, username="svjobs", avatar_url=None)
+    assert task.suggested_by is None
+
+
+def test_datetime_from_string():
+    row = COMMENT_ROW | {"created_at": CREATED_AT.isoformat(), "edited_at": None}
+    comment = hydrate(GetTaskComment, row)
+
+    assert comment.created_at == CREATED_AT
+    assert comment.edited_at is None
+
+
+def test_missing_fields_get_defaults():
+    task = hydrate(
+        GetTaskNoForeigns, {k: v for k, v in TASK_ROW.items() if k != "status"}
+    )
+
+    assert task.status == TaskStatus.IDEA
+    assert "status" not in task.__fields_set__
@@ -1,4 +1,13 @@
-from app.api.auth.password_utils import get_password_hash, passwords_are_equal
+import asyncio
+
+import pytest
+
+from app.api.auth.password_utils import (
+    get_password_hash,
+    passwords_are_equal,
+    PasswordHashingPool,
+)
+from app.api.errors import PasswordHashingOverloaded
 
 PASSWORD = "hello_world"
 
@@ -18,3 +27,37 @@ def test_password_is_defferent_after_hashing():
 def test_passwords_are_equal():
     hashed_password = get_password_hash(PASSWORD)
     assert passwords_are_equal(PASSWORD, hashed_password)
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool():
+    pool = PasswordHashingPool(max_workers=2, max_queue=10)
+
+    hashed_password = await pool.hash_password(PASSWORD)
+    assert passwords_are_equal(PASSWORD, hashed_password)
+    assert await pool.verify_password(PASSWORD, hashed_password)
+    assert not await pool.verify_password("wrong_password", hashed_password)
+
+    stats = pool.stats()
+    assert stats["calls"] == 3
+    assert stats["rejected"] == 0
+    assert stats["in_progress"] == stats["waiting"] == 0
+    pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hashing_pool_rejects_over_max_queue():
+    pool = PasswordHashingPool(max_workers=1, max_queue=1)
+
+    # first is hashed, second waits for it, third is rejected
+    results = await asyncio.gather(
+        *(pool.hash_password(PASSWORD) for _ in range(3)), return_exceptions=True
+    )
+    assert [isinstance(res, PasswordHashingOverloaded) for res in results] == [
+        False,
+        False,
+        True,
+    ]
+    assert pool.rejected == 1
+    assert pool.stats()["max_queue_time_ms"] > 0
+    pool.shutdown()
@@ -0,0 +1,92 @@
+import asyncio
+import ipaddress
+
+import pytest
+
+from app.api.errors import TooManyRequests
+from app.ratelimit.backends import InMemoryTokenBucketBackend, RateLimitPolicy
+from app.ratelimit.limiter import RateLimiter, get_client_ip
+
+
+@pytest.mark.parametrize("value", ("10", "a/60", "0/60", "10/0", "10/60/1"))
+def test_invalid_policy(value):
+    with pytest.raises(ValueError):
+        RateLimitPolicy.parse(value)
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_allows_burst_then_rejects():
+    backend = InMemoryTokenBucketBackend()
+    policy = RateLimitPolicy.parse("3/60")
+
+    results = [await backend.hit("client", policy) for _ in range(4)]
+    assert [res.allowed for res in results] == [True, True, True, False]
+    assert [res.remaining for res in results[:3]] == [2, 1, 0]
+    # one token is refilled in 20 seconds
+    assert 19 < results[-1].retry_after_seconds <= 20
+
+    # other clients aren't affected
+    assert (await backend.hit("other_client", policy)).allowed
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_refills():
+    backend = InMemoryTokenBucketBackend()
+    policy = RateLimitPolicy(limit=1, period_seconds=0.05)
+
+    assert (await backend.hit("client", policy)).allowed
+    assert not (await backend.hit("client", policy)).allowed
+    await asyncio.sleep(0.06)
+    assert (await backend.hit("client", policy)).allowed
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_max_keys():
+    backend = InMemoryTokenBucketBackend(max_keys=2)
+    policy = RateLimitPolicy.parse("1/60")
+    for key in ("a", "b", "c"):
+        await backend.hit(key, policy)
+
+    assert len(backend) == 2
+    # bucket of "a" is dropped, so it's full again
+    assert (await backend.hit("a", policy)).allowed
+
+
+@pytest.mark.asyncio
+async def test_limiter():
+    limiter = RateLimiter(
+        InMemoryTokenBucketBackend(), policies={"login": RateLimitPolicy.parse("1/60")}
+    )
+    await limiter.check("login", "ip:1.1.1.1")
+    with pytest.raises(TooManyRequests) as exc_info:
+        await limiter.check("login", "ip:1.1.1.1")
+
+    assert exc_info.value.headers == {"Retry-After": "60"}
+    assert limiter.stats()["policies"]["login"]["rejected"] == 1
+
+    limiter.enabled = False
+    await limiter.check("login", "ip:1.1.1.1")
+
+
+PROXIES = [ipaddress.ip_network("172.17.0.0/16"), ipaddress.ip_network("127.0.0.1")]
+
+
+@pytest.mark.parametrize(
+    "peer, forwarded_for, client_ip",
+    (
+        # direct connection
+        ("1.2.3.4", None, "1.2.3.4"),
+        # untrusted peer can't pick its IP
+        ("1.2.3.4", "5.6.7.8", "1.2.3.4"),
+        # behind proxy
+        ("172.17.0.1", "5.6.7.8", "5.6.7.8"),
+        # client prepended forged address
+        ("172.17.0.1", "9.9.9.9, 5.6.7.8", "5.6.7.8"),
+        # chain of trusted proxies
+        ("127.0.0.1", "5.6.7.8, 172.17.0.5", "5.6.7.8"),
+        ("172.17.0.1", "not-an-ip", "not-an-ip"),
+        ("172.17.0.1", "", "172.17.0.1"),
+    ),
+)
+def test_client_ip_behind_proxy(peer, forwarded_for, client_ip):
+    assert get_client_ip(peer, forwarded_for, PROXIES) == client_ip
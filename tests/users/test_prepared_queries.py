@@ -0,0 +1,60 @@
+import pytest
+from asyncpg.exceptions import InvalidCachedStatementError
+
+from app.db.base import database
+from app.db.models.users.handlers import (
+    GET_USER_BY_EMAIL,
+    create_user,
+    get_user_by_email,
+)
+from app.db.prepared import prepared_queries
+from app.schemas import CreateUser
+
+pytestmark = pytest.mark.asyncio
+
+
+async def test_statement_is_prepared_once():
+    user_data = {
+        "first_name": "Steve",
+        "last_name": "Jobs",
+        "username": "prepared_sj",
+        "password": "-",
+        "email": "prepared_sj@apple.com",
+        "email_is_verified": True,
+    }
+    user, _ = await create_user(CreateUser.construct(**user_data))
+    assert user is not None
+
+    hits = prepared_queries.hits[GET_USER_BY_EMAIL]
+    first = await get_user_by_email("prepared_sj@apple.com")
+    second = await get_user_by_email("prepared_sj@apple.com")
+
+    assert first is not None and first.id == user.id
+    assert second == first
+    # at most first call prepares the statement
+    assert prepared_queries.hits[GET_USER_BY_EMAIL] >= hits + 1
+    stats = prepared_queries.stats()[GET_USER_BY_EMAIL]
+    assert stats["calls"] == stats["hits"] + stats["misses"]
+
+
+async def test_no_row():
+    assert await get_user_by_email("prepared_nobody@apple.com") is None
+
+
+async def test_register_twice():
+    with pytest.raises(ValueError):
+        prepared_queries.register(GET_USER_BY_EMAIL, "SELECT 1")
+
+
+async def test_invalid_statement_in_transaction_is_raised():
+    # statement is prepared for the current schema
+    assert await get_user_by_email("prepared_nobody@apple.com") is None
+
+    transaction = await database.transaction()
+    try:
+        await database.execute("ALTER TABLE users ADD COLUMN prepared_test int")
+        # transaction is aborted, so statement can't be retried in it
+        with pytest.raises(InvalidCachedStatementError):
+            await get_user_by_email("prepared_nobody@apple.com")
+    finally:
+        await transaction.rollback()
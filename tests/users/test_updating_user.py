@@ -10,6 +10,7 @@ from app.api.auth.password_utils import passwords_are_equal, get_password_hash
 from app.api.auth.utils import create_access_token, ALGORITHM
 from app.config import settings
 from app.db.base import database
+from app.db.models.users.cache import users_by_email_cache
 from app.db.models.users.handlers import get_user_by_email, create_user
 from app.db.models.users.schemas import User
 from app.schemas import GetUser, CreateUser
@@ -72,6 +73,23 @@ async def test_success_patch_simple_fields(async_client, patch_data, access_toke
         assert getattr(user_id_db, field_name) == value
 
 
+async def test_cached_current_user_is_invalidated(async_client, access_token_and_user):
+    access_token, _ = access_token_and_user
+    headers = {"Authorization": f"Bearer {access_token}"}
+
+    hits = users_by_email_cache.hits
+    for _ in range(2):
+        response = await async_client.get("/users/me", headers=headers)
+        assert response.status_code == HTTPStatus.OK, response.text
+    assert users_by_email_cache.hits > hits
+
+    patch_response = await async_client.patch("/users", json={"first_name": "Cached"}, headers=headers)
+    assert patch_response.status_code == HTTPStatus.OK, patch_response.text
+
+    response = await async_client.get("/users/me", headers=headers)
+    assert response.json()["first_name"] == "Cached"
+
+
 async def test_success_change_password(async_client, access_token_and_user):
     access_token, user = access_token_and_user
     auth_header = f"Bearer {access_token}"